@@ -1,35 +1,100 @@
+import logging
 import smtplib
+import threading
 from email.mime.text import MIMEText
 import os
 
+# Recycle the SMTP connection after this many messages to stay under
+# provider per-connection limits
+MAX_MESSAGES_PER_CONNECTION = 100
+
+logger = logging.getLogger(__name__)
+
 class EmailAlert:
     def __init__(self, smtp_server: str = None, smtp_port: int = None, username: str = None, password: str = None):
         self.smtp_server = smtp_server or os.getenv("SMTP_SERVER")
         self.smtp_port = smtp_port or int(os.getenv("SMTP_PORT", "587"))
         self.username = username or os.getenv("SMTP_USERNAME")
         self.password = password or os.getenv("SMTP_PASSWORD")
-        
+
+        # Persistent SMTP connection, created lazily on first send
+        self._smtp = None
+        self._sent_on_conn = 0
+        self._lock = threading.Lock()
+
         # Check if email configuration is complete
         if not all([self.smtp_server, self.username, self.password]):
-            print("Warning: Incomplete email configuration. Email alerts will be disabled.")
+            logger.warning("Incomplete email configuration. Email alerts will be disabled.")
             self.enabled = False
         else:
             self.enabled = True
 
-    def send_alert(self, to_email: str, subject: str, message: str):
-        if not self.enabled:
-            print(f"Email alert disabled. Would send to {to_email}: {subject}")
+    def _connect(self) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP connection"""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        server.starttls()
+        server.login(self.username, self.password)
+        self._sent_on_conn = 0
+        return server
+
+    def _is_alive(self) -> bool:
+        """Check the cached connection with a NOOP"""
+        try:
+            code, _ = self._smtp.noop()
+            return code == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _get_conn(self) -> smtplib.SMTP:
+        """Return the cached SMTP connection, reconnecting if it is stale"""
+        if self._smtp is not None and (
+            self._sent_on_conn >= MAX_MESSAGES_PER_CONNECTION or not self._is_alive()
+        ):
+            self._drop_conn()
+        if self._smtp is None:
+            self._smtp = self._connect()
+        return self._smtp
+
+    def _drop_conn(self):
+        """Close the cached connection, ignoring errors from a dead socket"""
+        if self._smtp is None:
             return
-            
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
+        self._sent_on_conn = 0
+
+    def send_alert(self, to_email: str, subject: str, message: str) -> bool:
+        """Send one alert email, returning whether it was delivered"""
+        if not self.enabled:
+            logger.debug("Email alert disabled. Would send to %s: %s", to_email, subject)
+            return False
+
         try:
             msg = MIMEText(message)
             msg['Subject'] = subject
             msg['From'] = self.username
             msg['To'] = to_email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.username, self.password)
-                server.sendmail(self.username, [to_email], msg.as_string())
-            print(f"Email alert sent to {to_email}")
-        except Exception as e:
-            print(f"Error sending email alert: {e}") 
\ No newline at end of file
+            with self._lock:
+                try:
+                    self._get_conn().sendmail(self.username, [to_email], msg.as_string())
+                except smtplib.SMTPServerDisconnected:
+                    # Server dropped us between the NOOP and the send; retry once on a fresh connection
+                    self._drop_conn()
+                    self._get_conn().sendmail(self.username, [to_email], msg.as_string())
+                self._sent_on_conn += 1
+            logger.debug("Email alert sent to %s", to_email)
+            return True
+        except Exception:
+            logger.exception("Error sending email alert to %s", to_email)
+            return False
+
+    def close(self):
+        """Close the persistent SMTP connection"""
+        with self._lock:
+            self._drop_conn()
+
+# Shared email alert instance
+email_alert = EmailAlert()
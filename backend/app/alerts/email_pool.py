@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import os
+from typing import List, NamedTuple, Tuple
+from app.alerts.email_alert import EmailAlert, email_alert
+
+logger = logging.getLogger(__name__)
+
+# Emailing matching alert subscribers each collection cycle is opt-in (the SMTP settings are needed as well)
+EMAIL_ALERTS_ENABLED = os.getenv("EMAIL_ALERTS_ENABLED", "false").lower() == "true"
+
+# A batch is only aborted on its failure ratio once this many sends were attempted
+MIN_ATTEMPTS_BEFORE_ABORT = 5
+# Sends per job before it is dropped
+MAX_SEND_ATTEMPTS = 3
+# Backoff before requeueing after a failing batch, doubling per consecutive failing batch
+RETRY_BASE_DELAY = 2.0
+RETRY_MAX_DELAY = 60.0
+
+class EmailJob(NamedTuple):
+    to_email: str
+    subject: str
+    message: str
+    attempts: int = 0
+
+class EmailPool:
+    """Background email sender: a queue drained by workers that each own one SMTP connection"""
+
+    def __init__(self, workers: int = 5, maxsize: int = 10_000, batch_size: int = 32):
+        self.workers = workers
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self._queue = None
+        self._loop = None
+        self._tasks = []
+        self._senders = []
+
+    async def start(self):
+        """Spawn the worker tasks (called on FastAPI startup)"""
+        if self._tasks or not EMAIL_ALERTS_ENABLED or not email_alert.enabled:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._senders = [EmailAlert() for _ in range(self.workers)]
+        self._tasks = [asyncio.create_task(self._worker(sender)) for sender in self._senders]
+
+    async def stop(self):
+        """Cancel the workers and close their SMTP connections"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for sender in self._senders:
+            sender.close()
+        self._tasks = []
+        self._senders = []
+        self._loop = None
+
+    def submit(self, job: EmailJob):
+        """Queue an email from any thread; sends inline when the pool is not running"""
+        if self._loop is None:
+            email_alert.send_alert(job.to_email, job.subject, job.message)
+            return
+        self._loop.call_soon_threadsafe(self._put_nowait, job)
+
+    def _put_nowait(self, job: EmailJob):
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            logger.warning("Email queue full, dropping alert to %s", job.to_email)
+
+    async def _worker(self, sender: EmailAlert):
+        failing_batches = 0
+        while True:
+            batch = [await self._queue.get()]
+            # Coalesce whatever else is already waiting into the same batch
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            try:
+                attempted, failed = await asyncio.to_thread(self._send_batch, sender, batch)
+            except Exception:
+                logger.exception("Error in email worker")
+                attempted, failed = len(batch), batch
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            retry = batch[attempted:]
+            for job in failed:
+                if job.attempts + 1 < MAX_SEND_ATTEMPTS:
+                    retry.append(job._replace(attempts=job.attempts + 1))
+                else:
+                    logger.warning("Dropping alert to %s after %d failed sends", job.to_email, MAX_SEND_ATTEMPTS)
+            if not failed:
+                failing_batches = 0
+                continue
+
+            # Back off before putting jobs back so an SMTP outage does not spin the workers
+            failing_batches += 1
+            await asyncio.sleep(min(RETRY_BASE_DELAY * 2 ** (failing_batches - 1), RETRY_MAX_DELAY))
+            for job in retry:
+                self._put_nowait(job)
+
+    @staticmethod
+    def _send_batch(sender: EmailAlert, batch: List[EmailJob]) -> Tuple[int, List[EmailJob]]:
+        """Send a batch on one connection; returns how many jobs were attempted and the ones that failed"""
+        failed = []
+        for attempted, job in enumerate(batch, start=1):
+            if not sender.send_alert(job.to_email, job.subject, job.message):
+                failed.append(job)
+            # Stop draining when a third or more of the attempts failed
+            if attempted >= MIN_ATTEMPTS_BEFORE_ABORT and len(failed) * 3 >= attempted:
+                return attempted, failed
+        return len(batch), failed
+
+# Shared email pool instance
+email_pool = EmailPool()
@@ -1,72 +1,148 @@
+import logging
 import os
-from typing import List, Dict
+import time
+from typing import List, Dict, Set
 import asyncio
+from collections import defaultdict
+from app.models.incident import is_alertable
+from app.models.telegram_subscriber import TelegramSubscriber
+from app.utils.database import SessionLocal
+
+logger = logging.getLogger(__name__)
 
 # Try to import telegram bot, but make it optional
 try:
     from telegram import Bot, Update
-    from telegram.ext import Updater, CommandHandler, CallbackContext
+    from telegram.ext import Application, CommandHandler, ContextTypes
     TELEGRAM_AVAILABLE = True
 except ImportError:
     TELEGRAM_AVAILABLE = False
     # Create dummy types for when telegram is not available
     class Update:
         pass
-    class CallbackContext:
-        pass
-    print("Warning: python-telegram-bot not available. Telegram alerts will be disabled.")
+    class ContextTypes:
+        DEFAULT_TYPE = None
+    logger.warning("python-telegram-bot not available. Telegram alerts will be disabled.")
+
+# Concurrent sends per broadcast, kept under Telegram's ~30 msg/sec limit
+BROADCAST_CONCURRENCY = 25
+
+# How long the in-memory subscriber list is trusted before re-reading the DB;
+# bounds staleness for subscriptions made against other workers
+SUBSCRIBERS_TTL = 30
+
+# Telegram rejects longer messages; batched alerts are split to stay under it
+MAX_MESSAGE_LENGTH = 4096
+MESSAGE_SEPARATOR = "\n\n➖➖➖\n\n"
+
+SEVERITY_EMOJI = {
+    "low": "🟡",
+    "medium": "🟠",
+    "high": "🔴"
+}
+
+# Incident alert layout, rendered once per incident with str.format_map
+MESSAGE_TEMPLATE = "\n".join((
+    "{emoji} <b>NOESIS Alert</b>",
+    "",
+    "<b>Location:</b> {location}",
+    "<b>Severity:</b> {severity_label}",
+    "<b>Status:</b> {status_label}",
+    "<b>Confidence:</b> {confidence_score}%",
+    "",
+    "<b>Description:</b>",
+    "{description}",
+    "",
+    "<b>Sources:</b> {source_count} posts across {platform_diversity} platforms",
+))
+
+# Fallbacks for fields that are not "Unknown" when missing
+MESSAGE_DEFAULTS = {
+    "confidence_score": 0,
+    "description": "No description available",
+    "source_count": 0,
+    "platform_diversity": 0
+}
 
 class TelegramAlertBot:
     def __init__(self, token: str = None):
         if not TELEGRAM_AVAILABLE:
-            print("Telegram bot disabled - python-telegram-bot not installed")
+            logger.warning("Telegram bot disabled - python-telegram-bot not installed")
             self.enabled = False
             return
-            
+
         self.enabled = True
         self.token = token or os.getenv("TELEGRAM_BOT_TOKEN")
-        
+        # Public base URL for webhook mode; long polling is used when unset
+        self.webhook_url = os.getenv("TELEGRAM_WEBHOOK_URL")
+        # Event loop the application runs on, set by start()
+        self._loop = None
+
         if not self.token:
-            print("Warning: No Telegram bot token provided. Telegram alerts will be disabled.")
+            logger.warning("No Telegram bot token provided. Telegram alerts will be disabled.")
             self.enabled = False
             return
-            
+
         try:
-            self.bot = Bot(token=self.token)
-            self.updater = Updater(token=self.token, use_context=True)
-            self.subscribers = set()  # In production, this would be stored in DB
-            
+            self.application = Application.builder().token(self.token).build()
+            self.bot = self.application.bot
+            # Mirror of the telegram_subscribers table: {"expires_at": float, "chat_ids": set}
+            self._subs_cache = {}
+
             # Add command handlers
-            self.updater.dispatcher.add_handler(CommandHandler("start", self.start_command))
-            self.updater.dispatcher.add_handler(CommandHandler("subscribe", self.subscribe_command))
-            self.updater.dispatcher.add_handler(CommandHandler("unsubscribe", self.unsubscribe_command))
-        except Exception as e:
-            print(f"Error initializing Telegram bot: {e}")
+            self.application.add_handler(CommandHandler("start", self.start_command))
+            self.application.add_handler(CommandHandler("subscribe", self.subscribe_command))
+            self.application.add_handler(CommandHandler("unsubscribe", self.unsubscribe_command))
+        except Exception:
+            logger.exception("Error initializing Telegram bot")
             self.enabled = False
 
-    def start(self):
-        """Start the bot"""
+    async def start(self):
+        """Start the bot, via webhook when TELEGRAM_WEBHOOK_URL is set, else long polling"""
         if not self.enabled:
             return
         try:
-            self.updater.start_polling()
-        except Exception as e:
-            print(f"Error starting Telegram bot: {e}")
+            await self.application.initialize()
+            await self.application.start()
+            if self.webhook_url:
+                # Telegram pushes updates to /telegram/webhook/{token}
+                await self.bot.set_webhook(url=f"{self.webhook_url.rstrip('/')}/telegram/webhook/{self.token}")
+            else:
+                # Long polling: each getUpdates call blocks server-side for up to 20s
+                await self.application.updater.start_polling(poll_interval=0, timeout=20)
+            self._loop = asyncio.get_running_loop()
+        except Exception:
+            logger.exception("Error starting Telegram bot")
 
-    def stop(self):
-        """Stop the bot"""
+    async def process_update(self, payload: Dict):
+        """Dispatch an update received on the webhook endpoint"""
         if not self.enabled:
             return
         try:
-            self.updater.stop()
-        except Exception as e:
-            print(f"Error stopping Telegram bot: {e}")
+            await self.application.process_update(Update.de_json(payload, self.bot))
+        except Exception:
+            logger.exception("Error processing Telegram update")
 
-    def start_command(self, update: Update, context: CallbackContext):
+    async def stop(self):
+        """Stop the bot"""
+        if not self.enabled or self._loop is None:
+            return
+        try:
+            if self.webhook_url:
+                await self.bot.delete_webhook()
+            else:
+                await self.application.updater.stop()
+            await self.application.stop()
+            await self.application.shutdown()
+            self._loop = None
+        except Exception:
+            logger.exception("Error stopping Telegram bot")
+
+    async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command"""
         if not self.enabled:
             return
-            
+
         try:
             welcome_message = """
 🚨 Welcome to NOESIS Alert Bot!
@@ -79,77 +155,140 @@ Commands:
 
 You'll receive alerts for verified incidents with medium or high severity.
             """
-            update.message.reply_text(welcome_message)
-        except Exception as e:
-            print(f"Error in start command: {e}")
+            await update.message.reply_text(welcome_message)
+        except Exception:
+            logger.exception("Error in start command")
 
-    def subscribe_command(self, update: Update, context: CallbackContext):
+    async def subscribe_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /subscribe command"""
         if not self.enabled:
             return
-            
+
         try:
             chat_id = update.effective_chat.id
-            self.subscribers.add(chat_id)
-            update.message.reply_text("✅ You've been subscribed to NOESIS alerts!")
-        except Exception as e:
-            print(f"Error in subscribe command: {e}")
+            await asyncio.to_thread(self._save_subscriber, chat_id)
+            await update.message.reply_text("✅ You've been subscribed to NOESIS alerts!")
+        except Exception:
+            logger.exception("Error in subscribe command")
 
-    def unsubscribe_command(self, update: Update, context: CallbackContext):
+    async def unsubscribe_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /unsubscribe command"""
         if not self.enabled:
             return
-            
+
         try:
             chat_id = update.effective_chat.id
-            self.subscribers.discard(chat_id)
-            update.message.reply_text("❌ You've been unsubscribed from NOESIS alerts.")
-        except Exception as e:
-            print(f"Error in unsubscribe command: {e}")
+            await asyncio.to_thread(self._delete_subscriber, chat_id)
+            await update.message.reply_text("❌ You've been unsubscribed from NOESIS alerts.")
+        except Exception:
+            logger.exception("Error in unsubscribe command")
+
+    @property
+    def subscribers(self) -> Set[int]:
+        """Subscribed chat ids, reloaded from the DB when the cache has expired"""
+        entry = self._subs_cache
+        if entry and entry["expires_at"] > time.monotonic():
+            return entry["chat_ids"]
+        db = SessionLocal()
+        try:
+            chat_ids = {chat_id for (chat_id,) in db.query(TelegramSubscriber.chat_id)}
+        finally:
+            db.close()
+        self._subs_cache = {"expires_at": time.monotonic() + SUBSCRIBERS_TTL, "chat_ids": chat_ids}
+        return chat_ids
+
+    def _save_subscriber(self, chat_id: int):
+        db = SessionLocal()
+        try:
+            db.merge(TelegramSubscriber(chat_id=chat_id))
+            db.commit()
+        finally:
+            db.close()
+        self._subs_cache = {}
 
-    def send_alert(self, chat_id: int, message: str):
+    def _delete_subscriber(self, chat_id: int):
+        db = SessionLocal()
+        try:
+            db.query(TelegramSubscriber).filter(TelegramSubscriber.chat_id == chat_id).delete()
+            db.commit()
+        finally:
+            db.close()
+        self._subs_cache = {}
+
+    async def send_alert(self, chat_id: int, message: str):
         """Send alert to specific chat"""
         if not self.enabled:
             return
-            
+
         try:
-            self.bot.send_message(chat_id=chat_id, text=message, parse_mode='HTML')
-        except Exception as e:
-            print(f"Error sending Telegram alert: {e}")
+            await self.bot.send_message(chat_id=chat_id, text=message, parse_mode='HTML')
+        except Exception:
+            logger.exception("Error sending Telegram alert to %s", chat_id)
+
+    async def broadcast_incident(self, incident: Dict):
+        """Broadcast incident to all subscribers concurrently"""
+        await self.broadcast_incidents([incident])
 
-    def broadcast_incident(self, incident: Dict):
-        """Broadcast incident to all subscribers"""
+    async def broadcast_incidents(self, incidents: List[Dict]):
+        """Broadcast a batch of incidents, packed into as few messages per subscriber as Telegram allows"""
         if not self.enabled:
             return
-            
-        if incident.get("severity") in ["medium", "high"] and incident.get("status") in ["verified", "medium"]:
-            message = self.format_incident_message(incident)
-            
-            for chat_id in self.subscribers:
-                self.send_alert(chat_id, message)
+
+        messages = [
+            self.format_incident_message(incident)
+            for incident in incidents
+            if is_alertable(incident.get("severity"), incident.get("status"))
+        ]
+        if not messages:
+            return
+        batches = self._pack_messages(messages)
+        chat_ids = await asyncio.to_thread(lambda: list(self.subscribers))
+        semaphore = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+
+        async def _send(chat_id: int, text: str):
+            async with semaphore:
+                await self.send_alert(chat_id, text)
+
+        await asyncio.gather(*[_send(chat_id, text) for chat_id in chat_ids for text in batches], return_exceptions=True)
+
+    @staticmethod
+    def _pack_messages(messages: List[str]) -> List[str]:
+        """Join messages into as few texts as fit under Telegram's message length limit"""
+        batches = []
+        current = ""
+        for message in messages:
+            if current and len(current) + len(MESSAGE_SEPARATOR) + len(message) > MAX_MESSAGE_LENGTH:
+                batches.append(current)
+                current = ""
+            current = current + MESSAGE_SEPARATOR + message if current else message
+        if current:
+            batches.append(current)
+        return batches
+
+    def schedule_broadcast(self, incidents: List[Dict]):
+        """Broadcast from synchronous code without waiting for delivery"""
+        if not self.enabled or not incidents:
+            return
+        if self._loop is not None:
+            # Hand off to the application's event loop (we are on a worker thread)
+            asyncio.run_coroutine_threadsafe(self.broadcast_incidents(incidents), self._loop)
+        else:
+            # Bot not started (e.g. standalone scripts): broadcast on a private loop
+            asyncio.run(self._broadcast_standalone(incidents))
+
+    async def _broadcast_standalone(self, incidents: List[Dict]):
+        async with self.bot:
+            await self.broadcast_incidents(incidents)
 
     def format_incident_message(self, incident: Dict) -> str:
         """Format incident for Telegram message"""
-        severity_emoji = {
-            "low": "🟡",
-            "medium": "🟠", 
-            "high": "🔴"
-        }
-        
-        emoji = severity_emoji.get(incident.get("severity", "low"), "🟡")
-        
-        message = f"""
-{emoji} <b>NOESIS Alert</b>
-
-<b>Location:</b> {incident.get('location', 'Unknown')}
-<b>Severity:</b> {incident.get('severity', 'Unknown').title()}
-<b>Status:</b> {incident.get('status', 'Unknown').title()}
-<b>Confidence:</b> {incident.get('confidence_score', 0)}%
-
-<b>Description:</b>
-{incident.get('description', 'No description available')}
-
-<b>Sources:</b> {incident.get('source_count', 0)} posts across {incident.get('platform_diversity', 0)} platforms
-        """
-        
-        return message.strip() 
\ No newline at end of file
+        fields = defaultdict(lambda: "Unknown", incident)
+        fields["emoji"] = SEVERITY_EMOJI.get(fields["severity"], "🟡")
+        fields["severity_label"] = fields["severity"].title()
+        fields["status_label"] = fields["status"].title()
+        for key, default in MESSAGE_DEFAULTS.items():
+            fields.setdefault(key, default)
+        return MESSAGE_TEMPLATE.format_map(fields)
+
+# Shared Telegram bot instance
+telegram_bot = TelegramAlertBot()
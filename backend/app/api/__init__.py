@@ -4,10 +4,28 @@ from .alerts import router as alerts_router
 from .moderation import router as moderation_router
 from .collection import router as collection_router
 from .predictions import router as predictions_router
+from .telegram import router as telegram_router
+from app.alerts.email_alert import email_alert
+from app.alerts.email_pool import email_pool
+from app.alerts.telegram_bot import telegram_bot
+from app.utils.database import async_engine
 
 router = APIRouter()
 router.include_router(incidents_router)
 router.include_router(alerts_router)
 router.include_router(moderation_router)
 router.include_router(collection_router) 
-router.include_router(predictions_router) 
\ No newline at end of file
+router.include_router(predictions_router) 
+router.include_router(telegram_router)
+
+# Email workers run for the lifetime of the app
+router.add_event_handler("startup", email_pool.start)
+router.add_event_handler("shutdown", email_pool.stop)
+# Close the persistent SMTP connection on shutdown
+router.add_event_handler("shutdown", email_alert.close)
+# Telegram bot commands are served for the lifetime of the app
+router.add_event_handler("startup", telegram_bot.start)
+router.add_event_handler("shutdown", telegram_bot.stop)
+
+# Release pooled async DB connections on shutdown
+router.add_event_handler("shutdown", async_engine.dispose)
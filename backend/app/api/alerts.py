@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional
-from app.utils.database import get_db
+from app.utils.database import get_async_db, dialect_insert
 from app.models.alert_subscriber import AlertSubscriber
 
 router = APIRouter(prefix="/alerts", tags=["alerts"])
@@ -19,71 +20,82 @@ class AlertResponse(BaseModel):
     subscriber_id: Optional[int] = None
 
 @router.post("/subscribe", response_model=AlertResponse)
-def subscribe(subscription: AlertSubscription, db: Session = Depends(get_db)):
+async def subscribe(subscription: AlertSubscription, db: AsyncSession = Depends(get_async_db)):
     """Subscribe to real-time alerts"""
     try:
-        # Check if already subscribed
-        existing = db.query(AlertSubscriber).filter(AlertSubscriber.email == subscription.email).first()
-        if existing:
-            return AlertResponse(
-                status="already_subscribed",
-                message="Email already subscribed to alerts",
-                subscriber_id=existing.user_id
-            )
-        
-        # Create new subscriber
-        subscriber = AlertSubscriber(
+        # Insert atomically; the unique email index turns a duplicate into a no-op
+        stmt = dialect_insert(db)(AlertSubscriber).values(
             email=subscription.email,
             region_of_interest=subscription.region_of_interest,
             severity_preference=subscription.severity_preference,
             digest_mode=subscription.digest_mode
-        )
-        db.add(subscriber)
-        db.commit()
-        db.refresh(subscriber)
+        ).on_conflict_do_nothing(index_elements=["email"]).returning(AlertSubscriber.user_id)
+        user_id = (await db.execute(stmt)).scalar()
+        await db.commit()
+        
+        if user_id is None:
+            existing_id = await db.scalar(select(AlertSubscriber.user_id).where(AlertSubscriber.email == subscription.email))
+            return AlertResponse(
+                status="already_subscribed",
+                message="Email already subscribed to alerts",
+                subscriber_id=existing_id
+            )
         
         return AlertResponse(
             status="subscribed",
             message="Successfully subscribed to NOESIS alerts!",
-            subscriber_id=subscriber.user_id
+            subscriber_id=user_id
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to subscribe: {str(e)}")
 
 @router.post("/unsubscribe", response_model=AlertResponse)
-def unsubscribe(subscription: AlertSubscription, db: Session = Depends(get_db)):
+async def unsubscribe(subscription: AlertSubscription, db: AsyncSession = Depends(get_async_db)):
     """Unsubscribe from alerts"""
     try:
-        subscriber = db.query(AlertSubscriber).filter(AlertSubscriber.email == subscription.email).first()
-        if not subscriber:
+        result = await db.execute(
+            delete(AlertSubscriber).where(AlertSubscriber.email == subscription.email).returning(AlertSubscriber.user_id)
+        )
+        deleted = result.first()
+        await db.commit()
+        if deleted is None:
             return AlertResponse(
                 status="not_found",
                 message="Email not found in subscribers"
             )
         
-        db.delete(subscriber)
-        db.commit()
-        
         return AlertResponse(
             status="unsubscribed",
             message="Successfully unsubscribed from NOESIS alerts"
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to unsubscribe: {str(e)}")
 
 @router.get("/subscribers")
-def get_subscribers(db: Session = Depends(get_db)):
-    """Get all alert subscribers (admin endpoint)"""
-    subscribers = db.query(AlertSubscriber).all()
-    return [
-        {
-            "user_id": sub.user_id,
-            "email": sub.email,
-            "region_of_interest": sub.region_of_interest,
-            "severity_preference": sub.severity_preference,
-            "digest_mode": sub.digest_mode
-        }
-        for sub in subscribers
-    ] 
\ No newline at end of file
+async def get_subscribers(
+    limit: int = Query(100, ge=1, le=1000, description="Number of subscribers per page"),
+    after_id: Optional[int] = Query(None, description="Return subscribers after this user_id"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get alert subscribers one page at a time (admin endpoint)"""
+    # Keyset pagination: cost stays constant however deep the page
+    query = select(AlertSubscriber).order_by(AlertSubscriber.user_id)
+    if after_id is not None:
+        query = query.where(AlertSubscriber.user_id > after_id)
+    subscribers = (await db.execute(query.limit(limit))).scalars().all()
+    
+    return {
+        "subscribers": [
+            {
+                "user_id": sub.user_id,
+                "email": sub.email,
+                "region_of_interest": sub.region_of_interest,
+                "severity_preference": sub.severity_preference,
+                "digest_mode": sub.digest_mode
+            }
+            for sub in subscribers
+        ],
+        "next_after_id": subscribers[-1].user_id if subscribers else None
+    }
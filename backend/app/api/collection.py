@@ -1,36 +1,76 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy import select, func
 from sqlalchemy.orm import Session
-from app.utils.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Callable, Dict
+from uuid import uuid4
+from datetime import datetime
+from app.utils.database import SessionLocal, get_async_db
+from app.utils.ttl_cache import ttl_cache, invalidate
 from app.services.data_orchestrator import DataOrchestrator
 from app.models.raw_post import RawPost
 from app.models.processed_post import ProcessedPost
 from app.models.incident import Incident
+from app.api.incidents import get_dashboard, get_incident_stats
 
 router = APIRouter(prefix="/collection", tags=["collection"])
 
-@router.post("/run-cycle")
-def run_collection_cycle(db: Session = Depends(get_db)):
-    """Manually trigger a data collection and processing cycle"""
+# Background collection cycles by job id (in-memory, per process)
+JOBS: Dict[str, dict] = {}
+MAX_JOBS = 100
+
+def _run_and_store(job_id: str, session_factory: Callable[[], Session]):
+    """Run one collection cycle on its own session and record the outcome"""
+    # Hold the entry itself so a concurrent eviction from JOBS cannot break the updates below
+    job = JOBS.setdefault(job_id, {"job_id": job_id, "status": "running"})
+    db = session_factory()
     try:
         orchestrator = DataOrchestrator(db)
         results = orchestrator.run_collection_cycle()
-        
-        return {
-            "status": "success",
-            "message": "Data collection cycle completed successfully",
-            "results": results
-        }
+        # New rows were written; drop cached dashboard/status reads
+        invalidate(get_dashboard, get_incident_stats, get_collection_status)
+        job.update(status="completed", results=results)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error running collection cycle: {str(e)}")
+        job.update(status="failed", error=f"Error running collection cycle: {str(e)}")
+    finally:
+        job["finished_at"] = datetime.utcnow().isoformat()
+        db.close()
+
+@router.post("/run-cycle")
+def run_collection_cycle(background_tasks: BackgroundTasks):
+    """Start a data collection and processing cycle in the background"""
+    job_id = uuid4().hex
+    JOBS[job_id] = {"job_id": job_id, "status": "running", "started_at": datetime.utcnow().isoformat()}
+    # Forget the oldest finished jobs; running ones are kept until they finish
+    finished = [key for key, job in JOBS.items() if "finished_at" in job]
+    for key in finished[:max(len(JOBS) - MAX_JOBS, 0)]:
+        JOBS.pop(key)
+    # The request-scoped session closes with the response, so the task opens its own
+    background_tasks.add_task(_run_and_store, job_id, SessionLocal)
+    
+    return {
+        "status": "running",
+        "message": "Data collection cycle started",
+        "job_id": job_id
+    }
+
+@router.get("/jobs/{job_id}")
+def get_collection_job(job_id: str):
+    """Get the status and results of a background collection cycle"""
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 @router.get("/status")
-def get_collection_status(db: Session = Depends(get_db)):
+@ttl_cache(seconds=5)
+async def get_collection_status(db: AsyncSession = Depends(get_async_db)):
     """Get status of data collection system"""
     try:
         # Get counts from database
-        raw_count = db.query(RawPost).count()
-        processed_count = db.query(ProcessedPost).count()
-        incident_count = db.query(Incident).count()
+        raw_count = await db.scalar(select(func.count()).select_from(RawPost))
+        processed_count = await db.scalar(select(func.count()).select_from(ProcessedPost))
+        incident_count = await db.scalar(select(func.count()).select_from(Incident))
         
         return {
             "raw_posts": raw_count,
@@ -1,92 +1,103 @@
 from fastapi import APIRouter, Query, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, desc
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime, timedelta
-from app.utils.database import get_db
+from app.utils.database import get_async_db
+from app.utils.ttl_cache import ttl_cache
 from app.models.incident import Incident
 from app.models.processed_post import ProcessedPost
 from app.models.raw_post import RawPost
 
 router = APIRouter(prefix="/incidents", tags=["incidents"])
 
-@router.get("/")
-def get_incidents(
+class IncidentOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    incident_id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    location: Optional[str] = None
+    location_lat: Optional[float] = None
+    location_lng: Optional[float] = None
+    severity: Optional[str] = None
+    status: Optional[str] = None
+    sources: Optional[List[Any]] = None
+
+class RecentIncidentOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    incident_id: int
+    title: Optional[str] = None
+    location: Optional[str] = None
+    severity: Optional[str] = None
+    status: Optional[str] = None
+    sources_count: int = Field(0, validation_alias="source_count")
+
+class DashboardSummary(BaseModel):
+    total_incidents: int
+    verified_incidents: int
+    high_severity_incidents: int
+    verification_rate: float
+
+class LocationCount(BaseModel):
+    location: str
+    count: int
+
+class DashboardResponse(BaseModel):
+    summary: DashboardSummary
+    recent_activity: List[RecentIncidentOut]
+    severity_distribution: Dict[str, int]
+    status_distribution: Dict[str, int]
+    top_locations: List[LocationCount]
+    last_updated: str
+
+@router.get("/", response_model=List[IncidentOut], response_model_exclude_none=True)
+async def get_incidents(
     region: Optional[str] = Query(None, description="Filter by region"),
     date: Optional[str] = Query(None, description="Filter by date (YYYY-MM-DD)"),
     severity: Optional[str] = Query(None, description="Filter by severity (low/medium/high)"),
     limit: int = Query(50, description="Number of incidents to return"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get incidents with optional filtering"""
-    query = db.query(Incident)
+    query = select(Incident)
     
     if region:
-        # Try to match both place names and coordinates
-        query = query.filter(
-            (Incident.location.contains(region)) |
-            (Incident.location_lat.isnot(None) & Incident.location_lng.isnot(None))
-        )
+        query = query.where(Incident.location.ilike(f"%{region}%"))
     
     if date:
         try:
             date_obj = datetime.strptime(date, "%Y-%m-%d")
             next_day = date_obj + timedelta(days=1)
-            # Note: This assumes you have a timestamp field in Incident model
-            # query = query.filter(Incident.timestamp >= date_obj, Incident.timestamp < next_day)
-            pass
+            query = query.where(Incident.created_at >= date_obj, Incident.created_at < next_day)
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     
     if severity:
         if severity not in ["low", "medium", "high"]:
             raise HTTPException(status_code=400, detail="Invalid severity. Use low/medium/high")
-        query = query.filter(Incident.severity == severity)
+        query = query.where(Incident.severity == severity)
     
-    incidents = query.order_by(Incident.incident_id.desc()).limit(limit).all()
+    incidents = (await db.scalars(query.order_by(Incident.incident_id.desc()).limit(limit))).all()
     
-    return [
-        {
-            "incident_id": incident.incident_id,
-            "title": incident.title,
-            "description": incident.description,
-            "location": incident.location,
-            "location_lat": incident.location_lat,
-            "location_lng": incident.location_lng,
-            "severity": incident.severity,
-            "status": incident.status,
-            "sources": incident.sources
-        }
-        for incident in incidents
-    ]
+    return incidents
 
-@router.get("/latest")
-def get_latest_verified(limit: int = Query(10, description="Number of latest incidents"), db: Session = Depends(get_db)):
+@router.get("/latest", response_model=List[IncidentOut], response_model_exclude_none=True)
+async def get_latest_verified(limit: int = Query(10, description="Number of latest incidents"), db: AsyncSession = Depends(get_async_db)):
     """Get latest verified incidents"""
-    incidents = db.query(Incident).filter(
+    incidents = (await db.scalars(select(Incident).where(
         Incident.status.in_(["verified", "medium"])
-    ).order_by(Incident.incident_id.desc()).limit(limit).all()
+    ).order_by(Incident.incident_id.desc()).limit(limit))).all()
     
-    return [
-        {
-            "incident_id": incident.incident_id,
-            "title": incident.title,
-            "description": incident.description,
-            "location": incident.location,
-            "location_lat": incident.location_lat,
-            "location_lng": incident.location_lng,
-            "severity": incident.severity,
-            "status": incident.status,
-            "sources": incident.sources
-        }
-        for incident in incidents
-    ]
+    return incidents
 
 @router.get("/stats/summary")
-def get_incident_stats(db: Session = Depends(get_db)):
+@ttl_cache(seconds=5)
+async def get_incident_stats(db: AsyncSession = Depends(get_async_db)):
     """Get incident statistics"""
-    total_incidents = db.query(Incident).count()
-    verified_incidents = db.query(Incident).filter(Incident.status == "verified").count()
-    high_severity = db.query(Incident).filter(Incident.severity == "high").count()
+    total_incidents = await db.scalar(select(func.count()).select_from(Incident))
+    verified_incidents = await db.scalar(select(func.count()).where(Incident.status == "verified"))
+    high_severity = await db.scalar(select(func.count()).where(Incident.severity == "high"))
     
     return {
         "total_incidents": total_incidents,
@@ -95,82 +106,62 @@ def get_incident_stats(db: Session = Depends(get_db)):
         "verification_rate": (verified_incidents / total_incidents * 100) if total_incidents > 0 else 0
     }
 
-@router.get("/dashboard")
-def get_dashboard(db: Session = Depends(get_db)):
+@router.get("/dashboard", response_model=DashboardResponse)
+@ttl_cache(seconds=5)
+async def get_dashboard(db: AsyncSession = Depends(get_async_db)):
     """Get real-time dashboard data for frontend"""
     from datetime import datetime, timedelta
     
-    # Get basic stats
-    total_incidents = db.query(Incident).count()
-    verified_incidents = db.query(Incident).filter(Incident.status == "verified").count()
-    high_severity = db.query(Incident).filter(Incident.severity == "high").count()
+    # Get all counts in a single grouped query and fold them in Python
+    severity_counts = {"low": 0, "medium": 0, "high": 0}
+    status_counts = {"unverified": 0, "medium": 0, "verified": 0}
+    total_incidents = 0
+    grouped = await db.execute(select(
+        Incident.severity, Incident.status, func.count()
+    ).group_by(Incident.severity, Incident.status))
+    for severity, status, count in grouped:
+        total_incidents += count
+        if severity in severity_counts:
+            severity_counts[severity] += count
+        if status in status_counts:
+            status_counts[status] += count
+    verified_incidents = status_counts["verified"]
+    high_severity = severity_counts["high"]
     
     # Get recent activity (last 24 hours)
     yesterday = datetime.now() - timedelta(days=1)
-    recent_incidents = db.query(Incident).filter(Incident.incident_id >= total_incidents - 10).all()
-    
-    # Get severity distribution
-    severity_counts = {
-        "low": db.query(Incident).filter(Incident.severity == "low").count(),
-        "medium": db.query(Incident).filter(Incident.severity == "medium").count(),
-        "high": high_severity
-    }
-    
-    # Get status distribution
-    status_counts = {
-        "unverified": db.query(Incident).filter(Incident.status == "unverified").count(),
-        "medium": db.query(Incident).filter(Incident.status == "medium").count(),
-        "verified": verified_incidents
-    }
+    # Project only the summary columns; the sources JSON is never decoded here
+    recent_incidents = (await db.execute(select(
+        Incident.incident_id, Incident.title, Incident.location,
+        Incident.severity, Incident.status, Incident.source_count
+    ).where(Incident.incident_id >= total_incidents - 10))).all()
     
     # Get top locations (by incident count)
-    location_counts = {}
-    for incident in db.query(Incident).all():
-        location = incident.location or "Unknown"
-        location_counts[location] = location_counts.get(location, 0) + 1
-    
-    top_locations = sorted(location_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+    location = func.coalesce(Incident.location, "Unknown")
+    top_locations = (await db.execute(
+        select(location, func.count().label("count")).group_by(location).order_by(desc("count")).limit(5)
+    )).all()
     
-    return {
+    return DashboardResponse.model_validate({
         "summary": {
             "total_incidents": total_incidents,
             "verified_incidents": verified_incidents,
             "high_severity_incidents": high_severity,
             "verification_rate": (verified_incidents / total_incidents * 100) if total_incidents > 0 else 0
         },
-        "recent_activity": [
-            {
-                "incident_id": incident.incident_id,
-                "title": incident.title,
-                "location": incident.location,
-                "severity": incident.severity,
-                "status": incident.status,
-                "sources_count": len(incident.sources) if incident.sources else 0
-            }
-            for incident in recent_incidents
-        ],
+        "recent_activity": recent_incidents,
         "severity_distribution": severity_counts,
         "status_distribution": status_counts,
         "top_locations": [{"location": loc, "count": count} for loc, count in top_locations],
         "last_updated": datetime.now().isoformat()
-    }
+    }, from_attributes=True)
 
-@router.get("/{incident_id}")
-def get_incident_by_id(incident_id: int, db: Session = Depends(get_db)):
+@router.get("/{incident_id}", response_model=IncidentOut, response_model_exclude_none=True)
+async def get_incident_by_id(incident_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get incident details by ID"""
-    incident = db.query(Incident).filter(Incident.incident_id == incident_id).first()
+    incident = await db.get(Incident, incident_id)
     
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
     
-    return {
-        "incident_id": incident.incident_id,
-        "title": incident.title,
-        "description": incident.description,
-        "location": incident.location,
-        "location_lat": incident.location_lat,
-        "location_lng": incident.location_lng,
-        "severity": incident.severity,
-        "status": incident.status,
-        "sources": incident.sources
-    } 
\ No newline at end of file
+    return incident
@@ -1,7 +1,11 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.utils.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Dict, Tuple
+from sqlalchemy import select, func
+import asyncio
+import logging
+import threading
+from app.utils.database import get_async_db
 from pydantic import BaseModel
 from datetime import datetime, timedelta
 import random
@@ -10,6 +14,7 @@ from collections import defaultdict
 from app.services.enhanced_predictive_service import EnhancedPredictiveService
 
 router = APIRouter(prefix="/predictions", tags=["predictions"])
+logger = logging.getLogger(__name__)
 
 class PredictionResponse(BaseModel):
     location: str
@@ -28,31 +33,57 @@ class RiskAssessmentResponse(BaseModel):
     high_confidence_predictions: int
     risk_factors_summary: dict
 
+# Shared predictive service and its recent results, keyed on the incident set signature
+predictive_service = EnhancedPredictiveService()
+PREDICTION_STATUSES = ["verified", "medium", "unverified"]
+PREDICTION_CACHE_SIZE = 4
+_pred_cache: Dict[Tuple[int, int], list] = {}
+_pred_cache_lock = threading.Lock()
+
+async def _cached_predictions(db: AsyncSession) -> list:
+    """Run the predictive service, reusing results while the incident set is unchanged"""
+    # (max id, count) changes whenever incidents are added or removed
+    max_id, count = (await db.execute(select(
+        func.max(Incident.incident_id), func.count(Incident.incident_id)
+    ).where(Incident.status.in_(PREDICTION_STATUSES)))).one()
+    signature = (max_id or 0, count)
+    with _pred_cache_lock:
+        cached = _pred_cache.get(signature)
+    if cached is not None:
+        return cached
+    
+    # Get all incidents
+    incidents = (await db.execute(select(Incident).where(Incident.status.in_(PREDICTION_STATUSES)))).scalars().all()
+    
+    # Convert to dict format for predictive service
+    incidents_data = []
+    for incident in incidents:
+        incidents_data.append({
+            "incident_id": incident.incident_id,
+            "title": incident.title,
+            "location": incident.location,
+            "severity": incident.severity,
+            "status": incident.status,
+            "sources": incident.sources
+        })
+    
+    # CPU-bound; keep it off the event loop
+    predictions = await asyncio.to_thread(predictive_service.predict_incidents, incidents_data)
+    with _pred_cache_lock:
+        _pred_cache[signature] = predictions
+        # Evict the oldest signatures
+        while len(_pred_cache) > PREDICTION_CACHE_SIZE:
+            _pred_cache.pop(next(iter(_pred_cache)))
+    return predictions
+
 @router.get("/", response_model=List[PredictionResponse])
-def get_predictions(
+async def get_predictions(
     confidence_threshold: float = Query(0.3, description="Minimum confidence threshold"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current predictions for potential unrest incidents based on real data and ML analysis"""
     try:
-        # Get all incidents
-        incidents = db.query(Incident).filter(Incident.status.in_(["verified", "medium", "unverified"])).all()
-        
-        # Convert to dict format for predictive service
-        incidents_data = []
-        for incident in incidents:
-            incidents_data.append({
-                "incident_id": incident.incident_id,
-                "title": incident.title,
-                "location": incident.location,
-                "severity": incident.severity,
-                "status": incident.status,
-                "sources": incident.sources
-            })
-        
-        # Use enhanced predictive service
-        predictive_service = EnhancedPredictiveService()
-        predictions = predictive_service.predict_incidents(incidents_data)
+        predictions = await _cached_predictions(db)
         
         # Convert to API response format
         api_predictions = []
@@ -70,59 +101,59 @@ def get_predictions(
                 })
         
         return api_predictions
-    except Exception as e:
-        print(f"Error getting predictions: {e}")
+    except Exception:
+        logger.exception("Error getting predictions")
         return []
 
+def _compute_risk(predictions: List[dict]) -> RiskAssessmentResponse:
+    """Summarize already-computed predictions into an overall risk assessment"""
+    if not predictions:
+        return RiskAssessmentResponse(
+            overall_risk_level="low",
+            risk_score=0.0,
+            active_predictions=0,
+            high_confidence_predictions=0,
+            risk_factors_summary={}
+        )
+    
+    # Calculate overall risk metrics
+    high_confidence = [p for p in predictions if p["confidence"] >= 0.8]
+    high_severity = [p for p in predictions if p["predicted_severity"] == "high"]
+    
+    # Calculate average risk score
+    avg_confidence = sum(p["confidence"] for p in predictions) / len(predictions)
+    
+    # Determine overall risk level
+    if len(high_severity) >= 2 or avg_confidence > 0.8:
+        risk_level = "high"
+    elif len(high_confidence) >= 1 or avg_confidence > 0.6:
+        risk_level = "medium"
+    else:
+        risk_level = "low"
+    
+    # Summarize risk factors
+    risk_factors_summary = {
+        "social_media_volume": 4.0,
+        "crowd_density": 0.7,
+        "market_volatility": 0.55,
+        "news_coverage": 2.0
+    }
+    
+    return RiskAssessmentResponse(
+        overall_risk_level=risk_level,
+        risk_score=avg_confidence,
+        active_predictions=len(predictions),
+        high_confidence_predictions=len(high_confidence),
+        risk_factors_summary=risk_factors_summary
+    )
+
 @router.get("/risk-assessment", response_model=RiskAssessmentResponse)
-def get_risk_assessment(db: Session = Depends(get_db)):
+async def get_risk_assessment(db: AsyncSession = Depends(get_async_db)):
     """Get overall risk assessment and summary"""
     try:
-        # Get predictions
-        predictions = get_predictions(confidence_threshold=0.3, db=db)
-        
-        if not predictions:
-            return RiskAssessmentResponse(
-                overall_risk_level="low",
-                risk_score=0.0,
-                active_predictions=0,
-                high_confidence_predictions=0,
-                risk_factors_summary={}
-            )
-        
-        # Calculate overall risk metrics
-        high_confidence = [p for p in predictions if p["confidence"] >= 0.8]
-        high_severity = [p for p in predictions if p["predicted_severity"] == "high"]
-        
-        # Calculate average risk score
-        avg_confidence = sum(p["confidence"] for p in predictions) / len(predictions)
-        
-        # Determine overall risk level
-        if len(high_severity) >= 2 or avg_confidence > 0.8:
-            risk_level = "high"
-        elif len(high_confidence) >= 1 or avg_confidence > 0.6:
-            risk_level = "medium"
-        else:
-            risk_level = "low"
-        
-        # Summarize risk factors
-        risk_factors_summary = {
-            "social_media_volume": 4.0,
-            "crowd_density": 0.7,
-            "market_volatility": 0.55,
-            "news_coverage": 2.0
-        }
-        
-        return RiskAssessmentResponse(
-            overall_risk_level=risk_level,
-            risk_score=avg_confidence,
-            active_predictions=len(predictions),
-            high_confidence_predictions=len(high_confidence),
-            risk_factors_summary=risk_factors_summary
-        )
-        
-    except Exception as e:
-        print(f"Error getting risk assessment: {e}")
+        return _compute_risk(await get_predictions(confidence_threshold=0.3, db=db))
+    except Exception:
+        logger.exception("Error getting risk assessment")
         return RiskAssessmentResponse(
             overall_risk_level="unknown",
             risk_score=0.0,
@@ -132,12 +163,12 @@ def get_risk_assessment(db: Session = Depends(get_db)):
         )
 
 @router.get("/dashboard")
-def get_predictive_dashboard(db: Session = Depends(get_db)):
+async def get_predictive_dashboard(db: AsyncSession = Depends(get_async_db)):
     """Get comprehensive predictive dashboard data"""
     try:
-        # Get predictions and risk assessment
-        predictions = get_predictions(confidence_threshold=0.3, db=db)
-        risk_assessment = get_risk_assessment(db)
+        # Run predictions once and derive the risk assessment from them
+        predictions = await get_predictions(confidence_threshold=0.3, db=db)
+        risk_assessment = _compute_risk(predictions)
         
         return {
             "predictions": predictions,
@@ -148,8 +179,8 @@ def get_predictive_dashboard(db: Session = Depends(get_db)):
             "last_updated": datetime.utcnow().isoformat()
         }
         
-    except Exception as e:
-        print(f"Error getting predictive dashboard: {e}")
+    except Exception:
+        logger.exception("Error getting predictive dashboard")
         return {
             "predictions": [],
             "risk_assessment": None,
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, HTTPException, Request
+import secrets
+from app.alerts.telegram_bot import telegram_bot
+
+router = APIRouter(prefix="/telegram", tags=["telegram"])
+
+@router.post("/webhook/{token}")
+async def telegram_webhook(token: str, request: Request):
+    """Receive updates pushed by Telegram in webhook mode"""
+    if not telegram_bot.enabled or not telegram_bot.webhook_url:
+        raise HTTPException(status_code=404, detail="Telegram webhook not enabled")
+    if not secrets.compare_digest(token, telegram_bot.token):
+        raise HTTPException(status_code=403, detail="Invalid token")
+    
+    payload = await request.json()
+    await telegram_bot.process_update(payload)
+    return {"status": "ok"}
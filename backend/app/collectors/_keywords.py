@@ -0,0 +1,115 @@
+import logging
+import json
+import os
+from collections import Counter
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Iterable, List, Mapping, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Optional fast JSON decoder
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Optional C automaton for multi-keyword matching
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+KEYWORDS_PATH = os.path.join(os.path.dirname(__file__), '../../data/unrest_keywords.json')
+
+# Used when unrest_keywords.json cannot be read
+FALLBACK_KEYWORDS = {
+    "protest_unrest": ["protest", "riot", "demonstration"],
+    "escalation_violence": ["violence", "clash", "police"],
+    "early_warning": ["gathering", "tension", "planned"],
+    "triggers": ["election", "verdict", "policy"]
+}
+
+@lru_cache(maxsize=1)
+def load_keywords() -> Mapping[str, Tuple[str, ...]]:
+    """Unrest keywords by category, read once per process and shared read-only by all collectors"""
+    try:
+        if HAS_ORJSON:
+            with open(KEYWORDS_PATH, 'rb') as f:
+                keywords = orjson.loads(f.read())
+        else:
+            with open(KEYWORDS_PATH, 'r', encoding='utf-8') as f:
+                keywords = json.load(f)
+    except Exception as e:
+        logger.error("Error loading unrest_keywords.json: %s", e)
+        keywords = FALLBACK_KEYWORDS
+    # Frozen so no instance can mutate the copy every other collector sees
+    return MappingProxyType({category: tuple(terms) for category, terms in keywords.items()})
+
+def unique_terms(terms: Iterable[str]) -> List[str]:
+    """Drop blank and repeated search terms, ignoring case and extra whitespace, keeping first-seen order"""
+    unique = {}
+    for term in terms:
+        term = " ".join(term.split())
+        if term:
+            unique.setdefault(term.lower(), term)
+    return list(unique.values())
+
+def build_automaton(terms: Iterable[str]) -> "ahocorasick.Automaton | None":
+    """Automaton over lowercased terms for count_present (None without pyahocorasick)"""
+    if not HAS_AHOCORASICK:
+        return None
+    automaton = ahocorasick.Automaton()
+    for term, count in Counter(term.lower() for term in terms if term).items():
+        automaton.add_word(term, (term, count))
+    if len(automaton) == 0:
+        return None
+    automaton.make_automaton()
+    return automaton
+
+def count_present(text_lower: str, terms: Iterable[str], automaton: "ahocorasick.Automaton | None") -> int:
+    """How many of terms occur in text_lower, i.e. sum(1 for term in terms if term in text_lower), in one pass; blank terms never count"""
+    if automaton is None:
+        return sum(1 for term in terms if term and term in text_lower)
+    # A term matching several times still counts once (times the number of times it is listed)
+    return sum(dict(match for _, match in automaton.iter(text_lower)).values())
+
+@lru_cache(maxsize=1)
+def get_all_terms() -> Tuple[Tuple[str, ...], "ahocorasick.Automaton | None"]:
+    """Every keyword lowercased and deduplicated, plus an automaton over them (None without pyahocorasick)"""
+    kw = load_keywords()
+    all_keywords = kw["protest_unrest"] + kw["escalation_violence"] + kw["early_warning"] + kw["triggers"]
+    terms = tuple(dict.fromkeys(keyword.lower() for keyword in all_keywords if keyword))
+    automaton = None
+    if HAS_AHOCORASICK and terms:
+        automaton = ahocorasick.Automaton()
+        for term in terms:
+            automaton.add_word(term, term)
+        automaton.make_automaton()
+    return terms, automaton
+
+@lru_cache(maxsize=1)
+def get_term_categories() -> Mapping[str, Tuple[str, ...]]:
+    """Categories each lowercased keyword belongs to (a keyword such as "police" can be in several)"""
+    categories = {}
+    for category, keywords in load_keywords().items():
+        for keyword in keywords:
+            if keyword:
+                categories.setdefault(keyword.lower(), ())
+                if category not in categories[keyword.lower()]:
+                    categories[keyword.lower()] += (category,)
+    return categories
+
+def scan_keywords(text: str) -> List[Tuple[str, str]]:
+    """(category, keyword) pairs for every unrest keyword found in text, each reported once"""
+    terms, automaton = get_all_terms()
+    text = text.lower()
+    if automaton is not None:
+        # One pass over the text whatever the number of keywords
+        found = dict.fromkeys(term for _, term in automaton.iter(text))
+    else:
+        found = [term for term in terms if term in text]
+    categories = get_term_categories()
+    return [(category, term) for term in found for category in categories.get(term, ())]
@@ -0,0 +1,9 @@
+import os
+from typing import Optional
+import numpy as np
+
+def mock_rng(seed: Optional[int] = None) -> np.random.Generator:
+    """Random generator for mock data, seeded from the argument or NOESIS_MOCK_SEED"""
+    if seed is None and os.getenv("NOESIS_MOCK_SEED"):
+        seed = int(os.getenv("NOESIS_MOCK_SEED"))
+    return np.random.default_rng(seed)
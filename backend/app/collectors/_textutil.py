@@ -0,0 +1,31 @@
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Control and C1 characters are dropped outright (str.translate deletes them in C)
+_CTRL_TABLE = dict.fromkeys([*range(0x00, 0x20), *range(0x7F, 0xA0)])
+# Astral-plane characters (outside the BMP) become a space; whitespace runs are collapsed by str.split
+_ASTRAL_RE = re.compile(r'[\U00010000-\U0010FFFF]+')
+
+def sanitize_text(text) -> str:
+    """Sanitize text to prevent encoding issues"""
+    if not text:
+        return ""
+    
+    try:
+        # Handle bytes
+        if isinstance(text, bytes):
+            text = text.decode('utf-8', errors='ignore')
+        
+        # Handle None or non-string types
+        if not isinstance(text, str):
+            text = str(text)
+        
+        text = text.translate(_CTRL_TABLE)
+        if not text.isascii():
+            text = _ASTRAL_RE.sub(' ', text)
+        return ' '.join(text.split())
+    except Exception as e:
+        logger.warning("Text sanitization error: %s", e)
+        return ""
@@ -3,7 +3,10 @@ from typing import List, Dict
 import os
 from datetime import datetime, timedelta
 import json
-import random
+import numpy as np
+
+REGIONS = ["Global", "Asia-Pacific", "Europe", "Americas", "Middle East"]
+COMMODITIES = ["Oil", "Gold", "Food", "Energy"]
 
 class FinancialCollector:
     def __init__(self, api_key: str | None = None):
@@ -41,43 +44,54 @@ class FinancialCollector:
             posts.append(post)
             
         return posts
+
+    async def collect_async(self) -> List[Dict]:
+        """Collect financial data; the mock is generated in-process, so there is nothing to await"""
+        return self.collect()
     
-    def _get_mock_financial_data(self) -> List[Dict]:
+    def _get_mock_financial_data(self, count: int = 4) -> List[Dict]:
         """Generate mock financial data for demonstration"""
-        regions = ["Global", "Asia-Pacific", "Europe", "Americas", "Middle East"]
-        commodities = ["Oil", "Gold", "Food", "Energy"]
+        rng = np.random.default_rng()
         
-        mock_data = []
-        for i in range(4):
-            region = random.choice(regions)
-            market_volatility = random.uniform(0.1, 0.9)
-            currency_fluctuation = random.uniform(-0.15, 0.15)
-            commodity_price_change = random.uniform(-0.2, 0.2)
-            economic_confidence = random.uniform(0.2, 0.9)
-            
-            # Determine if this indicates potential economic unrest
-            if (market_volatility > 0.7 or abs(currency_fluctuation) > 0.1 or 
-                abs(commodity_price_change) > 0.15 or economic_confidence < 0.4):
-                description = f"Economic instability detected in {region}. High volatility and market stress indicators."
-                severity = "high"
-            else:
-                description = f"Stable economic conditions in {region}. Normal market activity observed."
-                severity = "low"
-            
-            mock_data.append({
+        # Draw every indicator for all records at once
+        regions = rng.choice(REGIONS, count).tolist()
+        market_volatility = rng.uniform(0.1, 0.9, count)
+        currency_fluctuation = rng.uniform(-0.15, 0.15, count)
+        commodity_price_change = rng.uniform(-0.2, 0.2, count)
+        economic_confidence = rng.uniform(0.2, 0.9, count)
+        oil = 1 + rng.uniform(-0.1, 0.1, count)
+        gold = 1 + rng.uniform(-0.05, 0.05, count)
+        food = 1 + rng.uniform(-0.15, 0.15, count)
+        hours_ago = rng.integers(1, 13, count).tolist()
+        
+        # Determine which records indicate potential economic unrest
+        unrest = ((market_volatility > 0.7) | (np.abs(currency_fluctuation) > 0.1) |
+                  (np.abs(commodity_price_change) > 0.15) | (economic_confidence < 0.4)).tolist()
+        
+        now = datetime.utcnow()
+        return [
+            {
                 "id": f"fin_{i+1}",
-                "description": description,
+                "description": (
+                    f"Economic instability detected in {region}. High volatility and market stress indicators."
+                    if is_unrest else
+                    f"Stable economic conditions in {region}. Normal market activity observed."
+                ),
                 "region": region,
-                "timestamp": (datetime.utcnow() - timedelta(hours=random.randint(1, 12))).isoformat(),
-                "market_volatility": market_volatility,
-                "currency_fluctuation": currency_fluctuation,
+                "timestamp": (now - timedelta(hours=hours)).isoformat(),
+                "market_volatility": mv,
+                "currency_fluctuation": cf,
                 "commodity_prices": {
-                    "oil": 1 + random.uniform(-0.1, 0.1),
-                    "gold": 1 + random.uniform(-0.05, 0.05),
-                    "food": 1 + random.uniform(-0.15, 0.15)
+                    "oil": o,
+                    "gold": g,
+                    "food": f
                 },
-                "economic_confidence": economic_confidence,
-                "severity": severity
-            })
-        
-        return mock_data 
\ No newline at end of file
+                "economic_confidence": ec,
+                "severity": "high" if is_unrest else "low"
+            }
+            for i, (region, mv, cf, ec, o, g, f, hours, is_unrest) in enumerate(zip(
+                regions, market_volatility.tolist(), currency_fluctuation.tolist(),
+                economic_confidence.tolist(), oil.tolist(), gold.tolist(), food.tolist(),
+                hours_ago, unrest
+            ))
+        ]
@@ -1,13 +1,21 @@
 import requests
-from typing import List, Dict
+from typing import List, Dict, Optional
 import os
 from datetime import datetime, timedelta
 import json
-import random
+import numpy as np
+from app.collectors._mock import mock_rng
+
+LOCATIONS = [
+    "Central Square", "Government Building", "University Campus",
+    "Shopping Mall", "Transport Hub", "Residential Area"
+]
 
 class IoTCollector:
-    def __init__(self, api_key: str = ""):  # Default to empty string
+    def __init__(self, api_key: str = "", seed: Optional[int] = None):  # Default to empty string
         self.api_key = api_key or os.getenv("IOT_API_KEY") or ""
+        # A fixed seed (argument or NOESIS_MOCK_SEED) makes the mock data reproducible
+        self._rng = mock_rng(seed)
         self.base_url = "https://api.iot-sensors.com/v1"  # Placeholder
         
     def collect(self) -> List[Dict]:
@@ -36,43 +44,48 @@ class IoTCollector:
             posts.append(post)
             
         return posts
+
+    async def collect_async(self) -> List[Dict]:
+        """Collect IoT sensor data; the mock is generated in-process, so there is nothing to await"""
+        return self.collect()
     
-    def _get_mock_iot_data(self) -> List[Dict]:
+    def _get_mock_iot_data(self, count: int = 6) -> List[Dict]:
         """Generate mock IoT sensor data for demonstration"""
-        locations = [
-            "Central Square", "Government Building", "University Campus", 
-            "Shopping Mall", "Transport Hub", "Residential Area"
-        ]
+        rng = self._rng
         
-        mock_data = []
-        for i in range(6):
-            location = random.choice(locations)
-            crowd_density = random.uniform(0.1, 1.0)
-            traffic_congestion = random.uniform(0.1, 1.0)
-            air_quality = random.uniform(0.3, 1.0)  # 0.3 = poor, 1.0 = excellent
-            noise_levels = random.uniform(0.1, 1.0)  # 0.1 = quiet, 1.0 = very loud
-            sensor_confidence = random.uniform(0.7, 0.98)
-            
-            # Determine if this indicates potential unrest
-            if (crowd_density > 0.8 or traffic_congestion > 0.8 or 
-                air_quality < 0.5 or noise_levels > 0.8):
-                description = f"Anomalous sensor readings in {location}. High activity and environmental stress detected."
-                alert_level = "high"
-            else:
-                description = f"Normal sensor readings in {location}. Standard activity levels maintained."
-                alert_level = "low"
-            
-            mock_data.append({
+        # Draw every reading for all sensors at once
+        locations = rng.choice(LOCATIONS, count).tolist()
+        crowd_density = rng.uniform(0.1, 1.0, count)
+        traffic_congestion = rng.uniform(0.1, 1.0, count)
+        air_quality = rng.uniform(0.3, 1.0, count)  # 0.3 = poor, 1.0 = excellent
+        noise_levels = rng.uniform(0.1, 1.0, count)  # 0.1 = quiet, 1.0 = very loud
+        sensor_confidence = rng.uniform(0.7, 0.98, count)
+        minutes_ago = rng.integers(5, 61, count).tolist()
+        
+        # Determine which readings indicate potential unrest
+        alert = ((crowd_density > 0.8) | (traffic_congestion > 0.8) |
+                 (air_quality < 0.5) | (noise_levels > 0.8)).tolist()
+        
+        now = datetime.utcnow()
+        return [
+            {
                 "id": f"iot_{i+1}",
-                "description": description,
+                "description": (
+                    f"Anomalous sensor readings in {location}. High activity and environmental stress detected."
+                    if is_alert else
+                    f"Normal sensor readings in {location}. Standard activity levels maintained."
+                ),
                 "location": location,
-                "timestamp": (datetime.utcnow() - timedelta(minutes=random.randint(5, 60))).isoformat(),
-                "crowd_density": crowd_density,
-                "traffic_congestion": traffic_congestion,
-                "air_quality": air_quality,
-                "noise_levels": noise_levels,
-                "sensor_confidence": sensor_confidence,
-                "alert_level": alert_level
-            })
-        
-        return mock_data 
\ No newline at end of file
+                "timestamp": (now - timedelta(minutes=minutes)).isoformat(),
+                "crowd_density": crowd,
+                "traffic_congestion": traffic,
+                "air_quality": aq,
+                "noise_levels": noise,
+                "sensor_confidence": conf,
+                "alert_level": "high" if is_alert else "low"
+            }
+            for i, (location, crowd, traffic, aq, noise, conf, minutes, is_alert) in enumerate(zip(
+                locations, crowd_density.tolist(), traffic_congestion.tolist(), air_quality.tolist(),
+                noise_levels.tolist(), sensor_confidence.tolist(), minutes_ago, alert
+            ))
+        ]
@@ -1,237 +1,275 @@
-import requests
-import feedparser
-from typing import List, Dict
+import logging
+import asyncio
+import aiohttp
+from typing import List, Dict, Optional, Tuple
+from app.collectors._textutil import sanitize_text
+from app.collectors._keywords import load_keywords, get_all_terms, unique_terms
 import os
 from datetime import datetime
-import json
+
+logger = logging.getLogger(__name__)
+
+# libxml2-backed parser when available; the stdlib parser otherwise
+try:
+    from lxml import etree as ET
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
+
+# Maximum simultaneous connections to the GNews API
+GNEWS_CONCURRENCY = 10
+# Keywords combined into each GNews query with OR
+GNEWS_TERMS_PER_QUERY = 8
+
+# RSS feeds for news sources
+RSS_FEEDS = [
+    "https://feeds.bbci.co.uk/news/rss.xml",
+    "https://rss.cnn.com/rss/edition.rss",
+    "https://feeds.reuters.com/Reuters/worldNews",
+    "https://timesofindia.indiatimes.com/rssfeedstopstories.cms",
+    "https://indianexpress.com/section/india/feed/",
+    "https://www.hindustantimes.com/feeds/rss/india-news/rssfeed.xml"
+]
 
 class NewsCollector:
     def __init__(self, gnews_api_key: str = None):
         self.gnews_api_key = gnews_api_key or os.getenv("GNEWS_API_KEY")
         self.base_url = "https://gnews.io/api/v4/search"
-        self.keywords = self._load_keywords()
+        self.keywords = load_keywords()
+        # Derived once per instance; collect calls reuse them
+        self._queries = self._build_queries()
+        self._kw_lower, self._kw_automaton = get_all_terms()
 
-    def _load_keywords(self):
-        try:
-            with open(os.path.join(os.path.dirname(__file__), '../../data/unrest_keywords.json'), 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading unrest_keywords.json: {e}")
-            # Fallback to a basic set
-            return {
-                "protest_unrest": ["protest", "riot", "demonstration"],
-                "escalation_violence": ["violence", "clash", "police"],
-                "early_warning": ["gathering", "tension", "planned"],
-                "triggers": ["election", "verdict", "policy"]
-            }
+    def _has_keyword(self, text: str) -> bool:
+        """Whether text contains any unrest keyword, in a single pass over the text"""
+        text = text.lower()
+        if self._kw_automaton is not None:
+            return next(self._kw_automaton.iter(text), None) is not None
+        return any(keyword in text for keyword in self._kw_lower)
 
-    def collect_gnews(self) -> List[Dict]:
-        """Collect news from GNews API"""
+    def _build_queries(self) -> Tuple[str, ...]:
+        """Build OR-grouped queries so one request covers several terms"""
+        kw = self.keywords
+        main_terms = unique_terms(kw["protest_unrest"] + kw["escalation_violence"] + kw["early_warning"])
+        groups = [main_terms[i:i + GNEWS_TERMS_PER_QUERY] for i in range(0, len(main_terms), GNEWS_TERMS_PER_QUERY)]
+        return tuple(" OR ".join(f'"{term}"' for term in group) for group in groups)[:20]
+
+    async def _fetch_gnews(self, session: aiohttp.ClientSession, keyword: str, country: str) -> Optional[Dict]:
+        """Fetch one GNews search; returns None when the API key is rejected"""
+        params = {
+            "q": keyword,
+            "token": self.gnews_api_key,
+            "lang": "en",
+            "country": country,
+            "max": 10,
+            "sortby": "publishedAt"
+        }
+        async with session.get(self.base_url, params=params) as response:
+            if response.status == 401:
+                return None
+            response.raise_for_status()
+            return await response.json()
+
+    def _parse_gnews_articles(self, data: Dict) -> List[Dict]:
+        posts = []
+        for article in data.get("articles", []):
+            try:
+                title = sanitize_text(article.get("title", ""))
+                description = sanitize_text(article.get("description", ""))
+                if not title and not description:
+                    continue
+                content = title + " " + description
+                post = {
+                    "platform": "gnews",
+                    "content": content,
+                    "_sanitized": True,  # content already passed through sanitize_text
+                    "author": sanitize_text(article.get("source", {}).get("name", "Unknown")),
+                    "timestamp": article.get("publishedAt", ""),
+                    "location_raw": "",
+                    "link": article.get("url", ""),
+                    "extra": {
+                        "title": title,
+                        "source": article.get("source", {}).get("name", ""),
+                        "publishedAt": article.get("publishedAt", "")
+                    }
+                }
+                posts.append(post)
+                logger.debug("Collected GNews article: %s...", title[:100])
+            except Exception as e:
+                logger.warning("Error processing GNews article: %s", e)
+                continue
+        return posts
+
+    def _new_session(self) -> aiohttp.ClientSession:
+        """HTTP session whose keep-alive pool is shared by every request in one collection run"""
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=GNEWS_CONCURRENCY),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+
+    async def collect_gnews_async(self, session: Optional[aiohttp.ClientSession] = None) -> List[Dict]:
+        """Collect news from GNews API, issuing all searches concurrently"""
         posts = []
         
         if not self.gnews_api_key:
-            print("GNews API key not configured. Using mock data.")
+            logger.info("GNews API key not configured. Using mock data.")
             return self._get_mock_data()
         
+        if session is None:
+            async with self._new_session() as session:
+                return await self.collect_gnews_async(session)
+        
         try:
-            kw = self.keywords
-            # Build queries: main terms and some combinations
-            main_terms = kw["protest_unrest"] + kw["escalation_violence"] + kw["early_warning"]
-            queries = main_terms[:]
-            for p in kw["protest_unrest"]:
-                for e in kw["escalation_violence"]:
-                    queries.append(f'{p} {e}')
-                for t in kw["triggers"]:
-                    queries.append(f'{p} {t}')
-            queries = queries[:20]
-            for keyword in queries:
-                for country in ["us", "in"]:  # Query both US and India
-                    try:
-                        url = self.base_url
-                        params = {
-                            "q": keyword,
-                            "token": self.gnews_api_key,
-                            "lang": "en",
-                            "country": country,
-                            "max": 10,
-                            "sortby": "publishedAt"
-                        }
-                        response = requests.get(url, params=params, timeout=10)
-                        if response.status_code == 401:
-                            print("GNews API key is invalid. Using mock data.")
-                            return self._get_mock_data()
-                        response.raise_for_status()
-                        data = response.json()
-                        if "articles" in data:
-                            for article in data["articles"]:
-                                try:
-                                    title = self._sanitize_text(article.get("title", ""))
-                                    description = self._sanitize_text(article.get("description", ""))
-                                    content = title + " " + description
-                                    if not content:
-                                        continue
-                                    post = {
-                                        "platform": "gnews",
-                                        "content": content,
-                                        "author": self._sanitize_text(article.get("source", {}).get("name", "Unknown")),
-                                        "timestamp": article.get("publishedAt", ""),
-                                        "location_raw": "",
-                                        "link": article.get("url", ""),
-                                        "extra": {
-                                            "title": title,
-                                            "source": article.get("source", {}).get("name", ""),
-                                            "publishedAt": article.get("publishedAt", "")
-                                        }
-                                    }
-                                    posts.append(post)
-                                    print(f"Collected GNews article: {title[:100]}...")
-                                except Exception as e:
-                                    print(f"Error processing GNews article: {e}")
-                                    continue
-                    except Exception as e:
-                        print(f"Error collecting GNews data for keyword {keyword} in country {country}: {e}")
+            # Query both US and India for every keyword
+            searches = [(keyword, country) for keyword in self._queries for country in ["us", "in"]]
+            results = await asyncio.gather(
+                *[self._fetch_gnews(session, keyword, country) for keyword, country in searches],
+                return_exceptions=True
+            )
+            
+            seen_urls = set()
+            for (keyword, country), data in zip(searches, results):
+                if isinstance(data, Exception):
+                    logger.warning("Error collecting GNews data for keyword %s in country %s: %s", keyword, country, data)
+                    continue
+                if data is None:
+                    logger.warning("GNews API key is invalid. Using mock data.")
+                    return self._get_mock_data()
+                # Grouped queries overlap, so the same article can come back more than once
+                for post in self._parse_gnews_articles(data):
+                    if post["link"] and post["link"] in seen_urls:
                         continue
+                    seen_urls.add(post["link"])
+                    posts.append(post)
             
-            print(f"Successfully collected {len(posts)} GNews articles")
+            logger.info("Successfully collected %d GNews articles", len(posts))
             
         except Exception as e:
-            print(f"Error collecting GNews data: {e}")
-            print("Using mock data instead")
+            logger.error("Error collecting GNews data: %s. Using mock data instead", e)
             posts = self._get_mock_data()
         
         return posts
 
-    def collect_rss(self) -> List[Dict]:
-        """Collect news from RSS feeds"""
+    def collect_gnews(self) -> List[Dict]:
+        """Collect news from GNews API (blocking wrapper around collect_gnews_async)"""
+        return asyncio.run(self.collect_gnews_async())
+
+    @staticmethod
+    def _parse_rss_items(body: bytes) -> list:
+        """Parse a feed document and return its first 10 items"""
+        if HAS_LXML:
+            # recover=True tolerates the malformed markup some feeds serve
+            root = ET.fromstring(body, parser=ET.XMLParser(recover=True, huge_tree=False, resolve_entities=False))
+        else:
+            root = ET.fromstring(body)
+        return root.findall(".//item")[:10]
+
+    async def _fetch_and_parse(self, session: aiohttp.ClientSession, feed_url: str) -> list:
+        async with session.get(feed_url) as response:
+            response.raise_for_status()
+            body = await response.read()
+        # XML parsing is CPU work; run it off the loop so other feeds keep downloading
+        return await asyncio.to_thread(self._parse_rss_items, body)
+
+    async def collect_rss_async(self, session: Optional[aiohttp.ClientSession] = None) -> List[Dict]:
+        """Collect news from RSS feeds, fetching all feeds concurrently"""
         posts = []
         
+        if session is None:
+            async with self._new_session() as session:
+                return await self.collect_rss_async(session)
+        
         try:
-            # RSS feeds for news sources
-            rss_feeds = [
-                "https://feeds.bbci.co.uk/news/rss.xml",
-                "https://rss.cnn.com/rss/edition.rss",
-                "https://feeds.reuters.com/Reuters/worldNews",
-                "https://timesofindia.indiatimes.com/rssfeedstopstories.cms",
-                "https://indianexpress.com/section/india/feed/",
-                "https://www.hindustantimes.com/feeds/rss/india-news/rssfeed.xml"
-            ]
+            results = await asyncio.gather(
+                *[self._fetch_and_parse(session, feed_url) for feed_url in RSS_FEEDS],
+                return_exceptions=True
+            )
             
-            for feed_url in rss_feeds:
-                try:
-                    response = requests.get(feed_url, timeout=10)
-                    response.raise_for_status()
-                    
-                    # Parse RSS feed
-                    import xml.etree.ElementTree as ET
-                    root = ET.fromstring(response.content)
-                    
-                    # Find items
-                    items = root.findall(".//item")
+            for feed_url, items in zip(RSS_FEEDS, results):
+                if isinstance(items, Exception):
+                    logger.warning("Error collecting RSS from %s: %s", feed_url, items)
+                    continue
+                
+                for item in items:
+                    try:
+                        title_elem = item.find("title")
+                        description_elem = item.find("description")
+                        link_elem = item.find("link")
+                        pub_date_elem = item.find("pubDate")
                     
-                    for item in items[:10]:  # Limit to 10 items per feed
-                        try:
-                            title_elem = item.find("title")
-                            description_elem = item.find("description")
-                            link_elem = item.find("link")
-                            pub_date_elem = item.find("pubDate")
-                            
-                            if title_elem is not None:
-                                title = self._sanitize_text(title_elem.text or "")
-                                description = self._sanitize_text(description_elem.text or "") if description_elem is not None else ""
+                        if title_elem is not None:
+                            title = sanitize_text(title_elem.text)
+                            description = sanitize_text(description_elem.text) if description_elem is not None else ""
+                            if not title and not description:
+                                continue
+                        
+                            # Check for an unrest-related keyword; the description is only scanned when the title misses
+                            if self._has_keyword(title) or self._has_keyword(description):
                                 content = title + " " + description
-                                
-                                if not content:
-                                    continue
-                                # Check if content contains any unrest-related keyword
-                                kw = self.keywords
-                                all_keywords = kw["protest_unrest"] + kw["escalation_violence"] + kw["early_warning"] + kw["triggers"]
-                                if any(keyword.lower() in content.lower() for keyword in all_keywords):
-                                    post = {
-                                        "platform": "rss",
-                                        "content": content,
-                                        "author": "RSS Feed",
-                                        "timestamp": pub_date_elem.text if pub_date_elem is not None else "",
-                                        "location_raw": "",
-                                        "link": link_elem.text if link_elem is not None else "",
-                                        "extra": {
-                                            "title": title,
-                                            "source": feed_url,
-                                            "feed_type": "rss"
-                                        }
+                                post = {
+                                    "platform": "rss",
+                                    "content": content,
+                                    "_sanitized": True,  # content already passed through sanitize_text
+                                    "author": "RSS Feed",
+                                    "timestamp": pub_date_elem.text if pub_date_elem is not None else "",
+                                    "location_raw": "",
+                                    "link": link_elem.text if link_elem is not None else "",
+                                    "extra": {
+                                        "title": title,
+                                        "source": feed_url,
+                                        "feed_type": "rss"
                                     }
-                                    posts.append(post)
-                                    print(f"Collected RSS article: {title[:100]}...")
-                                
-                        except Exception as e:
-                            print(f"Error processing RSS item: {e}")
-                            continue
-                            
-                except Exception as e:
-                    print(f"Error collecting RSS from {feed_url}: {e}")
-                    continue
+                                }
+                                posts.append(post)
+                                logger.debug("Collected RSS article: %s...", title[:100])
+                        
+                    except Exception as e:
+                        logger.warning("Error processing RSS item: %s", e)
+                        continue
             
-            print(f"Successfully collected {len(posts)} RSS articles")
+            logger.info("Successfully collected %d RSS articles", len(posts))
             
         except Exception as e:
-            print(f"Error collecting RSS data: {e}")
-            print("Using mock data instead")
+            logger.error("Error collecting RSS data: %s. Using mock data instead", e)
             posts = self._get_mock_data()
         
         return posts
 
-    def collect(self) -> List[Dict]:
-        """Collect news from all sources (GNews + RSS)"""
+    def collect_rss(self) -> List[Dict]:
+        """Collect news from RSS feeds (blocking wrapper around collect_rss_async)"""
+        return asyncio.run(self.collect_rss_async())
+
+    async def collect_async(self) -> List[Dict]:
+        """Collect news from all sources (GNews + RSS) over one shared HTTP session"""
         posts = []
-        try:
-            posts.extend(self.collect_gnews())
-        except Exception as e:
-            print(f"Error in collect_gnews: {e}")
-        try:
-            posts.extend(self.collect_rss())
-        except Exception as e:
-            print(f"Error in collect_rss: {e}")
+        async with self._new_session() as session:
+            results = await asyncio.gather(
+                self.collect_gnews_async(session), self.collect_rss_async(session),
+                return_exceptions=True
+            )
+        for name, result in zip(["collect_gnews", "collect_rss"], results):
+            if isinstance(result, Exception):
+                logger.error("Error in %s: %s", name, result)
+                continue
+            posts.extend(result)
         return posts
 
-    def _sanitize_text(self, text: str) -> str:
-        """Sanitize text to prevent encoding issues"""
-        if not text:
-            return ""
-        
-        try:
-            # Handle bytes
-            if isinstance(text, bytes):
-                text = text.decode('utf-8', errors='ignore')
-            
-            # Handle None or non-string types
-            if not isinstance(text, str):
-                text = str(text)
-            
-            # Remove problematic characters
-            import re
-            # Remove control characters and non-printable characters
-            text = re.sub(r'[\x00-\x1F\x7F-\x9F]', '', text)
-            # Remove characters that can't be encoded properly
-            text = re.sub(r'[^\x20-\x7E\u00A0-\uFFFF]', ' ', text)
-            # Replace multiple spaces and newlines
-            text = re.sub(r'\s+', ' ', text)
-            # Remove any remaining problematic characters
-            text = ''.join(char for char in text if ord(char) < 65536)
-            
-            return text.strip()
-        except Exception as e:
-            print(f"Text sanitization error: {e}")
-            return ""
+    def collect(self) -> List[Dict]:
+        """Collect news from all sources (GNews + RSS)"""
+        return asyncio.run(self.collect_async())
 
     def _get_mock_data(self) -> List[Dict]:
         """Generate mock news data for testing"""
         from datetime import datetime, timedelta
         
+        now = datetime.utcnow()
         mock_posts = [
             {
                 "platform": "gnews",
                 "content": "Breaking: Civil unrest reported in multiple cities. Authorities monitoring situation.",
                 "author": "News Agency",
-                "timestamp": (datetime.utcnow() - timedelta(hours=3)).isoformat(),
+                "timestamp": (now - timedelta(hours=3)).isoformat(),
                 "location_raw": "Multiple Cities",
                 "link": "https://news.example.com/article/123",
                 "extra": {"title": "Civil Unrest Report", "source": "News Agency"}
@@ -240,12 +278,12 @@ class NewsCollector:
                 "platform": "rss",
                 "content": "Protest organizers announce new rally location. Police monitoring situation.",
                 "author": "RSS Feed",
-                "timestamp": (datetime.utcnow() - timedelta(hours=4)).isoformat(),
+                "timestamp": (now - timedelta(hours=4)).isoformat(),
                 "location_raw": "Downtown",
                 "link": "https://rss.example.com/article/456",
                 "extra": {"title": "Protest Rally Update", "source": "RSS Feed"}
             }
         ]
         
-        print("Using mock news data")
+        logger.info("Using mock news data")
         return mock_posts 
\ No newline at end of file
@@ -1,8 +1,27 @@
-import praw
-from typing import List, Dict
+import logging
+import asyncio
+from typing import List, Dict, Tuple, TYPE_CHECKING
+from app.collectors._textutil import sanitize_text
+from app.collectors._keywords import load_keywords, unique_terms
 import os
 from datetime import datetime
-import json
+
+if TYPE_CHECKING:
+    import asyncpraw
+
+logger = logging.getLogger(__name__)
+
+# Maximum simultaneous Reddit searches
+REDDIT_CONCURRENCY = 10
+# Results per combined-subreddit search (was 5 per subreddit)
+REDDIT_SEARCH_LIMIT = 50
+
+# Expanded subreddit list (add more as needed)
+SUBREDDITS = [
+    "news", "worldnews", "politics", "protests", "PublicFreakout", "Bad_Cop_No_Donut",
+    "worldprotest", "inthenews", "UpliftingNews", "offbeat", "usnews", "ukpolitics",
+    "europe", "canada", "australia", "IndiaSpeaks", "unitedkingdom", "nyc", "LosAngeles", "Chicago"
+]
 
 class RedditCollector:
     def __init__(self, client_id: str = None, client_secret: str = None, user_agent: str = None):
@@ -11,150 +30,123 @@ class RedditCollector:
         self.user_agent = user_agent or os.getenv("REDDIT_USER_AGENT", "NOESIS_Bot/1.0")
         
         if not (self.client_id and self.client_secret and self.user_agent):
-            print("Reddit API credentials (client_id, client_secret, user_agent) are required for real data. Using mock data.")
-            self.reddit = None
+            logger.info("Reddit API credentials (client_id, client_secret, user_agent) are required for real data. Using mock data.")
+            self.enabled = False
         else:
-            try:
-                self.reddit = praw.Reddit(
-                    client_id=self.client_id,
-                    client_secret=self.client_secret,
-                    user_agent=self.user_agent
-                )
-            except Exception as e:
-                print(f"Error initializing Reddit client: {e}")
-                self.reddit = None
+            self.enabled = True
 
         # Load unrest keywords
-        self.keywords = self._load_keywords()
+        self.keywords = load_keywords()
+        # Derived once per instance; collect calls reuse them
+        self._queries = self._build_queries()
 
-    def _load_keywords(self):
-        try:
-            with open(os.path.join(os.path.dirname(__file__), '../../data/unrest_keywords.json'), 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading unrest_keywords.json: {e}")
-            # Fallback to a basic set
-            return {
-                "protest_unrest": ["protest", "riot", "demonstration"],
-                "escalation_violence": ["violence", "clash", "police"],
-                "early_warning": ["gathering", "tension", "planned"],
-                "triggers": ["election", "verdict", "policy"]
-            }
+    def _new_client(self) -> "asyncpraw.Reddit":
+        """Create a Reddit client; its HTTP session is bound to the running event loop"""
+        # Imported here so processes that never search Reddit don't pay for asyncpraw's import
+        import asyncpraw
+        return asyncpraw.Reddit(
+            client_id=self.client_id,
+            client_secret=self.client_secret,
+            user_agent=self.user_agent,
+            # Skip the PyPI version check made on client creation
+            check_for_updates=False
+        )
 
-    def collect(self) -> List[Dict]:
-        """Collect recent Reddit posts about protests and civil unrest"""
+    def _build_queries(self) -> Tuple[str, ...]:
+        """Build search queries: main terms and some combinations, deduplicated"""
+        kw = self.keywords
+        main_terms = kw["protest_unrest"] + kw["escalation_violence"] + kw["early_warning"]
+        # Add some AND combinations for higher signal
+        combos = [f'{p} {e}' for p in kw["protest_unrest"] for e in kw["escalation_violence"]]
+        combos += [f'{p} {t}' for p in kw["protest_unrest"] for t in kw["triggers"]]
+        # Deduplicate before truncating so repeats don't crowd out distinct queries
+        return tuple(unique_terms([*main_terms, *combos]))[:20]  # Limit to avoid API abuse
+
+    async def _search(self, reddit: "asyncpraw.Reddit", semaphore: asyncio.Semaphore, subreddit: str, query: str, seen: set) -> List[Dict]:
+        """Run one (multi-)subreddit search and convert unseen submissions to posts"""
+        posts = []
+        async with semaphore:
+            try:
+                sub = await reddit.subreddit(subreddit)
+                async for submission in sub.search(query, sort='new', time_filter='day', limit=REDDIT_SEARCH_LIMIT):
+                    # Different queries can match the same submission
+                    if submission.id in seen:
+                        continue
+                    seen.add(submission.id)
+                    try:
+                        # Filter on text first; the remaining attributes are only read for kept posts
+                        content = sanitize_text(submission.title + " " + (submission.selftext or ""))
+                        if not content:
+                            continue
+                        author = submission.author
+                        post = {
+                            "platform": "reddit",
+                            "content": content,
+                            "_sanitized": True,  # content already passed through sanitize_text
+                            "author": str(author) if author else "unknown",
+                            "timestamp": datetime.fromtimestamp(submission.created_utc).isoformat(),
+                            "location_raw": "",
+                            "link": f"https://reddit.com{submission.permalink}",
+                            "extra": {
+                                "subreddit": str(submission.subreddit),
+                                "score": submission.score,
+                                "num_comments": submission.num_comments
+                            }
+                        }
+                        posts.append(post)
+                        logger.debug("Collected Reddit post: %s...", content[:100])
+                    except Exception as e:
+                        logger.warning("Error processing Reddit submission: %s", e)
+                        continue
+            except Exception as e:
+                logger.warning("Error searching subreddit %s with query '%s': %s", subreddit, query, e)
+        return posts
+
+    async def collect_async(self) -> List[Dict]:
+        """Collect recent Reddit posts, running the subreddit searches concurrently"""
         posts = []
         
         try:
             # Check if API credentials are available
-            if not self.reddit:
-                print("Reddit API credentials not configured, using mock data")
+            if not self.enabled:
+                logger.info("Reddit API credentials not configured, using mock data")
                 return self._get_mock_data()
             
-            # Load keywords and subreddits
-            kw = self.keywords
-            # Expanded subreddit list (add more as needed)
-            subreddits = [
-                "news", "worldnews", "politics", "protests", "PublicFreakout", "Bad_Cop_No_Donut",
-                "worldprotest", "inthenews", "UpliftingNews", "offbeat", "usnews", "ukpolitics",
-                "europe", "canada", "australia", "IndiaSpeaks", "unitedkingdom", "nyc", "LosAngeles", "Chicago"
-            ]
-            # Build search queries: main terms and some combinations
-            main_terms = kw["protest_unrest"] + kw["escalation_violence"] + kw["early_warning"]
-            queries = main_terms[:]
-            # Add some AND combinations for higher signal
-            for p in kw["protest_unrest"]:
-                for e in kw["escalation_violence"]:
-                    queries.append(f'{p} {e}')
-                for t in kw["triggers"]:
-                    queries.append(f'{p} {t}')
-            queries = queries[:20]  # Limit to avoid API abuse
-
-            for subreddit in subreddits:
-                for query in queries:
-                    try:
-                        search_results = self.reddit.subreddit(subreddit).search(
-                            query,
-                            sort='new',
-                            time_filter='day',
-                            limit=5
-                        )
-                        for submission in search_results:
-                            try:
-                                content = self._sanitize_text(submission.title + " " + (submission.selftext or ""))
-                                if not content:
-                                    continue
-                                post = {
-                                    "platform": "reddit",
-                                    "content": content,
-                                    "author": str(submission.author) if submission.author else "unknown",
-                                    "timestamp": datetime.fromtimestamp(submission.created_utc).isoformat(),
-                                    "location_raw": "",
-                                    "link": f"https://reddit.com{submission.permalink}",
-                                    "extra": {
-                                        "subreddit": subreddit,
-                                        "score": submission.score,
-                                        "num_comments": submission.num_comments
-                                    }
-                                }
-                                posts.append(post)
-                                print(f"Collected Reddit post: {content[:100]}...")
-                            except Exception as e:
-                                print(f"Error processing Reddit submission: {e}")
-                                continue
-                    except Exception as e:
-                        print(f"Error searching subreddit {subreddit} with query '{query}': {e}")
-                        continue
+            # Bounded so we stay within Reddit's rate limit
+            semaphore = asyncio.Semaphore(REDDIT_CONCURRENCY)
+            # One search per query across all subreddits (r/a+b+c syntax)
+            combined = "+".join(SUBREDDITS)
+            seen = set()
+            async with self._new_client() as reddit:
+                results = await asyncio.gather(
+                    *[self._search(reddit, semaphore, combined, query, seen) for query in self._queries]
+                )
+            for result in results:
+                posts.extend(result)
             
-            print(f"Successfully collected {len(posts)} Reddit posts")
+            logger.info("Successfully collected %d Reddit posts", len(posts))
             
         except Exception as e:
-            print(f"Error collecting Reddit data: {e}")
-            print("Using mock data instead")
+            logger.error("Error collecting Reddit data: %s. Using mock data instead", e)
             posts = self._get_mock_data()
         
         return posts
 
-    def _sanitize_text(self, text: str) -> str:
-        """Sanitize text to prevent encoding issues"""
-        if not text:
-            return ""
-        
-        try:
-            # Handle bytes
-            if isinstance(text, bytes):
-                text = text.decode('utf-8', errors='ignore')
-            
-            # Handle None or non-string types
-            if not isinstance(text, str):
-                text = str(text)
-            
-            # Remove problematic characters
-            import re
-            # Remove control characters and non-printable characters
-            text = re.sub(r'[\x00-\x1F\x7F-\x9F]', '', text)
-            # Remove characters that can't be encoded properly
-            text = re.sub(r'[^\x20-\x7E\u00A0-\uFFFF]', ' ', text)
-            # Replace multiple spaces and newlines
-            text = re.sub(r'\s+', ' ', text)
-            # Remove any remaining problematic characters
-            text = ''.join(char for char in text if ord(char) < 65536)
-            
-            return text.strip()
-        except Exception as e:
-            print(f"Text sanitization error: {e}")
-            return ""
+    def collect(self) -> List[Dict]:
+        """Collect recent Reddit posts about protests and civil unrest"""
+        return asyncio.run(self.collect_async())
 
     def _get_mock_data(self) -> List[Dict]:
         """Generate mock Reddit data for testing"""
         from datetime import datetime, timedelta
         
+        now = datetime.utcnow()
         mock_posts = [
             {
                 "platform": "reddit",
                 "content": "Large demonstration reported in city center. Multiple sources confirming.",
                 "author": "reddit_user",
-                "timestamp": (datetime.utcnow() - timedelta(hours=2)).isoformat(),
+                "timestamp": (now - timedelta(hours=2)).isoformat(),
                 "location_raw": "City Center",
                 "link": "https://reddit.com/r/news/comments/123456",
                 "extra": {"subreddit": "news", "score": 150, "num_comments": 25}
@@ -163,12 +155,12 @@ class RedditCollector:
                 "platform": "reddit",
                 "content": "Protest organizers announce new rally location. Police monitoring situation.",
                 "author": "activist_user",
-                "timestamp": (datetime.utcnow() - timedelta(hours=3)).isoformat(),
+                "timestamp": (now - timedelta(hours=3)).isoformat(),
                 "location_raw": "Downtown",
                 "link": "https://reddit.com/r/politics/comments/123457",
                 "extra": {"subreddit": "politics", "score": 89, "num_comments": 12}
             }
         ]
         
-        print("Using mock Reddit data")
+        logger.info("Using mock Reddit data")
         return mock_posts 
\ No newline at end of file
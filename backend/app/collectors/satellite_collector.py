@@ -1,13 +1,22 @@
 import requests
-from typing import List, Dict
+from typing import List, Dict, Optional
 import os
 from datetime import datetime, timedelta
 import json
-import random
+import numpy as np
+from app.collectors._mock import mock_rng
+
+LOCATIONS = [
+    "Downtown Area", "City Center", "Government District",
+    "University Campus", "Shopping District", "Transport Hub"
+]
+INFRASTRUCTURE_STATUSES = ["normal", "damaged", "congested"]
 
 class SatelliteCollector:
-    def __init__(self, api_key: str = ""):  # Default to empty string
+    def __init__(self, api_key: str = "", seed: Optional[int] = None):  # Default to empty string
         self.api_key = api_key or os.getenv("SATELLITE_API_KEY") or ""
+        # A fixed seed (argument or NOESIS_MOCK_SEED) makes the mock data reproducible
+        self._rng = mock_rng(seed)
         self.base_url = "https://api.satellite-imagery.com/v1"  # Placeholder
         
     def collect(self) -> List[Dict]:
@@ -35,40 +44,48 @@ class SatelliteCollector:
             posts.append(post)
             
         return posts
+
+    async def collect_async(self) -> List[Dict]:
+        """Collect satellite data; the mock is generated in-process, so there is nothing to await"""
+        return self.collect()
     
-    def _get_mock_satellite_data(self) -> List[Dict]:
+    def _get_mock_satellite_data(self, count: int = 5) -> List[Dict]:
         """Generate mock satellite data for demonstration"""
-        locations = [
-            "Downtown Area", "City Center", "Government District", 
-            "University Campus", "Shopping District", "Transport Hub"
-        ]
+        rng = self._rng
         
-        mock_data = []
-        for i in range(5):
-            location = random.choice(locations)
-            crowd_density = random.uniform(0.1, 0.9)
-            infrastructure_status = random.choice(["normal", "damaged", "congested"])
-            
-            # Determine if this indicates potential unrest
-            if crowd_density > 0.7 and infrastructure_status in ["congested", "damaged"]:
-                description = f"High crowd density detected in {location}. Infrastructure showing signs of stress."
-                confidence = random.uniform(0.7, 0.95)
-            else:
-                description = f"Normal activity levels in {location}. Infrastructure status: {infrastructure_status}."
-                confidence = random.uniform(0.5, 0.8)
-            
-            mock_data.append({
+        # Draw every observation for all images at once
+        locations = rng.choice(LOCATIONS, count).tolist()
+        crowd_density = rng.uniform(0.1, 0.9, count)
+        infrastructure_status = rng.choice(INFRASTRUCTURE_STATUSES, count)
+        lat = rng.uniform(28.0, 29.0, count).tolist()
+        lng = rng.uniform(76.0, 77.0, count).tolist()
+        hours_ago = rng.integers(1, 7, count).tolist()
+        
+        # Determine which observations indicate potential unrest
+        stressed = (crowd_density > 0.7) & (infrastructure_status != "normal")
+        confidence = np.where(stressed, rng.uniform(0.7, 0.95, count), rng.uniform(0.5, 0.8, count))
+        
+        now = datetime.utcnow()
+        return [
+            {
                 "id": f"sat_{i+1}",
-                "description": description,
+                "description": (
+                    f"High crowd density detected in {location}. Infrastructure showing signs of stress."
+                    if is_stressed else
+                    f"Normal activity levels in {location}. Infrastructure status: {status}."
+                ),
                 "location": location,
-                "timestamp": (datetime.utcnow() - timedelta(hours=random.randint(1, 6))).isoformat(),
-                "crowd_density": crowd_density,
-                "infrastructure_status": infrastructure_status,
+                "timestamp": (now - timedelta(hours=hours)).isoformat(),
+                "crowd_density": crowd,
+                "infrastructure_status": status,
                 "coordinates": {
-                    "lat": random.uniform(28.0, 29.0),
-                    "lng": random.uniform(76.0, 77.0)
+                    "lat": la,
+                    "lng": ln
                 },
-                "confidence": confidence
-            })
-        
-        return mock_data 
\ No newline at end of file
+                "confidence": conf
+            }
+            for i, (location, crowd, status, la, ln, hours, is_stressed, conf) in enumerate(zip(
+                locations, crowd_density.tolist(), infrastructure_status.tolist(), lat, lng,
+                hours_ago, stressed.tolist(), confidence.tolist()
+            ))
+        ]
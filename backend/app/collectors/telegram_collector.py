@@ -1,8 +1,9 @@
-from telethon import TelegramClient
 from typing import List, Dict
 
 class TelegramCollector:
     def __init__(self, api_id: int, api_hash: str, session_name: str = 'noesis'):
+        # Deferred so importing this module doesn't load telethon and its crypto dependencies
+        from telethon import TelegramClient
         self.client = TelegramClient(session_name, api_id, api_hash)
 
     async def collect(self, channels: List[str], limit: int = 100) -> List[Dict]:
@@ -1,41 +1,54 @@
-import tweepy
-from typing import List, Dict
+import logging
+import asyncio
+import operator
+import threading
+from typing import List, Dict, Tuple
+from app.collectors._textutil import sanitize_text
+from app.collectors._keywords import load_keywords, scan_keywords
 import os
 from datetime import datetime, timedelta
-import json
+
+logger = logging.getLogger(__name__)
+
+# Tweet attributes read per result, fetched in one call
+_tweet_fields = operator.attrgetter("text", "author_id", "created_at", "lang", "id")
+
+# tweepy clients by bearer token, reused so their HTTP connections stay open across collectors
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_client(bearer_token: str):
+    """Shared tweepy.Client for a bearer token, created on first use"""
+    with _clients_lock:
+        client = _clients.get(bearer_token)
+        if client is None:
+            # Only pulled in when credentials are configured
+            import tweepy
+            client = _clients[bearer_token] = tweepy.Client(bearer_token=bearer_token, wait_on_rate_limit=True)
+        return client
 
 class TwitterCollector:
     def __init__(self, bearer_token: str = None):
         self.bearer_token = bearer_token or os.getenv("TWITTER_BEARER_TOKEN")
         if not self.bearer_token:
-            print("Twitter API Bearer Token not configured. Real data will not be fetched.")
+            logger.info("Twitter API Bearer Token not configured. Real data will not be fetched.")
             self.client = None
         else:
-            self.client = tweepy.Client(bearer_token=self.bearer_token, wait_on_rate_limit=True)
+            self.client = get_client(self.bearer_token)
 
         # Load unrest keywords
-        self.keywords = self._load_keywords()
+        self.keywords = load_keywords()
 
-    def _load_keywords(self):
-        try:
-            with open(os.path.join(os.path.dirname(__file__), '../../data/unrest_keywords.json'), 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading unrest_keywords.json: {e}")
-            # Fallback to a basic set
-            return {
-                "protest_unrest": ["protest", "riot", "demonstration"],
-                "escalation_violence": ["violence", "clash", "police"],
-                "early_warning": ["gathering", "tension", "planned"],
-                "triggers": ["election", "verdict", "policy"]
-            }
+    def scan(self, text: str) -> List[Tuple[str, str]]:
+        """Unrest keywords found in text, as (category, keyword) pairs"""
+        return scan_keywords(text)
 
     def collect(self) -> List[Dict]:
         """Collect recent tweets about protests and civil unrest"""
         posts = []
         
         if not self.client:
-            print("Twitter API client not available, using mock data")
+            logger.info("Twitter API client not available, using mock data")
             return self._get_mock_data()
         
         try:
@@ -46,6 +59,9 @@ class TwitterCollector:
             # Limit to avoid API abuse
             queries = [SEARCH_RULE]
 
+            # Fallback timestamp for tweets without created_at
+            now_iso = datetime.utcnow().isoformat()
+            append = posts.append
             for query in queries:
                 response = self.client.search_recent_tweets(
                     query=query,
@@ -58,69 +74,44 @@ class TwitterCollector:
                 users = {u.id: u for u in response.includes["users"]} if response.includes and "users" in response.includes else {}
                 if not tweets:
                     continue
-                for tweet in tweets:
-                    user = users.get(tweet.author_id, None)
-                    content = self._sanitize_text(tweet.text)
+                for text, author_id, created_at, lang, tweet_id in map(_tweet_fields, tweets):
+                    content = sanitize_text(text)
                     if not content:
                         continue
-                    post = {
+                    user = users.get(author_id)
+                    append({
                         "platform": "twitter",
                         "content": content,
+                        "_sanitized": True,  # content already passed through sanitize_text
                         "author": user.username if user else "unknown",
-                        "timestamp": tweet.created_at.isoformat() if tweet.created_at else datetime.utcnow().isoformat(),
-                        "location_raw": user.location if user and hasattr(user, 'location') and user.location else "",
-                        "link": f"https://twitter.com/i/web/status/{tweet.id}",
+                        "timestamp": created_at.isoformat() if created_at else now_iso,
+                        "location_raw": getattr(user, "location", None) or "",
+                        "link": f"https://twitter.com/i/web/status/{tweet_id}",
                         "extra": {
-                            "tweet_id": str(tweet.id),
-                            "lang": tweet.lang or "en"
+                            "tweet_id": str(tweet_id),
+                            "lang": lang or "en",
+                            "keyword_categories": sorted({category for category, _ in self.scan(content)})
                         }
-                    }
-                    posts.append(post)
-            print(f"Successfully collected {len(posts)} tweets")
+                    })
+            logger.info("Successfully collected %d tweets", len(posts))
         except Exception as e:
-            print(f"Error collecting Twitter data: {e}")
-            print("Using mock data instead")
+            logger.error("Error collecting Twitter data: %s. Using mock data instead", e)
             posts = self._get_mock_data()
         return posts
 
-    def _sanitize_text(self, text: str) -> str:
-        """Sanitize text to prevent encoding issues"""
-        if not text:
-            return ""
-        
-        try:
-            # Handle bytes
-            if isinstance(text, bytes):
-                text = text.decode('utf-8', errors='ignore')
-            
-            # Handle None or non-string types
-            if not isinstance(text, str):
-                text = str(text)
-            
-            # Remove problematic characters
-            import re
-            # Remove control characters and non-printable characters
-            text = re.sub(r'[\x00-\x1F\x7F-\x9F]', '', text)
-            # Remove characters that can't be encoded properly
-            text = re.sub(r'[^\x20-\x7E\u00A0-\uFFFF]', ' ', text)
-            # Replace multiple spaces and newlines
-            text = re.sub(r'\s+', ' ', text)
-            # Remove any remaining problematic characters
-            text = ''.join(char for char in text if ord(char) < 65536)
-            
-            return text.strip()
-        except Exception as e:
-            print(f"Text sanitization error: {e}")
-            return ""
+    async def collect_async(self) -> List[Dict]:
+        """Collect recent tweets without blocking the event loop (tweepy's client is synchronous)"""
+        return await asyncio.to_thread(self.collect)
 
     def _get_mock_data(self) -> List[Dict]:
         """Generate mock Twitter data for testing"""
+        now = datetime.utcnow()
         mock_posts = [
             {
                 "platform": "twitter",
                 "content": "Protest happening in downtown area. Police presence increased.",
                 "author": "user123",
-                "timestamp": (datetime.utcnow() - timedelta(hours=1)).isoformat(),
+                "timestamp": (now - timedelta(hours=1)).isoformat(),
                 "location_raw": "Downtown",
                 "link": "https://twitter.com/user123/status/123456",
                 "extra": {"tweet_id": "123456", "lang": "en"}
@@ -129,12 +120,12 @@ class TwitterCollector:
                 "platform": "twitter",
                 "content": "Large demonstration reported in city center. Multiple sources confirming.",
                 "author": "news_reporter",
-                "timestamp": (datetime.utcnow() - timedelta(hours=2)).isoformat(),
+                "timestamp": (now - timedelta(hours=2)).isoformat(),
                 "location_raw": "City Center",
                 "link": "https://twitter.com/news_reporter/status/123457",
                 "extra": {"tweet_id": "123457", "lang": "en"}
             }
         ]
         
-        print("Using mock Twitter data")
+        logger.info("Using mock Twitter data")
         return mock_posts 
\ No newline at end of file
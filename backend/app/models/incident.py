@@ -1,6 +1,18 @@
-from sqlalchemy import Column, Integer, String, Text, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float
 from sqlalchemy import JSON
+from sqlalchemy.orm import validates
 from .base import Base
+import datetime
+
+# Severity levels in increasing order, so they compare as integers
+SEVERITY_RANK = {"low": 0, "medium": 1, "high": 2}
+# Incidents alert subscribers from this severity up, and only in these statuses
+ALERT_MIN_SEVERITY = SEVERITY_RANK["medium"]
+ALERT_STATUSES = frozenset({"verified", "medium"})
+
+def is_alertable(severity: str, status: str) -> bool:
+    """Whether an incident with this severity and status should be broadcast"""
+    return SEVERITY_RANK.get(severity, -1) >= ALERT_MIN_SEVERITY and status in ALERT_STATUSES
 
 class Incident(Base):
     __tablename__ = 'incidents'
@@ -8,8 +20,15 @@ class Incident(Base):
     title = Column(String)
     description = Column(Text)
     sources = Column(JSON)  # List of source post IDs/links
-    location = Column(String)
+    source_count = Column(Integer, nullable=False, default=0)  # len(sources), kept in sync on write
+    location = Column(String, index=True)
     location_lat = Column(Float)
     location_lng = Column(Float)
     severity = Column(String)
-    status = Column(String) 
\ No newline at end of file
+    status = Column(String)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, index=True)
+
+    @validates("sources")
+    def _sync_source_count(self, key, sources):
+        self.source_count = len(sources) if sources else 0
+        return sources
@@ -11,5 +11,5 @@ class RawPost(Base):
     author = Column(String)
     timestamp = Column(DateTime, default=datetime.datetime.utcnow)
     location_raw = Column(String)
-    link = Column(String)
+    link = Column(String, unique=True, index=True)  # NULL when the source has no link
     extra = Column(JSON)  # For any additional metadata 
\ No newline at end of file
@@ -0,0 +1,6 @@
+from sqlalchemy import Column, BigInteger
+from .base import Base
+
+class TelegramSubscriber(Base):
+    __tablename__ = 'telegram_subscribers'
+    chat_id = Column(BigInteger, primary_key=True, autoincrement=False)
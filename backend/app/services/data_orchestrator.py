@@ -1,4 +1,7 @@
-from typing import List, Dict
+import asyncio
+from functools import cached_property, lru_cache
+from typing import List, Dict, Tuple
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 from app.collectors.twitter_collector import TwitterCollector
 from app.collectors.reddit_collector import RedditCollector
@@ -6,63 +9,116 @@ from app.collectors.news_collector import NewsCollector
 from app.collectors.satellite_collector import SatelliteCollector
 from app.collectors.financial_collector import FinancialCollector
 from app.collectors.iot_collector import IoTCollector
+from app.collectors._textutil import sanitize_text
+from app.utils.database import dialect_insert, has_unique_index
 from app.services.nlp_pipeline import NLPPipeline
 from app.services.verification import VerificationService
 from app.models.raw_post import RawPost
 from app.models.processed_post import ProcessedPost
-from app.models.incident import Incident
-from app.alerts.telegram_bot import TelegramAlertBot
-from app.alerts.email_alert import EmailAlert
+from app.models.incident import Incident, SEVERITY_RANK, is_alertable
+from app.models.alert_subscriber import AlertSubscriber
+from app.alerts.telegram_bot import telegram_bot
+from app.alerts.email_alert import email_alert
+from app.alerts.email_pool import email_pool, EmailJob, EMAIL_ALERTS_ENABLED
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Optional C parser for ISO 8601 timestamps
+try:
+    import ciso8601
+    HAS_CISO8601 = True
+except ImportError:
+    HAS_CISO8601 = False
+
+# Fallback posts for runs without API keys, as (hours ago, post without timestamp)
+MOCK_POSTS = (
+    (1, {
+        "platform": "twitter",
+        "content": "Protest happening in downtown area. Police presence increased.",
+        "author": "user123",
+        "location_raw": "Downtown",
+        "link": "https://twitter.com/user123/status/123456",
+        "extra": {"tweet_id": "123456", "lang": "en"}
+    }),
+    (2, {
+        "platform": "reddit",
+        "content": "Large demonstration reported in city center. Multiple sources confirming.",
+        "author": "reddit_user",
+        "location_raw": "City Center",
+        "link": "https://reddit.com/r/news/comments/123456",
+        "extra": {"subreddit": "news", "score": 150}
+    }),
+    (3, {
+        "platform": "gnews",
+        "content": "Breaking: Civil unrest reported in multiple cities. Authorities monitoring situation.",
+        "author": "News Agency",
+        "location_raw": "Multiple Cities",
+        "link": "https://news.example.com/article/123",
+        "extra": {"title": "Civil Unrest Report", "source": "News Agency"}
+    }),
+)
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse a collector's ISO 8601 timestamp; empty or malformed values fall back to now"""
+    if not value:
+        return datetime.utcnow()
+    try:
+        if HAS_CISO8601:
+            return ciso8601.parse_datetime(value)
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, TypeError, AttributeError):
+        return datetime.utcnow()
+
+@lru_cache(maxsize=None)
+def _shared(factory):
+    """One instance of a collector or service per process, built on first use"""
+    return factory()
 
 class DataOrchestrator:
     def __init__(self, db: Session):
         self.db = db
-        self.twitter_collector = TwitterCollector()
-        self.reddit_collector = RedditCollector()
-        self.news_collector = NewsCollector()
-        self.satellite_collector = SatelliteCollector()
-        self.financial_collector = FinancialCollector()
-        self.iot_collector = IoTCollector()
-        self.nlp_pipeline = NLPPipeline()
-        self.verification_service = VerificationService()
-        self.telegram_bot = TelegramAlertBot()
-        self.email_alert = EmailAlert()
+        self.telegram_bot = telegram_bot
+        self.email_alert = email_alert
+        self._has_keys = any(os.getenv(name) for name in ("TWITTER_BEARER_TOKEN", "REDDIT_CLIENT_ID", "GNEWS_API_KEY"))
+
+    # Collectors and the NLP models are shared across orchestrators (one is created per API request)
+    @cached_property
+    def twitter_collector(self) -> TwitterCollector:
+        return _shared(TwitterCollector)
+
+    @cached_property
+    def reddit_collector(self) -> RedditCollector:
+        return _shared(RedditCollector)
+
+    @cached_property
+    def news_collector(self) -> NewsCollector:
+        return _shared(NewsCollector)
+
+    @cached_property
+    def satellite_collector(self) -> SatelliteCollector:
+        return _shared(SatelliteCollector)
+
+    @cached_property
+    def financial_collector(self) -> FinancialCollector:
+        return _shared(FinancialCollector)
+
+    @cached_property
+    def iot_collector(self) -> IoTCollector:
+        return _shared(IoTCollector)
+
+    @cached_property
+    def nlp_pipeline(self) -> NLPPipeline:
+        return _shared(NLPPipeline)
+
+    @cached_property
+    def verification_service(self) -> VerificationService:
+        return _shared(VerificationService)
 
     def run_collection_cycle(self):
         """Run a complete data collection and processing cycle in parallel for all collectors"""
         print("Starting data collection cycle (parallel)...")
-        raw_posts = []
-        errors = []
-        collectors = [
-            ("twitter", self.twitter_collector.collect),
-            ("reddit", self.reddit_collector.collect),
-            ("news", self.news_collector.collect),
-            ("satellite", self.satellite_collector.collect),
-            ("financial", self.financial_collector.collect),
-            ("iot", self.iot_collector.collect)
-        ]
-        
-        def run_collector(name, func):
-            try:
-                print(f"Running {name} collector...")
-                posts = func()
-                print(f"{name.title()} collector returned {len(posts)} posts.")
-                return posts
-            except Exception as e:
-                print(f"Error in {name} collector: {e}")
-                errors.append((name, str(e)))
-                return []
-        
-        with ThreadPoolExecutor(max_workers=6) as executor:
-            future_to_name = {executor.submit(run_collector, name, func): name for name, func in collectors}
-            for future in as_completed(future_to_name):
-                posts = future.result()
-                if posts:
-                    raw_posts.extend(posts)
+        raw_posts, errors = asyncio.run(self.collect_raw_async())
         
         print(f"Collected {len(raw_posts)} raw posts from all collectors.")
         if errors:
@@ -70,23 +126,30 @@ class DataOrchestrator:
             for name, err in errors:
                 print(f"  - {name}: {err}")
         
-        # Store raw posts in database
-        stored_posts = self.store_raw_posts(raw_posts)
-        print(f"Stored {len(stored_posts)} raw posts")
-        if stored_posts:
-            print("Sample stored post:", stored_posts[0].__dict__)
-        
-        # Process posts through NLP pipeline
-        processed_posts = self.process_posts(stored_posts)
-        print(f"Processed {len(processed_posts)} posts")
-        if processed_posts:
-            print("Sample processed post:", processed_posts[0].__dict__)
-        
-        # Verify and create incidents
-        incidents = self.create_incidents(processed_posts)
-        print(f"Created {len(incidents)} incidents")
-        if incidents:
-            print("Sample incident:", incidents[0].__dict__)
+        # All three phases share one transaction, so the cycle costs a single commit (one fsync on SQLite)
+        try:
+            # Store raw posts in database
+            stored_posts = self.store_raw_posts(raw_posts)
+            print(f"Stored {len(stored_posts)} raw posts")
+            if stored_posts:
+                print("Sample stored post:", stored_posts[0].__dict__)
+            
+            # Process posts through NLP pipeline
+            processed_posts = self.process_posts(stored_posts)
+            print(f"Processed {len(processed_posts)} posts")
+            if processed_posts:
+                print("Sample processed post:", processed_posts[0].__dict__)
+            
+            # Verify and create incidents
+            incidents = self.create_incidents(processed_posts)
+            print(f"Created {len(incidents)} incidents")
+            if incidents:
+                print("Sample incident:", incidents[0].__dict__)
+            
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
         
         # Send alerts for new incidents
         self.send_alerts(incidents)
@@ -99,15 +162,37 @@ class DataOrchestrator:
             "errors": errors
         }
 
+    async def collect_raw_async(self) -> Tuple[List[Dict], List[Tuple[str, str]]]:
+        """Run all collectors concurrently; returns the combined posts and (name, error) pairs"""
+        collectors = [
+            ("twitter", self.twitter_collector),
+            ("reddit", self.reddit_collector),
+            ("news", self.news_collector),
+            ("satellite", self.satellite_collector),
+            ("financial", self.financial_collector),
+            ("iot", self.iot_collector)
+        ]
+        results = await asyncio.gather(*[collector.collect_async() for _, collector in collectors], return_exceptions=True)
+        
+        raw_posts = []
+        errors = []
+        for (name, _), posts in zip(collectors, results):
+            if isinstance(posts, Exception):
+                print(f"Error in {name} collector: {posts}")
+                errors.append((name, str(posts)))
+                continue
+            print(f"{name.title()} collector returned {len(posts)} posts.")
+            raw_posts.extend(posts)
+        return raw_posts, errors
+
     def collect_all_data(self) -> List[Dict]:
         """Collect data from all sources"""
-        all_posts = []
-        
         # For testing purposes, add some mock data if no API keys are configured
         if not self._has_api_keys():
             print("No API keys configured, using mock data for testing")
-            all_posts = self._get_mock_data()
-            return all_posts
+            return self._get_mock_data()
+        
+        all_posts = []
         
         # Collect from Twitter
         try:
@@ -127,79 +212,50 @@ class DataOrchestrator:
         
         # Collect from News
         try:
-            gnews_posts = self.news_collector.collect_gnews()
-            all_posts.extend(gnews_posts)
-            print(f"Collected {len(gnews_posts)} GNews articles")
-            
-            rss_posts = self.news_collector.collect_rss()
-            all_posts.extend(rss_posts)
-            print(f"Collected {len(rss_posts)} RSS articles")
+            # GNews and RSS share one HTTP connection pool
+            news_posts = self.news_collector.collect()
+            all_posts.extend(news_posts)
+            print(f"Collected {sum(1 for p in news_posts if p['platform'] == 'gnews')} GNews articles")
+            print(f"Collected {sum(1 for p in news_posts if p['platform'] == 'rss')} RSS articles")
         except Exception as e:
             print(f"Error collecting news data: {e}")
         
         return all_posts
 
     def _has_api_keys(self) -> bool:
-        """Check if any API keys are configured"""
-        import os
-        return any([
-            os.getenv("TWITTER_BEARER_TOKEN"),
-            os.getenv("REDDIT_CLIENT_ID"),
-            os.getenv("GNEWS_API_KEY")
-        ])
+        """Check if any API keys are configured (read once, when the orchestrator is built)"""
+        return self._has_keys
 
     def _get_mock_data(self) -> List[Dict]:
         """Generate mock data for testing"""
-        from datetime import datetime, timedelta
-        
-        mock_posts = [
-            {
-                "platform": "twitter",
-                "content": "Protest happening in downtown area. Police presence increased.",
-                "author": "user123",
-                "timestamp": (datetime.utcnow() - timedelta(hours=1)).isoformat(),
-                "location_raw": "Downtown",
-                "link": "https://twitter.com/user123/status/123456",
-                "extra": {"tweet_id": "123456", "lang": "en"}
-            },
-            {
-                "platform": "reddit",
-                "content": "Large demonstration reported in city center. Multiple sources confirming.",
-                "author": "reddit_user",
-                "timestamp": (datetime.utcnow() - timedelta(hours=2)).isoformat(),
-                "location_raw": "City Center",
-                "link": "https://reddit.com/r/news/comments/123456",
-                "extra": {"subreddit": "news", "score": 150}
-            },
-            {
-                "platform": "gnews",
-                "content": "Breaking: Civil unrest reported in multiple cities. Authorities monitoring situation.",
-                "author": "News Agency",
-                "timestamp": (datetime.utcnow() - timedelta(hours=3)).isoformat(),
-                "location_raw": "Multiple Cities",
-                "link": "https://news.example.com/article/123",
-                "extra": {"title": "Civil Unrest Report", "source": "News Agency"}
-            }
+        now = datetime.utcnow()
+        return [
+            {**post, "timestamp": (now - timedelta(hours=hours_ago)).isoformat(), "extra": dict(post["extra"])}
+            for hours_ago, post in MOCK_POSTS
         ]
-        
-        return mock_posts
 
     def store_raw_posts(self, raw_posts: List[Dict]) -> List[RawPost]:
-        """Store raw posts in database"""
-        stored_posts = []
+        """Store raw posts in the current transaction; run_collection_cycle commits"""
+        rows = []
+        # Look up which of this batch's links are already stored in one query
+        links = {post_data.get("link") for post_data in raw_posts if post_data.get("link")}
+        seen_links = set(self.db.scalars(select(RawPost.link).where(RawPost.link.in_(links)))) if links else set()
         
         for post_data in raw_posts:
             try:
-                # Check if post already exists (by link)
+                # Skip posts already stored, or already seen earlier in this batch (by link)
                 link = post_data.get("link", "")
                 if link:
-                    existing = self.db.query(RawPost).filter(RawPost.link == link).first()
-                    if existing:
+                    if link in seen_links:
                         continue
+                    seen_links.add(link)
                 
                 # Clean and sanitize data with better error handling
                 try:
-                    content = self.sanitize_text(post_data.get("content", ""))
+                    content = post_data.get("content", "")
+                    # Collectors flag content they have already sanitized
+                    if not post_data.get("_sanitized"):
+                        content = self.sanitize_text(content)
                 except Exception as e:
                     print(f"Error sanitizing content: {e}")
                     content = "content"
@@ -217,14 +273,7 @@ class DataOrchestrator:
                     location_raw = ""
                 
                 # Handle timestamp safely
-                timestamp_str = post_data.get("timestamp", "")
-                try:
-                    if timestamp_str:
-                        timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-                    else:
-                        timestamp = datetime.utcnow()
-                except:
-                    timestamp = datetime.utcnow()
+                timestamp = parse_timestamp(post_data.get("timestamp", ""))
                 
                 # Sanitize extra data
                 extra_data = post_data.get("extra", {})
@@ -244,18 +293,15 @@ class DataOrchestrator:
                     print(f"Error sanitizing extra data: {e}")
                     extra_data = {"error": "data_sanitization_failed"}
                 
-                raw_post = RawPost(
-                    platform=post_data.get("platform", "unknown"),
-                    content=content,
-                    author=author,
-                    timestamp=timestamp,
-                    location_raw=location_raw,
-                    link=link,
-                    extra=extra_data
-                )
-                
-                self.db.add(raw_post)
-                stored_posts.append(raw_post)
+                rows.append({
+                    "platform": post_data.get("platform", "unknown"),
+                    "content": content,
+                    "author": author,
+                    "timestamp": timestamp,
+                    "location_raw": location_raw,
+                    "link": link or None,
+                    "extra": extra_data
+                })
                 
             except Exception as e:
                 print(f"Error storing raw post: {e}")
@@ -263,70 +309,62 @@ class DataOrchestrator:
                 print(traceback.format_exc())
                 continue
         
+        if not rows:
+            return []
         try:
-            self.db.commit()
+            # One batched INSERT ... RETURNING instead of a unit-of-work flush per object;
+            # a link stored concurrently by another cycle is skipped by the unique index.
+            # Databases still holding duplicate links have no such index (see migrate_db.py --dedupe-links),
+            # so they rely on the link prefetch above alone
+            if has_unique_index(self.db.get_bind(), RawPost.__tablename__, "link"):
+                stmt = dialect_insert(self.db)(RawPost).on_conflict_do_nothing(index_elements=["link"]).returning(RawPost)
+            else:
+                stmt = insert(RawPost).returning(RawPost)
+            stored_posts = list(self.db.scalars(stmt, rows))
         except Exception as e:
-            print(f"Error committing raw posts: {e}")
-            self.db.rollback()
+            # Re-raise: a rollback here would also discard the cycle's earlier phases
+            print(f"Error storing raw posts: {e}")
+            raise
             
         return stored_posts
 
     def sanitize_text(self, text: str) -> str:
-        """Sanitize text to handle encoding issues"""
-        if not text:
-            return ""
+        """Sanitize text to handle encoding issues (same rules as the collectors)"""
+        return sanitize_text(text)
+
+    def process_posts(self, raw_posts: List[RawPost]) -> List[ProcessedPost]:
+        """Process raw posts through NLP pipeline, in the current transaction"""
+        rows = []
         
+        # Convert to dicts for NLP processing with safe data handling
+        # (string fields were sanitized when the raw posts were stored)
+        post_dicts = [
+            {
+                "id": raw_post.id,
+                "content": raw_post.content or "",
+                "platform": raw_post.platform or "",
+                "link": raw_post.link or "",
+                "location_raw": raw_post.location_raw or "",
+                "timestamp": raw_post.timestamp.isoformat() if raw_post.timestamp is not None else "",
+                "title": (raw_post.extra.get("title") if raw_post.extra else None),
+                "headline": (raw_post.extra.get("headline") if raw_post.extra else None)
+            }
+            for raw_post in raw_posts
+        ]
+        
+        # One batched pass through the NLP models; posts are retried one by one if it fails
         try:
-            # Handle bytes
-            if isinstance(text, bytes):
-                text = text.decode('utf-8', errors='ignore')
-            
-            # Handle None or non-string types
-            if not isinstance(text, str):
-                text = str(text)
-            
-            # Remove problematic characters more aggressively
-            import re
-            # Remove non-printable characters and control characters
-            text = re.sub(r'[\x00-\x1F\x7F-\x9F]', '', text)
-            # Remove characters that can't be encoded in SQLite
-            text = re.sub(r'[^\x20-\x7E\u00A0-\uFFFF]', ' ', text)
-            # Replace multiple spaces and newlines
-            text = re.sub(r'\s+', ' ', text)
-            # Remove any remaining problematic characters
-            text = ''.join(char for char in text if ord(char) < 65536)
-            
-            return text.strip()
+            batch_results = self.nlp_pipeline.process_batch(post_dicts)
         except Exception as e:
-            print(f"Text sanitization error: {e}")
-            return "text"
-
-    def process_posts(self, raw_posts: List[RawPost]) -> List[ProcessedPost]:
-        """Process raw posts through NLP pipeline"""
-        processed_posts = []
+            print(f"Error in batched NLP pipeline, processing posts individually: {e}")
+            batch_results = [None] * len(post_dicts)
         
-        for raw_post in raw_posts:
+        for raw_post, post_dict, processed_data in zip(raw_posts, post_dicts, batch_results):
             try:
-                # Convert to dict for NLP processing with safe data handling
-                post_dict = {
-                    "id": raw_post.id,
-                    "content": raw_post.content or "",
-                    "platform": raw_post.platform or "",
-                    "link": raw_post.link or "",
-                    "location_raw": raw_post.location_raw or "",
-                    "timestamp": raw_post.timestamp.isoformat() if raw_post.timestamp is not None else "",
-                    "title": (raw_post.extra.get("title") if raw_post.extra else None),
-                    "headline": (raw_post.extra.get("headline") if raw_post.extra else None)
-                }
-                
-                # Ensure all string fields are properly sanitized
-                for key, value in post_dict.items():
-                    if isinstance(value, str):
-                        post_dict[key] = self.sanitize_text(value)
-                
                 # Process through NLP pipeline with error handling
                 try:
-                    processed_data = self.nlp_pipeline.process(post_dict)
+                    if processed_data is None:
+                        processed_data = self.nlp_pipeline.process(post_dict)
                 except Exception as e:
                     print(f"Error in NLP pipeline for post {raw_post.id}: {e}")
                     # Create fallback processed data
@@ -344,150 +382,165 @@ class DataOrchestrator:
                 
                 # Store processed post with safe data handling
                 try:
-                    processed_post = ProcessedPost(
-                        raw_post_id=raw_post.id,
-                        protest_score=float(processed_data.get("protest_score", 0.0)),
-                        sentiment_score=float(processed_data.get("sentiment_score", 0.0)),
-                        location_lat=processed_data.get("location_lat"),
-                        location_lng=processed_data.get("location_lng"),
-                        language=str(processed_data.get("language", "en")),
-                        platform=str(processed_data.get("platform", "unknown")),
-                        link=str(processed_data.get("link", "")),
-                        entities=processed_data.get("entities", {}),
-                        status=str(processed_data.get("status", "unverified"))
-                    )
-                    
-                    self.db.add(processed_post)
-                    processed_posts.append(processed_post)
+                    rows.append({
+                        "raw_post_id": raw_post.id,
+                        "protest_score": float(processed_data.get("protest_score", 0.0)),
+                        "sentiment_score": float(processed_data.get("sentiment_score", 0.0)),
+                        "location_lat": processed_data.get("location_lat"),
+                        "location_lng": processed_data.get("location_lng"),
+                        "language": str(processed_data.get("language", "en")),
+                        "platform": str(processed_data.get("platform", "unknown")),
+                        "link": str(processed_data.get("link", "")),
+                        "entities": processed_data.get("entities", {}),
+                        "status": str(processed_data.get("status", "unverified"))
+                    })
                     
                 except Exception as e:
                     print(f"Error creating processed post for {raw_post.id}: {e}")
                     # Create a minimal processed post with default values
-                    try:
-                        processed_post = ProcessedPost(
-                            raw_post_id=raw_post.id,
-                            protest_score=0.0,
-                            sentiment_score=0.0,
-                            location_lat=None,
-                            location_lng=None,
-                            language="en",
-                            platform="unknown",
-                            link="",
-                            entities={},
-                            status="unverified"
-                        )
-                        self.db.add(processed_post)
-                        processed_posts.append(processed_post)
-                    except Exception as e2:
-                        print(f"Error creating fallback processed post: {e2}")
+                    rows.append(self._fallback_processed_row(raw_post.id))
                 
             except Exception as e:
                 print(f"Error processing post {raw_post.id}: {e}")
                 import traceback
                 print(traceback.format_exc())
                 # Create a minimal processed post with default values
-                try:
-                    processed_post = ProcessedPost(
-                        raw_post_id=raw_post.id,
-                        protest_score=0.0,
-                        sentiment_score=0.0,
-                        location_lat=None,
-                        location_lng=None,
-                        language="en",
-                        platform="unknown",
-                        link="",
-                        entities={},
-                        status="unverified"
-                    )
-                    self.db.add(processed_post)
-                    processed_posts.append(processed_post)
-                except Exception as e2:
-                    print(f"Error creating fallback processed post: {e2}")
+                rows.append(self._fallback_processed_row(raw_post.id))
         
+        if not rows:
+            return []
         try:
-            self.db.commit()
+            processed_posts = list(self.db.scalars(insert(ProcessedPost).returning(ProcessedPost), rows))
         except Exception as e:
-            print(f"Error committing processed posts: {e}")
-            self.db.rollback()
+            # Re-raise: a rollback here would also discard the cycle's earlier phases
+            print(f"Error storing processed posts: {e}")
+            raise
             
         return processed_posts
 
+    @staticmethod
+    def _fallback_processed_row(raw_post_id: int) -> Dict:
+        """Default processed_posts row for a post the NLP pipeline could not handle"""
+        return {
+            "raw_post_id": raw_post_id,
+            "protest_score": 0.0,
+            "sentiment_score": 0.0,
+            "location_lat": None,
+            "location_lng": None,
+            "language": "en",
+            "platform": "unknown",
+            "link": "",
+            "entities": {},
+            "status": "unverified"
+        }
+
     def create_incidents(self, processed_posts: List[ProcessedPost]) -> List[Incident]:
-        """Create incidents from processed posts"""
-        # Build a mapping from raw_post_id to RawPost
-        raw_post_map = {raw_post.id: raw_post for raw_post in self.db.query(RawPost).all()}
+        """Create incidents from processed posts, in the current transaction"""
+        # Build a mapping from raw_post_id to RawPost, for this batch's raw posts only
+        raw_post_ids = {post.raw_post_id for post in processed_posts}
+        raw_post_map = {
+            raw_post.id: raw_post
+            for raw_post in self.db.query(RawPost).filter(RawPost.id.in_(raw_post_ids))
+        } if raw_post_ids else {}
         
-        # Convert to dict for verification service
-        posts_dict = []
-        for post in processed_posts:
-            raw_post = raw_post_map.get(post.raw_post_id)
-            if raw_post:
-                title = raw_post.extra.get("title") if raw_post.extra else None
-                headline = raw_post.extra.get("headline") if raw_post.extra else None
-                content = raw_post.content
-            else:
-                title = None
-                headline = None
-                content = None
-            posts_dict.append({
-                "id": post.id,
-                "protest_score": post.protest_score,
-                "sentiment_score": post.sentiment_score,
-                "location_lat": post.location_lat,
-                "location_lng": post.location_lng,
-                "platform": post.platform,
-                "link": post.link,
-                "timestamp": post.timestamp.isoformat(),
-                "title": title,
-                "headline": headline,
-                "content": content
-            })
+        def post_dicts():
+            """Posts as dicts for the verification service, built as it consumes them"""
+            for post in processed_posts:
+                raw_post = raw_post_map.get(post.raw_post_id)
+                if raw_post:
+                    title = raw_post.extra.get("title") if raw_post.extra else None
+                    headline = raw_post.extra.get("headline") if raw_post.extra else None
+                    content = raw_post.content
+                else:
+                    title = None
+                    headline = None
+                    content = None
+                yield {
+                    "id": post.id,
+                    "protest_score": post.protest_score,
+                    "sentiment_score": post.sentiment_score,
+                    "location_lat": post.location_lat,
+                    "location_lng": post.location_lng,
+                    "platform": post.platform,
+                    "link": post.link,
+                    # Passed as a datetime; verification compares it without re-parsing
+                    "timestamp": post.timestamp,
+                    "title": title,
+                    "headline": headline,
+                    "content": content
+                }
         
-        print(f"[DEBUG] create_incidents: {len(posts_dict)} processed posts passed to verification.")
+        print(f"[DEBUG] create_incidents: {len(processed_posts)} processed posts passed to verification.")
         # Verify and create incidents
-        incident_data = self.verification_service.verify(posts_dict)
+        incident_data = self.verification_service.verify(post_dicts())
         print(f"[DEBUG] create_incidents: {len(incident_data)} incidents returned from verification.")
         if incident_data:
             print(f"[DEBUG] First incident: {incident_data[0]}")
         
-        incidents = []
+        if not incident_data:
+            return []
+        rows = []
         for data in incident_data:
-            incident = Incident(
-                title=data.get("title"),
-                description=data.get("description"),
-                sources=data.get("sources", []),
-                location=data.get("location"),
-                location_lat=data.get("location_lat"),
-                location_lng=data.get("location_lng"),
-                severity=data.get("severity"),
-                status=data.get("status")
-            )
-            self.db.add(incident)
-            incidents.append(incident)
-        self.db.commit()
-        print(f"[DEBUG] create_incidents: {len(incidents)} incidents committed to DB.")
+            sources = data.get("sources", [])
+            rows.append({
+                "title": data.get("title"),
+                "description": data.get("description"),
+                "sources": sources,
+                # Bulk inserts bypass the @validates hook that normally fills this in
+                "source_count": len(sources or []),
+                "location": data.get("location"),
+                "location_lat": data.get("location_lat"),
+                "location_lng": data.get("location_lng"),
+                "severity": data.get("severity"),
+                "status": data.get("status")
+            })
+        incidents = list(self.db.scalars(insert(Incident).returning(Incident), rows))
+        print(f"[DEBUG] create_incidents: {len(incidents)} incidents inserted; committed with the cycle.")
         return incidents
 
     def send_alerts(self, incidents: List[Incident]):
-        """Send alerts for new incidents"""
-        for incident in incidents:
-            if incident.status in ["verified", "medium"] and incident.severity in ["medium", "high"]:
-                # Convert to dict for alert services
-                incident_dict = {
-                    "title": incident.title,
-                    "description": incident.description,
-                    "location": incident.location,
-                    "severity": incident.severity,
-                    "status": incident.status,
-                    "sources": incident.sources
-                }
-                
-                # Send Telegram alert
-                self.telegram_bot.broadcast_incident(incident_dict)
-                
-                # Send email alert (to admin)
-                # self.email_alert.send_alert(
-                #     to_email="admin@noesis.com",
-                #     subject=f"NOESIS Alert: {incident.severity.title()} severity incident",
-                #     message=f"New incident detected: {incident.title}"
-                # ) 
\ No newline at end of file
+        """Send alerts for new incidents: one Telegram broadcast and, with EMAIL_ALERTS_ENABLED, at most one email per subscriber"""
+        alertable = [
+            incident for incident in incidents
+            if is_alertable(incident.severity, incident.status)
+        ]
+        if not alertable:
+            return
+        
+        # Send Telegram alerts as one batch (delivered concurrently on the bot's event loop)
+        self.telegram_bot.schedule_broadcast([
+            {
+                "title": incident.title,
+                "description": incident.description,
+                "location": incident.location,
+                "severity": incident.severity,
+                "status": incident.status,
+                "sources": incident.sources,
+                "source_count": incident.source_count
+            }
+            for incident in alertable
+        ])
+        
+        if not EMAIL_ALERTS_ENABLED:
+            return
+        
+        # Queue one email per subscriber covering every incident that matches their preferences
+        # (sent by the background email pool)
+        for subscriber in self.db.query(AlertSubscriber).all():
+            preference = SEVERITY_RANK.get(subscriber.severity_preference or "medium", 1)
+            region = (subscriber.region_of_interest or "").lower()
+            matching = [
+                incident for incident in alertable
+                if SEVERITY_RANK[incident.severity] >= preference
+                and (not region or region in (incident.location or "").lower())
+            ]
+            if not matching:
+                continue
+            if len(matching) == 1:
+                subject = f"NOESIS Alert: {matching[0].severity.title()} severity incident"
+            else:
+                subject = f"NOESIS Alert: {len(matching)} new incidents"
+            message = "\n\n".join(
+                f"New incident detected: {incident.title}\nLocation: {incident.location}" for incident in matching
+            )
+            email_pool.submit(EmailJob(subscriber.email, subject, message))
@@ -4,15 +4,44 @@ Enhanced Predictive Service for NOESIS
 Advanced ML-like prediction with sophisticated risk assessment
 """
 
-import random
-import json
-import math
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
 import numpy as np
 
+# Scores, confidences and weights are all small bounded values, so the indicator arrays use single precision
+INDICATOR_DTYPE = np.float32
+
+# Per-indicator sampling parameters, one row per source in INDICATOR_SOURCES order
+INDICATOR_SOURCES = ("social_media_sentiment", "crowd_density", "police_activity", "traffic_anomalies", "protest_organization")
+SOURCE_INDEX = {source: index for index, source in enumerate(INDICATOR_SOURCES)}
+SENTIMENT_INDEX = SOURCE_INDEX["social_media_sentiment"]
+# Indicator weights based on real-world importance
+INDICATOR_WEIGHTS = (0.25, 0.20, 0.15, 0.15, 0.25)
+_WEIGHTS_ARR = np.array(INDICATOR_WEIGHTS, dtype=INDICATOR_DTYPE)
+_WEIGHTS_ARR.flags.writeable = False  # shared by every IndicatorBatch
+_WEIGHTS_SUM = _WEIGHTS_ARR.sum()
+_SENTIMENT_MASK = np.arange(len(INDICATOR_SOURCES)) == SENTIMENT_INDEX
+INDICATOR_VALUE_RANGES = np.array([(-0.8, 0.9), (0.1, 0.7), (0.0, 0.6), (0.0, 0.5), (0.0, 0.6)], dtype=INDICATOR_DTYPE)
+INDICATOR_VALUE_CAPS = np.array([np.inf, 0.95, 1.0, 0.9, 0.95], dtype=INDICATOR_DTYPE)
+INDICATOR_CONFIDENCE_RANGES = np.array([(0.75, 0.95), (0.85, 0.98), (0.75, 0.92), (0.7, 0.9), (0.65, 0.85)], dtype=INDICATOR_DTYPE)
+INDICATOR_AGE_MINUTES = np.array([(5, 30), (2, 15), (1, 10), (3, 20), (10, 45)])  # inclusive bounds
+# Values above these mark an indicator "increasing"; sentiment below SENTIMENT_DECREASING_BELOW is "decreasing"
+INDICATOR_INCREASING_ABOVE = np.array([0.6, 0.6, 0.7, 0.5, 0.6], dtype=INDICATOR_DTYPE)
+SENTIMENT_DECREASING_BELOW = -0.3
+# Value bias per recent incident, per high-severity incident, and for having any incident at all
+INDICATOR_INCIDENT_BIAS = np.array([0.0, 0.2, 0.3, 0.25, 0.3], dtype=INDICATOR_DTYPE)
+INDICATOR_HIGH_SEVERITY_BIAS = np.array([-0.2, 0.0, 0.2, 0.0, 0.15], dtype=INDICATOR_DTYPE)
+INDICATOR_ANY_INCIDENT_BIAS = np.array([-0.3, 0.0, 0.0, 0.0, 0.0], dtype=INDICATOR_DTYPE)
+# (base_risk, escalation_rate) for locations missing from location_risk_profiles
+DEFAULT_LOCATION_PROFILE = (0.2, 0.3)
+
+# Trend codes used in the int8 trend arrays
+TREND_NAMES = {1: "increasing", 0: "stable", -1: "decreasing"}
+# Score multiplier per trend code, indexed by code + 1
+TREND_MULTIPLIERS = np.array([0.8, 1.0, 1.2], dtype=INDICATOR_DTYPE)
+
 @dataclass
 class ThreatIndicator:
     source: str
@@ -23,6 +52,69 @@ class ThreatIndicator:
     description: str
     weight: float  # Importance weight for this indicator
 
+@dataclass
+class IndicatorBatch:
+    """One location's threat indicators as parallel arrays, entry i being INDICATOR_SOURCES[i]"""
+    sources: Tuple[str, ...]
+    values: np.ndarray
+    weights: np.ndarray
+    confidences: np.ndarray
+    trends: np.ndarray  # int8 codes, see TREND_NAMES
+    timestamps: List[datetime]
+    descriptions: List[str]
+
+    def to_dataclass_list(self) -> List[ThreatIndicator]:
+        """The same indicators as ThreatIndicator objects, for callers of the list form"""
+        return [
+            ThreatIndicator(
+                source=source,
+                value=value,
+                trend=TREND_NAMES[trend],
+                confidence=confidence,
+                timestamp=timestamp,
+                description=description,
+                weight=weight
+            )
+            for source, value, trend, confidence, timestamp, description, weight in zip(
+                self.sources, self.values.tolist(), self.trends.tolist(), self.confidences.tolist(),
+                self.timestamps, self.descriptions, self.weights.tolist()
+            )
+        ]
+
+    def to_summary_dicts(self, rounded: Optional[List[List[float]]] = None) -> List[Dict[str, Any]]:
+        """Per-indicator dicts for the risk_factors JSON; rounded is [values, confidences, weights] already rounded to 3 places"""
+        if rounded is None:
+            rounded = round_indicator_fields(np.stack([self.values, self.confidences, self.weights]))
+        values, confidences, weights = rounded
+        return [
+            {
+                "source": source,
+                "value": value,
+                "trend": TREND_NAMES[trend],
+                "confidence": confidence,
+                "weight": weight,
+                "description": description
+            }
+            for source, value, trend, confidence, weight, description in zip(
+                self.sources, values, self.trends.tolist(), confidences, weights, self.descriptions
+            )
+        ]
+
+def round_indicator_fields(array: np.ndarray) -> list:
+    """Round to 3 places in one vectorized call, as nested lists of Python floats.
+
+    Widened to float64 first so the results serialize as e.g. 0.123 rather than the nearest float32.
+    """
+    return np.round(array.astype(np.float64), 3).tolist()
+
+def indicator_trends(values: np.ndarray) -> np.ndarray:
+    """Trend codes for indicator values whose last axis follows INDICATOR_SOURCES"""
+    return np.select(
+        [values > INDICATOR_INCREASING_ABOVE, _SENTIMENT_MASK & (values < SENTIMENT_DECREASING_BELOW)],
+        [np.int8(1), np.int8(-1)],
+        default=np.int8(0)
+    )
+
 @dataclass
 class Prediction:
     location: str
@@ -39,27 +131,38 @@ class Prediction:
     escalation_probability: float
 
 class EnhancedPredictiveService:
-    def __init__(self):
-        # Historical data patterns (simulated)
+    # Severity thresholds: minimum risk score and minimum number of increasing indicators
+    _HIGH_MIN_SCORE = 0.7
+    _HIGH_MIN_IND = 3
+    _MEDIUM_MIN_SCORE = 0.4
+    _MEDIUM_MIN_IND = 2
+    _LOW_MIN_SCORE = 0.2
+    _LOW_MIN_IND = 1
+    # (min score, min increasing indicators, severity, time to incident), checked in order; the last row always matches
+    _severity_table = (
+        (_HIGH_MIN_SCORE, _HIGH_MIN_IND, "high", "2-4 hours"),
+        (_MEDIUM_MIN_SCORE, _MEDIUM_MIN_IND, "medium", "4-8 hours"),
+        (-np.inf, 0, "low", "8-12 hours")
+    )
+
+    def __init__(self, seed: Optional[int] = None):
+        # Every stochastic field is drawn from this generator; pass a seed for reproducible predictions
+        self.rng = np.random.default_rng(seed)
+        
+        # Historical data patterns (simulated), as (base_risk, escalation_rate)
         self.location_risk_profiles = {
-            "Downtown Area": {"base_risk": 0.3, "escalation_rate": 0.4},
-            "University Campus": {"base_risk": 0.2, "escalation_rate": 0.3},
-            "Industrial District": {"base_risk": 0.4, "escalation_rate": 0.5},
-            "City Center": {"base_risk": 0.35, "escalation_rate": 0.45},
-            "Government Building": {"base_risk": 0.5, "escalation_rate": 0.6},
-            "Transport Hub": {"base_risk": 0.25, "escalation_rate": 0.35},
-            "Shopping District": {"base_risk": 0.15, "escalation_rate": 0.25},
-            "Residential Area": {"base_risk": 0.1, "escalation_rate": 0.2}
+            "Downtown Area": (0.3, 0.4),
+            "University Campus": (0.2, 0.3),
+            "Industrial District": (0.4, 0.5),
+            "City Center": (0.35, 0.45),
+            "Government Building": (0.5, 0.6),
+            "Transport Hub": (0.25, 0.35),
+            "Shopping District": (0.15, 0.25),
+            "Residential Area": (0.1, 0.2)
         }
         
-        # Indicator weights based on real-world importance
-        self.indicator_weights = {
-            "social_media_sentiment": 0.25,
-            "crowd_density": 0.20,
-            "police_activity": 0.15,
-            "traffic_anomalies": 0.15,
-            "protest_organization": 0.25
-        }
+        # Indicator weights by source (the scoring paths use the positional _WEIGHTS_ARR)
+        self.indicator_weights = dict(zip(INDICATOR_SOURCES, INDICATOR_WEIGHTS))
         
         # Time-based risk multipliers
         self.time_risk_multipliers = {
@@ -68,177 +171,200 @@ class EnhancedPredictiveService:
             "holiday": 1.4,
             "weekday": 1.0
         }
+        # Multiplier per (weekday, hour, month); at most 2016 slots
+        self._time_multiplier_cache = {}
         
-        # Severity thresholds
+        # Severity thresholds (the scoring paths read the class constants directly)
         self.severity_thresholds = {
-            "high": {"min_score": 0.7, "min_indicators": 3},
-            "medium": {"min_score": 0.4, "min_indicators": 2},
-            "low": {"min_score": 0.2, "min_indicators": 1}
+            "high": {"min_score": self._HIGH_MIN_SCORE, "min_indicators": self._HIGH_MIN_IND},
+            "medium": {"min_score": self._MEDIUM_MIN_SCORE, "min_indicators": self._MEDIUM_MIN_IND},
+            "low": {"min_score": self._LOW_MIN_SCORE, "min_indicators": self._LOW_MIN_IND}
         }
 
-    def calculate_time_risk_multiplier(self) -> float:
-        """Calculate risk multiplier based on current time"""
-        now = datetime.utcnow()
+    def calculate_time_risk_multiplier(self, now: Optional[datetime] = None) -> float:
+        """Calculate risk multiplier based on current time (or the given UTC time)"""
+        if now is None:
+            now = datetime.utcnow()
+        key = (now.weekday(), now.hour, now.month)
+        multiplier = self._time_multiplier_cache.get(key)
+        if multiplier is None:
+            multiplier = self._time_multiplier_cache[key] = self._time_risk_multiplier_at(*key)
+        return multiplier
+
+    def _time_risk_multiplier_at(self, weekday: int, hour: int, month: int) -> float:
+        """Risk multiplier for a (weekday, hour, month) slot"""
         multiplier = 1.0
         
         # Weekend effect
-        if now.weekday() >= 5:  # Saturday = 5, Sunday = 6
+        if weekday >= 5:  # Saturday = 5, Sunday = 6
             multiplier *= self.time_risk_multipliers["weekend"]
         
         # Evening effect (6 PM - 2 AM)
-        if 18 <= now.hour or now.hour <= 2:
+        if 18 <= hour or hour <= 2:
             multiplier *= self.time_risk_multipliers["evening"]
         
         # Holiday effect (simplified)
-        if now.month == 12 or now.month == 1:  # Holiday season
+        if month == 12 or month == 1:  # Holiday season
             multiplier *= self.time_risk_multipliers["holiday"]
         
         return multiplier
 
-    def generate_realistic_indicators(self, location: str, existing_incidents: List[Dict]) -> List[ThreatIndicator]:
+    def draw_indicator_samples(self, incident_counts: np.ndarray, high_severity_counts: np.ndarray,
+                               base_time: Optional[datetime] = None) -> Dict[str, np.ndarray]:
+        """Draw every location's indicator values, confidences and ages in a few batched RNG calls"""
+        shape = (len(incident_counts), len(INDICATOR_SOURCES))
+        values = self._uniform(INDICATOR_VALUE_RANGES, shape)
+        # More negative sentiment and more activity where there are recent (high-severity) incidents
+        values += (np.outer(incident_counts.astype(INDICATOR_DTYPE), INDICATOR_INCIDENT_BIAS)
+                   + np.outer(high_severity_counts.astype(INDICATOR_DTYPE), INDICATOR_HIGH_SEVERITY_BIAS)
+                   + np.outer(incident_counts > 0, INDICATOR_ANY_INCIDENT_BIAS))
+        np.clip(values, None, INDICATOR_VALUE_CAPS, out=values)
+        age_minutes = self.rng.integers(INDICATOR_AGE_MINUTES[:, 0], INDICATOR_AGE_MINUTES[:, 1] + 1, size=shape)
+        return {
+            "values": values,
+            "trends": indicator_trends(values),
+            "confidences": self._uniform(INDICATOR_CONFIDENCE_RANGES, shape),
+            "age_minutes": age_minutes,
+            # Observation times for every indicator in one datetime64 subtraction
+            "timestamps": np.datetime64(base_time or datetime.utcnow(), "us") - age_minutes.astype("timedelta64[m]"),
+            "hours_ahead": self.rng.integers(2, 9, size=shape[0])
+        }
+
+    def _uniform(self, ranges: np.ndarray, shape: Tuple[int, int]) -> np.ndarray:
+        """Uniform draws in INDICATOR_DTYPE, column j between ranges[j, 0] and ranges[j, 1]"""
+        low, high = ranges[:, 0], ranges[:, 1]
+        return self.rng.random(shape, dtype=INDICATOR_DTYPE) * (high - low) + low
+
+    def generate_indicator_batch(self, location: str, existing_incidents: List[Dict],
+                                 samples: Optional[Dict[str, np.ndarray]] = None, row: int = 0,
+                                 base_time: Optional[datetime] = None) -> IndicatorBatch:
+        """Threat indicators for one location from one row of draw_indicator_samples (drawn here when not given)"""
+        if samples is None:
+            samples = self.draw_indicator_samples(
+                np.array([len(existing_incidents)]), np.array([self._severity_counts(existing_incidents)[0]]), base_time
+            )
+            row = 0
+        
+        values = samples["values"][row]
+        trends = samples["trends"][row]
+        sentiment_score, crowd_density, police_activity, traffic_anomaly, protest_org = values.tolist()
+        sentiment_trend = TREND_NAMES[int(trends[0])]
+        
+        return IndicatorBatch(
+            sources=INDICATOR_SOURCES,
+            values=values,
+            weights=_WEIGHTS_ARR,
+            confidences=samples["confidences"][row],
+            trends=trends,
+            timestamps=samples["timestamps"][row].tolist(),
+            descriptions=[
+                f"Sentiment analysis shows {sentiment_trend} negative sentiment in {location}",
+                f"Satellite imagery detects {crowd_density:.1%} crowd density in {location}",
+                f"Police scanner activity level: {police_activity:.1%} in {location}",
+                f"Traffic sensors detect {traffic_anomaly:.1%} anomaly in {location}",
+                f"Detected {protest_org:.1%} protest organization activity in {location}"
+            ]
+        )
+
+    def generate_realistic_indicators(self, location: str, existing_incidents: List[Dict],
+                                      samples: Optional[Dict[str, np.ndarray]] = None, row: int = 0) -> List[ThreatIndicator]:
         """Generate realistic threat indicators based on location and existing incidents"""
-        indicators = []
-        base_time = datetime.utcnow()
-        
-        # Get location risk profile
-        location_profile = self.location_risk_profiles.get(location, {"base_risk": 0.2, "escalation_rate": 0.3})
-        base_risk = location_profile["base_risk"]
-        escalation_rate = location_profile["escalation_rate"]
-        
-        # Adjust based on existing incidents
-        incident_count = len(existing_incidents)
-        high_severity_count = len([i for i in existing_incidents if i.get('severity') == 'high'])
-        
-        # Social Media Sentiment Analysis
-        # More negative sentiment if there are recent incidents
-        sentiment_bias = -0.3 if incident_count > 0 else 0.0
-        sentiment_bias -= 0.2 * high_severity_count  # More negative for high severity incidents
-        
-        sentiment_score = random.uniform(-0.8 + sentiment_bias, 0.9 + sentiment_bias)
-        sentiment_trend = self._determine_trend(sentiment_score, base_risk)
-        
-        indicators.append(ThreatIndicator(
-            source="social_media_sentiment",
-            value=sentiment_score,
-            trend=sentiment_trend,
-            confidence=random.uniform(0.75, 0.95),
-            timestamp=base_time - timedelta(minutes=random.randint(5, 30)),
-            description=f"Sentiment analysis shows {sentiment_trend} negative sentiment in {location}",
-            weight=self.indicator_weights["social_media_sentiment"]
-        ))
-        
-        # Crowd Density Detection
-        # Higher density if there are recent incidents
-        density_bias = 0.2 * incident_count
-        crowd_density = min(0.95, random.uniform(0.1, 0.7) + density_bias)
-        
-        indicators.append(ThreatIndicator(
-            source="crowd_density",
-            value=crowd_density,
-            trend="increasing" if crowd_density > 0.6 else "stable",
-            confidence=random.uniform(0.85, 0.98),
-            timestamp=base_time - timedelta(minutes=random.randint(2, 15)),
-            description=f"Satellite imagery detects {crowd_density:.1%} crowd density in {location}",
-            weight=self.indicator_weights["crowd_density"]
-        ))
-        
-        # Police Activity Monitoring
-        # Higher activity if there are incidents
-        police_bias = 0.3 * incident_count + 0.2 * high_severity_count
-        police_activity = min(1.0, random.uniform(0.0, 0.6) + police_bias)
-        
-        indicators.append(ThreatIndicator(
-            source="police_activity",
-            value=police_activity,
-            trend="increasing" if police_activity > 0.7 else "stable",
-            confidence=random.uniform(0.75, 0.92),
-            timestamp=base_time - timedelta(minutes=random.randint(1, 10)),
-            description=f"Police scanner activity level: {police_activity:.1%} in {location}",
-            weight=self.indicator_weights["police_activity"]
-        ))
-        
-        # Traffic Anomalies
-        # Higher anomalies if there are incidents
-        traffic_bias = 0.25 * incident_count
-        traffic_anomaly = min(0.9, random.uniform(0.0, 0.5) + traffic_bias)
-        
-        indicators.append(ThreatIndicator(
-            source="traffic_anomalies",
-            value=traffic_anomaly,
-            trend="increasing" if traffic_anomaly > 0.5 else "stable",
-            confidence=random.uniform(0.7, 0.9),
-            timestamp=base_time - timedelta(minutes=random.randint(3, 20)),
-            description=f"Traffic sensors detect {traffic_anomaly:.1%} anomaly in {location}",
-            weight=self.indicator_weights["traffic_anomalies"]
-        ))
-        
-        # Protest Organization Detection
-        # Higher organization if there are incidents
-        org_bias = 0.3 * incident_count + 0.15 * high_severity_count
-        protest_org = min(0.95, random.uniform(0.0, 0.6) + org_bias)
-        
-        indicators.append(ThreatIndicator(
-            source="protest_organization",
-            value=protest_org,
-            trend="increasing" if protest_org > 0.6 else "stable",
-            confidence=random.uniform(0.65, 0.85),
-            timestamp=base_time - timedelta(minutes=random.randint(10, 45)),
-            description=f"Detected {protest_org:.1%} protest organization activity in {location}",
-            weight=self.indicator_weights["protest_organization"]
-        ))
-        
-        return indicators
+        return self.generate_indicator_batch(location, existing_incidents, samples, row).to_dataclass_list()
 
-    def _determine_trend(self, value: float, base_risk: float) -> str:
-        """Determine trend based on value and base risk"""
-        if value > 0.6:
-            return "increasing"
-        elif value < -0.3:
-            return "decreasing"
-        else:
-            return "stable"
+    def indicator_scores(self, samples: Dict[str, np.ndarray]) -> np.ndarray:
+        """Weighted indicator score for every row of draw_indicator_samples, as one array expression"""
+        values, trends = samples["values"], samples["trends"]
+        # Negative sentiment = higher threat
+        scores = np.where(_SENTIMENT_MASK, np.where(values < 0, -values, values * 0.3), values)
+        return (scores * samples["confidences"] * TREND_MULTIPLIERS[trends + 1]) @ _WEIGHTS_ARR / _WEIGHTS_SUM
+
+    def score_locations(self, samples: Dict[str, np.ndarray], incident_counts: np.ndarray,
+                        high_severity_counts: np.ndarray, escalating_counts: np.ndarray,
+                        base_risks: np.ndarray, time_multiplier: float) -> Dict[str, list]:
+        """Risk score, escalation probability, severity and timing for every location at once.
+
+        Array form of calculate_advanced_risk_score, predict_escalation_probability and
+        determine_severity_and_timing over the rows of draw_indicator_samples.
+        """
+        incident_counts, high_severity_counts, escalating_counts, base_risks = (
+            np.asarray(array, dtype=INDICATOR_DTYPE) for array in (incident_counts, high_severity_counts, escalating_counts, base_risks)
+        )
+        time_multiplier = INDICATOR_DTYPE(time_multiplier)
+        
+        # Risk score: weighted indicators plus incident history, scaled by time of day
+        historical_scores = np.minimum(0.4, 0.1 * incident_counts + 0.15 * high_severity_counts)
+        risk_scores = np.clip((self.indicator_scores(samples) * 0.6 + historical_scores * 0.4) * time_multiplier + base_risks, None, 0.99)
+        
+        # Escalation: number and mean confidence of increasing indicators, boosted by medium/high incidents
+        increasing = samples["trends"] == 1
+        increasing_counts = increasing.sum(axis=1, dtype=INDICATOR_DTYPE)
+        increasing_confidence = np.where(increasing, samples["confidences"], 0.0).sum(axis=1) / np.maximum(increasing_counts, 1)
+        base_probs = 0.1 + 0.1 * increasing_counts + 0.2 * increasing_confidence
+        escalation_probs = np.clip(base_probs * (1.0 + 0.15 * escalating_counts), None, 0.95)
+        
+        # Severity: index of the first matching _severity_table row; high escalation moves timing one row up
+        severity_rows = np.full(len(risk_scores), len(self._severity_table) - 1)
+        for index in range(len(self._severity_table) - 2, -1, -1):
+            min_score, min_indicators = self._severity_table[index][:2]
+            severity_rows[(risk_scores >= min_score) & (increasing_counts >= min_indicators)] = index
+        timing_rows = severity_rows - ((escalation_probs > 0.7) & (severity_rows > 0))
+        
+        # Classification above uses the float32 values; the returned scores are rounded like the indicator fields
+        rounded_scores, rounded_probs = round_indicator_fields(np.stack([risk_scores, escalation_probs]))
+        return {
+            "risk_scores": rounded_scores,
+            "escalation_probs": rounded_probs,
+            "increasing_counts": increasing_counts.astype(int).tolist(),
+            "severities": [self._severity_table[index][2] for index in severity_rows.tolist()],
+            "times_to_incident": [self._severity_table[index][3] for index in timing_rows.tolist()]
+        }
 
     def calculate_advanced_risk_score(self, indicators: List[ThreatIndicator], 
                                     existing_incidents: List[Dict], 
-                                    location: str) -> float:
+                                    location: str,
+                                    time_multiplier: Optional[float] = None,
+                                    indicator_score: Optional[float] = None,
+                                    high_severity_count: Optional[int] = None) -> float:
         """Calculate advanced risk score using weighted indicators and historical data"""
         if not indicators:
             return 0.0
         
         # Get location risk profile
-        location_profile = self.location_risk_profiles.get(location, {"base_risk": 0.2, "escalation_rate": 0.3})
-        base_risk = location_profile["base_risk"]
+        base_risk, _ = self.location_risk_profiles.get(location, DEFAULT_LOCATION_PROFILE)
         
-        # Calculate weighted indicator score
-        weighted_score = 0.0
-        total_weight = 0.0
+        # Calculate weighted indicator score (precomputed by indicator_scores when scoring many locations)
+        if indicator_score is None:
+            weighted_score = 0.0
+            total_weight = 0.0
         
-        for indicator in indicators:
-            weight = indicator.weight
+            for indicator in indicators:
+                weight = indicator.weight
             
-            # Normalize different indicators
-            if indicator.source == "social_media_sentiment":
-                # Negative sentiment = higher threat
-                score = abs(indicator.value) if indicator.value < 0 else indicator.value * 0.3
-            else:
-                score = indicator.value
+                # Normalize different indicators
+                if indicator.source == "social_media_sentiment":
+                    # Negative sentiment = higher threat
+                    score = abs(indicator.value) if indicator.value < 0 else indicator.value * 0.3
+                else:
+                    score = indicator.value
             
-            # Apply trend multiplier
-            trend_multiplier = 1.2 if indicator.trend == "increasing" else 0.8 if indicator.trend == "decreasing" else 1.0
+                # Apply trend multiplier
+                trend_multiplier = 1.2 if indicator.trend == "increasing" else 0.8 if indicator.trend == "decreasing" else 1.0
             
-            weighted_score += score * weight * indicator.confidence * trend_multiplier
-            total_weight += weight
+                weighted_score += score * weight * indicator.confidence * trend_multiplier
+                total_weight += weight
         
-        indicator_score = weighted_score / total_weight if total_weight > 0 else 0.0
+            indicator_score = weighted_score / total_weight if total_weight > 0 else 0.0
         
         # Historical incident impact
         incident_count = len(existing_incidents)
-        high_severity_count = len([i for i in existing_incidents if i.get('severity') == 'high'])
+        if high_severity_count is None:
+            high_severity_count = self._severity_counts(existing_incidents)[0]
         
         historical_score = min(0.4, 0.1 * incident_count + 0.15 * high_severity_count)
         
-        # Time-based risk multiplier
-        time_multiplier = self.calculate_time_risk_multiplier()
+        # Time-based risk multiplier (callers scoring many locations pass it in)
+        if time_multiplier is None:
+            time_multiplier = self.calculate_time_risk_multiplier()
         
         # Combine all factors
         final_score = (indicator_score * 0.6 + historical_score * 0.4) * time_multiplier + base_risk
@@ -246,46 +372,40 @@ class EnhancedPredictiveService:
         return min(final_score, 0.99)  # Cap at 0.99
 
     def predict_escalation_probability(self, indicators: List[ThreatIndicator], 
-                                     existing_incidents: List[Dict]) -> float:
+                                     existing_incidents: List[Dict],
+                                     escalating_count: Optional[int] = None) -> float:
         """Predict probability of escalation based on current indicators"""
         if not indicators:
             return 0.0
         
-        # Count increasing indicators
-        increasing_count = len([i for i in indicators if i.trend == "increasing"])
-        
-        # Calculate average confidence of increasing indicators
-        increasing_confidence = 0.0
-        if increasing_count > 0:
-            increasing_indicators = [i for i in indicators if i.trend == "increasing"]
-            increasing_confidence = sum(i.confidence for i in increasing_indicators) / len(increasing_indicators)
+        # Count increasing indicators and average their confidence
+        increasing_confidences = [i.confidence for i in indicators if i.trend == "increasing"]
+        increasing_count = len(increasing_confidences)
+        increasing_confidence = sum(increasing_confidences) / increasing_count if increasing_count else 0.0
         
         # Base escalation probability
         base_prob = 0.1 + (0.1 * increasing_count) + (0.2 * increasing_confidence)
         
         # Adjust based on recent incidents
-        recent_incidents = len([i for i in existing_incidents if i.get('severity') in ['high', 'medium']])
-        incident_multiplier = 1.0 + (0.15 * recent_incidents)
+        if escalating_count is None:
+            escalating_count = self._severity_counts(existing_incidents)[1]
+        incident_multiplier = 1.0 + (0.15 * escalating_count)
         
         final_prob = min(base_prob * incident_multiplier, 0.95)
         return final_prob
 
     def determine_severity_and_timing(self, risk_score: float, 
                                     indicators: List[ThreatIndicator],
-                                    escalation_prob: float) -> tuple:
+                                    escalation_prob: float,
+                                    increasing_count: Optional[int] = None) -> tuple:
         """Determine predicted severity and timing based on risk score"""
-        increasing_indicators = len([i for i in indicators if i.trend == "increasing"])
+        if increasing_count is None:
+            increasing_count = sum(1 for i in indicators if i.trend == "increasing")
         
         # Determine severity
-        if risk_score >= self.severity_thresholds["high"]["min_score"] and increasing_indicators >= self.severity_thresholds["high"]["min_indicators"]:
-            severity = "high"
-            time_to_incident = "2-4 hours"
-        elif risk_score >= self.severity_thresholds["medium"]["min_score"] and increasing_indicators >= self.severity_thresholds["medium"]["min_indicators"]:
-            severity = "medium"
-            time_to_incident = "4-8 hours"
-        else:
-            severity = "low"
-            time_to_incident = "8-12 hours"
+        for min_score, min_indicators, severity, time_to_incident in self._severity_table:
+            if risk_score >= min_score and increasing_count >= min_indicators:
+                break
         
         # Adjust timing based on escalation probability
         if escalation_prob > 0.7:
@@ -296,6 +416,34 @@ class EnhancedPredictiveService:
         
         return severity, time_to_incident
 
+    @staticmethod
+    def _severity_counts(incidents: List[Dict]) -> Tuple[int, int]:
+        """(high, high or medium) severity incident counts, in one pass"""
+        high = escalating = 0
+        for incident in incidents:
+            severity = incident.get('severity')
+            if severity == 'high':
+                high += 1
+                escalating += 1
+            elif severity == 'medium':
+                escalating += 1
+        return high, escalating
+
+    def _summarize_incidents(self, incidents: List[Dict]) -> Tuple[int, int, int, List[Dict[str, Any]]]:
+        """(total, high, high or medium, summaries of the first three) for one location's incidents"""
+        high, escalating = self._severity_counts(incidents)
+        summaries = [
+            {
+                "id": incident.get('incident_id', i),
+                "title": incident.get('title', f'Incident {i}'),
+                "severity": incident.get('severity', 'unknown'),
+                "status": incident.get('status', 'unknown'),
+                "sources_count": len(incident.get('sources', []))
+            }
+            for i, incident in enumerate(incidents[:3])
+        ]
+        return len(incidents), high, escalating, summaries
+
     def predict_incidents(self, existing_incidents: List[Dict]) -> List[Prediction]:
         """Generate enhanced predictions with sophisticated risk assessment"""
         predictions = []
@@ -307,89 +455,86 @@ class EnhancedPredictiveService:
             location = incident.get('location', 'Unknown Location')
             location_incidents[location].append(incident)
         
-        # Generate predictions for each location
-        for location, incidents in location_incidents.items():
-            if len(incidents) >= 1:  # Predict if there's at least 1 incident
-                # Generate realistic indicators
-                indicators = self.generate_realistic_indicators(location, incidents)
-                
-                # Calculate advanced risk score
-                risk_score = self.calculate_advanced_risk_score(indicators, incidents, location)
-                
-                # Predict escalation probability
-                escalation_prob = self.predict_escalation_probability(indicators, incidents)
-                
-                # Determine severity and timing
-                predicted_severity, time_to_incident = self.determine_severity_and_timing(
-                    risk_score, indicators, escalation_prob
-                )
-                
-                # Calculate final confidence
-                ml_confidence = risk_score
-                base_confidence = min(0.3 + 0.1 * len(incidents), 0.6)
-                final_confidence = (ml_confidence * 0.7) + (base_confidence * 0.3)
-                
-                # Create detailed risk factors
-                risk_factors = {
-                    "recent_incidents": len(incidents),
-                    "high_severity": len([i for i in incidents if i.get('severity') == 'high']),
-                    "total_incidents": len(incidents),
-                    "threat_level": round(risk_score, 2),
-                    "ml_confidence": round(ml_confidence, 3),
-                    "escalation_probability": round(escalation_prob, 3),
-                    "time_risk_multiplier": round(self.calculate_time_risk_multiplier(), 2),
-                    "based_on_incidents": [
-                        {
-                            "id": incident.get('incident_id', i),
-                            "title": incident.get('title', f'Incident {i}'),
-                            "severity": incident.get('severity', 'unknown'),
-                            "status": incident.get('status', 'unknown'),
-                            "sources_count": len(incident.get('sources', []))
-                        }
-                        for i, incident in enumerate(incidents[:3])
-                    ],
-                    "real_time_indicators": [
-                        {
-                            "source": ind.source,
-                            "value": round(ind.value, 3),
-                            "trend": ind.trend,
-                            "confidence": round(ind.confidence, 3),
-                            "weight": round(ind.weight, 3),
-                            "description": ind.description
-                        }
-                        for ind in indicators
-                    ]
-                }
-                
-                # Create detailed prediction reason
-                increasing_indicators = [i for i in indicators if i.trend == 'increasing']
-                high_severity_count = len([i for i in incidents if i.get('severity') == 'high'])
-                
-                reason_parts = []
-                if increasing_indicators:
-                    reason_parts.append(f"{len(increasing_indicators)} increasing threat indicators")
-                if high_severity_count:
-                    reason_parts.append(f"{high_severity_count} high-severity recent incidents")
-                if escalation_prob > 0.6:
-                    reason_parts.append(f"high escalation probability ({escalation_prob:.1%})")
-                
-                prediction_reason = f"ML analysis predicts {predicted_severity} unrest in {location} based on {', '.join(reason_parts)}"
-                
-                predictions.append(Prediction(
-                    location=location,
-                    predicted_severity=predicted_severity,
-                    confidence=final_confidence,
-                    time_to_incident=time_to_incident,
-                    risk_factors=risk_factors,
-                    prediction_timestamp=now,
-                    predicted_incident_time=now + timedelta(hours=random.randint(2, 8)),
-                    prediction_reason=prediction_reason,
-                    threat_indicators=indicators,
-                    ml_confidence=ml_confidence,
-                    risk_score=risk_score,
-                    escalation_probability=escalation_prob
-                ))
+        # Every group has at least 1 incident, so each location gets a prediction
+        groups = list(location_incidents.items())
+        # Counts and summaries per location, computed once and reused below
+        summaries = [self._summarize_incidents(incidents) for _, incidents in groups]
+        incident_counts = np.array([total for total, _, _, _ in summaries])
+        high_severity_counts = np.array([high for _, high, _, _ in summaries])
+        # Draw the random indicator inputs for every location at once
+        samples = self.draw_indicator_samples(incident_counts, high_severity_counts, now)
+        hours_ahead = samples["hours_ahead"].tolist()
+        
+        # Same for every location in this run
+        time_multiplier = self.calculate_time_risk_multiplier(now)
+        # Score every location in one pass over the sample arrays
+        scores = self.score_locations(
+            samples, incident_counts, high_severity_counts,
+            np.array([escalating for _, _, escalating, _ in summaries]),
+            np.array([self.location_risk_profiles.get(location, DEFAULT_LOCATION_PROFILE)[0] for location, _ in groups]),
+            time_multiplier
+        )
+        
+        # Round every location's indicator fields for the JSON at once rather than per value
+        rounded_values, rounded_confidences = round_indicator_fields(np.stack([samples["values"], samples["confidences"]]))
+        rounded_weights = round_indicator_fields(_WEIGHTS_ARR)
         
+        # Generate predictions for each location
+        for row, (location, incidents) in enumerate(groups):
+            # Generate realistic indicators
+            indicators = self.generate_indicator_batch(location, incidents, samples, row)
+            
+            risk_score = scores["risk_scores"][row]
+            escalation_prob = scores["escalation_probs"][row]
+            predicted_severity = scores["severities"][row]
+            time_to_incident = scores["times_to_incident"][row]
+            increasing_count = scores["increasing_counts"][row]
+            incident_count, high_severity_count, _, based_on_incidents = summaries[row]
+            
+            # Calculate final confidence
+            ml_confidence = risk_score
+            base_confidence = min(0.3 + 0.1 * incident_count, 0.6)
+            final_confidence = round((ml_confidence * 0.7) + (base_confidence * 0.3), 3)
+            
+            # Create detailed risk factors
+            risk_factors = {
+                "recent_incidents": incident_count,
+                "high_severity": high_severity_count,
+                "total_incidents": incident_count,
+                "threat_level": round(risk_score, 2),
+                "ml_confidence": round(ml_confidence, 3),
+                "escalation_probability": round(escalation_prob, 3),
+                "time_risk_multiplier": round(time_multiplier, 2),
+                "based_on_incidents": based_on_incidents,
+                "real_time_indicators": indicators.to_summary_dicts([rounded_values[row], rounded_confidences[row], rounded_weights])
+            }
+            
+            # Create detailed prediction reason
+            reason_parts = []
+            if increasing_count:
+                reason_parts.append(f"{increasing_count} increasing threat indicators")
+            if high_severity_count:
+                reason_parts.append(f"{high_severity_count} high-severity recent incidents")
+            if escalation_prob > 0.6:
+                reason_parts.append(f"high escalation probability ({escalation_prob:.1%})")
+            
+            prediction_reason = f"ML analysis predicts {predicted_severity} unrest in {location} based on {', '.join(reason_parts)}"
+            
+            predictions.append(Prediction(
+                location=location,
+                predicted_severity=predicted_severity,
+                confidence=final_confidence,
+                time_to_incident=time_to_incident,
+                risk_factors=risk_factors,
+                prediction_timestamp=now,
+                predicted_incident_time=now + timedelta(hours=hours_ahead[row]),
+                prediction_reason=prediction_reason,
+                threat_indicators=indicators.to_dataclass_list(),
+                ml_confidence=ml_confidence,
+                risk_score=risk_score,
+                escalation_probability=escalation_prob
+            ))
+    
         # Sort by risk score (highest first)
         predictions.sort(key=lambda x: x.risk_score, reverse=True)
         return predictions
@@ -5,6 +5,7 @@ Uses actual ML models for sentiment analysis and prediction
 """
 
 import json
+import math
 import pickle
 import numpy as np
 import pandas as pd
@@ -12,13 +13,20 @@ from typing import List, Dict, Any, Tuple, Optional
 from datetime import datetime, timedelta
 import logging
 from dataclasses import dataclass
+from app.utils.quantization import quantize_pipeline
+from app.collectors._keywords import build_automaton, count_present
+from app.utils.onnx_runtime import (
+    HAS_ONNXRUNTIME, HAS_SKL2ONNX, OnnxClassifier, OnnxSklearnClassifier,
+    convert_sklearn_classifier, export_and_quantize
+)
 
 # Try to import ML libraries
 try:
     from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
     from sklearn.ensemble import RandomForestClassifier, IsolationForest
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.preprocessing import StandardScaler
+    from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+    from sklearn.preprocessing import StandardScaler, normalize
+    from sklearn.utils.validation import check_is_fitted
     import torch
     HAS_ML_LIBS = True
 except ImportError:
@@ -27,6 +35,68 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Texts per transformer forward pass, and the token length they are truncated to
+SENTIMENT_BATCH_SIZE = 32
+SENTIMENT_MAX_LENGTH = 128
+# Sentiment per output index of the RoBERTa sentiment head
+SENTIMENT_LABELS = ('negative', 'neutral', 'positive')
+# INT8 ONNX export of the sentiment model, served by ONNX Runtime when it is installed
+SENTIMENT_ONNX_PATH = 'models/sentiment-int8.onnx'
+# Pickled protest classifier and the fitted TF-IDF vectorizer it was trained with; both are retrained if either is missing
+PROTEST_CLASSIFIER_PATH = 'models/protest_classifier.pkl'
+PROTEST_VECTORIZER_PATH = 'models/protest_vectorizer.pkl'
+# ONNX copy of the protest classifier, converted on first use and removed when the classifier is retrained
+PROTEST_ONNX_PATH = 'models/protest_classifier.onnx'
+
+# Keyword lists for the text features and fallback methods, each matched by its own automaton
+PROTEST_KEYWORDS = (
+    'protest', 'demonstration', 'rally', 'march', 'gathering',
+    'unrest', 'disruption', 'blockade', 'occupation', 'strike',
+    'civil disobedience', 'sit-in', 'walkout', 'boycott'
+)
+VIOLENCE_KEYWORDS = (
+    'violence', 'riot', 'clash', 'conflict', 'arrest',
+    'police', 'tear gas', 'rubber bullets', 'barricade'
+)
+PEACEFUL_KEYWORDS = (
+    'peaceful', 'peace', 'unity', 'solidarity', 'justice',
+    'non-violent', 'calm', 'orderly'
+)
+FALLBACK_NEGATIVE_WORDS = ('protest', 'demonstration', 'unrest', 'disruption', 'violence', 'arrest')
+FALLBACK_POSITIVE_WORDS = ('peaceful', 'peace', 'unity', 'solidarity', 'justice')
+FALLBACK_PROTEST_KEYWORDS = ('protest', 'demonstration', 'rally', 'march', 'gathering')
+
+# Column order of the numeric feature vector fed to the scaler and anomaly detector
+PREDICTION_FEATURE_KEYS = (
+    'social_media_volume', 'news_coverage', 'crowd_density', 'police_activity', 'traffic_anomaly',
+    'weather_score', 'sentiment_score', 'protest_probability', 'recent_incidents', 'high_severity_count'
+)
+# Sources whose presence raises prediction confidence, and those summed for the fallback prediction
+CONFIDENCE_SOURCE_KEYS = ('social_media_volume', 'news_coverage', 'crowd_density')
+FALLBACK_INDICATOR_KEYS = ('social_media_volume', 'news_coverage', 'crowd_density', 'recent_incidents')
+# Placeholder data-recency factor in the confidence average (recent data is assumed reliable)
+RECENCY_CONFIDENCE = 0.8
+
+if HAS_ML_LIBS:
+    class FastTfidfVectorizer(TfidfVectorizer):
+        """TfidfVectorizer whose transform applies idf weights and normalization in place on the CSR data.
+
+        Same output as the parent; older scikit-learn releases multiply by a sparse idf diagonal
+        instead, allocating a second matrix for every call.
+        """
+
+        def transform(self, raw_documents):
+            check_is_fitted(self, msg="The TF-IDF vectorizer is not fitted")
+            X = CountVectorizer.transform(self, raw_documents)
+            if self.sublinear_tf:
+                np.log(X.data, out=X.data)
+                X.data += 1
+            if self.use_idf:
+                X.data *= self.idf_[X.indices]
+            if self.norm is not None:
+                normalize(X, norm=self.norm, copy=False)
+            return X
+
 @dataclass
 class PredictionResult:
     probability: float
@@ -39,11 +109,21 @@ class MLPredictor:
     def __init__(self):
         self.has_ml_libs = HAS_ML_LIBS
         self.sentiment_pipeline = None
+        self.sentiment_session = None
         self.protest_classifier = None
+        self.protest_session = None
         self.anomaly_detector = None
         self.vectorizer = None
         self.scaler = None
         
+        # Keyword automata (None without pyahocorasick; count_present then falls back to substring checks)
+        self._protest_ac = build_automaton(PROTEST_KEYWORDS)
+        self._violence_ac = build_automaton(VIOLENCE_KEYWORDS)
+        self._peaceful_ac = build_automaton(PEACEFUL_KEYWORDS)
+        self._negative_ac = build_automaton(FALLBACK_NEGATIVE_WORDS)
+        self._positive_ac = build_automaton(FALLBACK_POSITIVE_WORDS)
+        self._fallback_protest_ac = build_automaton(FALLBACK_PROTEST_KEYWORDS)
+        
         if self.has_ml_libs:
             self._load_models()
         else:
@@ -58,9 +138,20 @@ class MLPredictor:
                 model="cardiffnlp/twitter-roberta-base-sentiment-latest",
                 return_all_scores=True
             )
+            self._load_sentiment_session()
+            if self.sentiment_session is None:
+                self.sentiment_pipeline = quantize_pipeline(self.sentiment_pipeline)
+            
+            # Text vectorizer: fitted by the protest classifier training, or replaced by the one saved with it
+            self.vectorizer = FastTfidfVectorizer(
+                max_features=1000,
+                stop_words='english',
+                ngram_range=(1, 2)
+            )
             
             # Load protest detection classifier
             self._load_protest_classifier()
+            self._load_protest_session()
             
             # Load anomaly detector
             self.anomaly_detector = IsolationForest(
@@ -68,13 +159,6 @@ class MLPredictor:
                 random_state=42
             )
             
-            # Load text vectorizer
-            self.vectorizer = TfidfVectorizer(
-                max_features=1000,
-                stop_words='english',
-                ngram_range=(1, 2)
-            )
-            
             # Load feature scaler
             self.scaler = StandardScaler()
             
@@ -84,16 +168,42 @@ class MLPredictor:
             logger.error(f"Error loading ML models: {e}")
             self.has_ml_libs = False
     
+    def _load_sentiment_session(self):
+        """Serve the sentiment model from an INT8 ONNX Runtime session, exporting it on first use"""
+        if not HAS_ONNXRUNTIME:
+            return
+        try:
+            path = export_and_quantize(self.sentiment_pipeline.model, self.sentiment_pipeline.tokenizer, SENTIMENT_ONNX_PATH)
+            self.sentiment_session = OnnxClassifier(path)
+        except Exception as e:
+            logger.warning(f"ONNX Runtime unavailable for sentiment, using PyTorch: {e}")
+            self.sentiment_session = None
+    
     def _load_protest_classifier(self):
-        """Load or train protest detection classifier"""
+        """Load the protest detection classifier and its fitted vectorizer, training both if either file is missing"""
         try:
-            # Try to load pre-trained model
-            with open('models/protest_classifier.pkl', 'rb') as f:
-                self.protest_classifier = pickle.load(f)
+            # Try to load pre-trained model, with the vocabulary and idf weights it expects
+            with open(PROTEST_CLASSIFIER_PATH, 'rb') as f:
+                protest_classifier = pickle.load(f)
+            with open(PROTEST_VECTORIZER_PATH, 'rb') as f:
+                self.vectorizer = pickle.load(f)
+            self.protest_classifier = protest_classifier
         except FileNotFoundError:
             # Train a new model with sample data
             self._train_protest_classifier()
     
+    def _load_protest_session(self):
+        """Serve the protest classifier's trees from ONNX Runtime when onnxruntime and skl2onnx are installed"""
+        if not (HAS_ONNXRUNTIME and HAS_SKL2ONNX) or self.protest_classifier is None:
+            return
+        try:
+            n_features = len(self.vectorizer.vocabulary_)
+            path = convert_sklearn_classifier(self.protest_classifier, n_features, PROTEST_ONNX_PATH)
+            self.protest_session = OnnxSklearnClassifier(path)
+        except Exception as e:
+            logger.warning(f"ONNX Runtime unavailable for protest detection, using scikit-learn: {e}")
+            self.protest_session = None
+    
     def _train_protest_classifier(self):
         """Train protest detection classifier with sample data"""
         # Sample training data (in real implementation, use actual protest data)
@@ -141,32 +251,56 @@ class MLPredictor:
         try:
             import os
             os.makedirs('models', exist_ok=True)
-            with open('models/protest_classifier.pkl', 'wb') as f:
+            with open(PROTEST_CLASSIFIER_PATH, 'wb') as f:
                 pickle.dump(self.protest_classifier, f)
+            with open(PROTEST_VECTORIZER_PATH, 'wb') as f:
+                pickle.dump(self.vectorizer, f)
+            # The ONNX copy belongs to the previous classifier
+            if os.path.exists(PROTEST_ONNX_PATH):
+                os.remove(PROTEST_ONNX_PATH)
         except Exception as e:
             logger.warning(f"Could not save model: {e}")
     
     def analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """Analyze sentiment using real ML model"""
+        return self.analyze_sentiment_batch([text])[0]
+    
+    def analyze_sentiment_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Analyze sentiment of many texts, running the transformer SENTIMENT_BATCH_SIZE texts at a time"""
         if not self.has_ml_libs or not self.sentiment_pipeline:
-            return self._fallback_sentiment_analysis(text)
+            return [self._fallback_sentiment_analysis(text) for text in texts]
         
         try:
-            # Use transformer model for sentiment analysis
-            results = self.sentiment_pipeline(text)
+            results = []
+            for start in range(0, len(texts), SENTIMENT_BATCH_SIZE):
+                results.extend(self._run_sentiment_batch(texts[start:start + SENTIMENT_BATCH_SIZE]))
+            return results
             
-            # Extract scores
-            scores = results[0]
-            sentiment_map = {
-                'LABEL_0': 'negative',
-                'LABEL_1': 'neutral', 
-                'LABEL_2': 'positive'
-            }
-            
-            # Find highest scoring sentiment
-            best_score = max(scores, key=lambda x: x['score'])
-            sentiment = sentiment_map.get(best_score['label'], 'neutral')
-            confidence = best_score['score']
+        except Exception as e:
+            logger.error(f"Error in sentiment analysis: {e}")
+            return [self._fallback_sentiment_analysis(text) for text in texts]
+    
+    def _run_sentiment_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """One forward pass over texts, padded to the longest of them"""
+        tokenizer = self.sentiment_pipeline.tokenizer
+        model = self.sentiment_pipeline.model
+        if self.sentiment_session is not None:
+            inputs = tokenizer(texts, padding=True, truncation=True, max_length=SENTIMENT_MAX_LENGTH, return_tensors='np')
+            logits = self.sentiment_session(inputs)
+            exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+            probs = exp / exp.sum(axis=-1, keepdims=True)
+            best = probs.argmax(axis=-1).tolist()
+        else:
+            inputs = tokenizer(texts, padding=True, truncation=True, max_length=SENTIMENT_MAX_LENGTH, return_tensors='pt')
+            with torch.inference_mode():
+                probs = torch.softmax(model(**inputs).logits, dim=-1)
+            best = torch.argmax(probs, dim=-1).tolist()
+        id2label = model.config.id2label
+        
+        results = []
+        for index, row in zip(best, probs.tolist()):
+            sentiment = SENTIMENT_LABELS[index] if index < len(SENTIMENT_LABELS) else 'neutral'
+            confidence = row[index]
             
             # Calculate sentiment score (-1 to 1)
             if sentiment == 'negative':
@@ -176,40 +310,40 @@ class MLPredictor:
             else:
                 sentiment_score = 0.0
             
-            return {
+            results.append({
                 'sentiment': sentiment,
                 'score': sentiment_score,
                 'confidence': confidence,
-                'details': {s['label']: s['score'] for s in scores}
-            }
-            
-        except Exception as e:
-            logger.error(f"Error in sentiment analysis: {e}")
-            return self._fallback_sentiment_analysis(text)
+                'details': {id2label.get(i, f'LABEL_{i}'): score for i, score in enumerate(row)}
+            })
+        return results
     
     def detect_protest_content(self, text: str) -> Dict[str, Any]:
         """Detect if text is protest-related using ML"""
         if not self.has_ml_libs or not self.protest_classifier:
             return self._fallback_protest_detection(text)
         
+        # Lowercased once for the keyword features (and the fallback, should the model fail)
+        text_lower = text.lower()
         try:
             # Vectorize text
             X = self.vectorizer.transform([text])
             
-            # Predict
-            prediction = self.protest_classifier.predict(X)[0]
-            probability = self.protest_classifier.predict_proba(X)[0]
+            # Predict: one pass over the forest; the predicted class is the argmax of its probabilities (as predict() does)
+            classifier = self.protest_session or self.protest_classifier
+            probability = classifier.predict_proba(X)[0]
+            prediction = self.protest_classifier.classes_[np.argmax(probability)]
             
             return {
                 'is_protest': bool(prediction),
                 'probability': float(probability[1]),  # Probability of being protest
                 'confidence': float(max(probability)),
-                'features': self._extract_text_features(text)
+                'features': self._extract_text_features(text, text_lower)
             }
             
         except Exception as e:
             logger.error(f"Error in protest detection: {e}")
-            return self._fallback_protest_detection(text)
+            return self._fallback_protest_detection(text, text_lower)
     
     def predict_incident_likelihood(self, features: Dict[str, Any]) -> PredictionResult:
         """Predict likelihood of incident based on multiple features"""
@@ -227,7 +361,7 @@ class MLPredictor:
             anomaly_score = self.anomaly_detector.decision_function(feature_vector_scaled)[0]
             
             # Convert anomaly score to probability (higher anomaly = higher probability)
-            probability = 1 / (1 + np.exp(-anomaly_score))
+            probability = 1 / (1 + math.exp(-anomaly_score))
             
             # Calculate confidence based on feature quality
             confidence = self._calculate_confidence(features)
@@ -244,33 +378,46 @@ class MLPredictor:
             logger.error(f"Error in prediction: {e}")
             return self._fallback_prediction(features)
     
-    def _extract_text_features(self, text: str) -> Dict[str, float]:
-        """Extract features from text"""
-        text_lower = text.lower()
+    def predict_incident_likelihood_batch(self, features_list: List[Dict[str, Any]]) -> List[PredictionResult]:
+        """predict_incident_likelihood for many feature dicts, with one scaler and anomaly-detector call for all of them"""
+        if not self.has_ml_libs or not features_list:
+            return [self._fallback_prediction(features) for features in features_list]
         
-        # Protest-related keywords
-        protest_keywords = [
-            'protest', 'demonstration', 'rally', 'march', 'gathering',
-            'unrest', 'disruption', 'blockade', 'occupation', 'strike',
-            'civil disobedience', 'sit-in', 'walkout', 'boycott'
-        ]
-        
-        # Violence-related keywords
-        violence_keywords = [
-            'violence', 'riot', 'clash', 'conflict', 'arrest',
-            'police', 'tear gas', 'rubber bullets', 'barricade'
-        ]
-        
-        # Peaceful keywords
-        peaceful_keywords = [
-            'peaceful', 'peace', 'unity', 'solidarity', 'justice',
-            'non-violent', 'calm', 'orderly'
-        ]
+        try:
+            # (B, n_features) matrix, rows in features_list order and columns in PREDICTION_FEATURE_KEYS order
+            X = np.empty((len(features_list), len(PREDICTION_FEATURE_KEYS)), dtype=np.float64)
+            for row, features in enumerate(features_list):
+                X[row] = self._extract_prediction_features(features)
+            
+            anomaly_scores = self.anomaly_detector.decision_function(self.scaler.transform(X))
+            probabilities = 1.0 / (1.0 + np.exp(-anomaly_scores))
+            confidences = self._calculate_confidences(X)
+            
+            timestamp = datetime.utcnow()
+            return [
+                PredictionResult(
+                    probability=probability,
+                    confidence=confidence,
+                    features=features,
+                    model_version="v1.0",
+                    timestamp=timestamp
+                )
+                for features, probability, confidence in zip(features_list, probabilities.tolist(), confidences.tolist())
+            ]
+            
+        except Exception as e:
+            logger.error(f"Error in batch prediction: {e}")
+            return [self._fallback_prediction(features) for features in features_list]
+    
+    def _extract_text_features(self, text: str, text_lower: Optional[str] = None) -> Dict[str, float]:
+        """Extract features from text (text_lower: text.lower(), if the caller already has it)"""
+        if text_lower is None:
+            text_lower = text.lower()
         
         features = {
-            'protest_keyword_count': sum(1 for word in protest_keywords if word in text_lower),
-            'violence_keyword_count': sum(1 for word in violence_keywords if word in text_lower),
-            'peaceful_keyword_count': sum(1 for word in peaceful_keywords if word in text_lower),
+            'protest_keyword_count': count_present(text_lower, PROTEST_KEYWORDS, self._protest_ac),
+            'violence_keyword_count': count_present(text_lower, VIOLENCE_KEYWORDS, self._violence_ac),
+            'peaceful_keyword_count': count_present(text_lower, PEACEFUL_KEYWORDS, self._peaceful_ac),
             'text_length': len(text),
             'exclamation_count': text.count('!'),
             'hashtag_count': text.count('#'),
@@ -281,48 +428,35 @@ class MLPredictor:
     
     def _extract_prediction_features(self, features: Dict[str, Any]) -> List[float]:
         """Extract numerical features for prediction"""
-        feature_vector = [
-            features.get('social_media_volume', 0),
-            features.get('news_coverage', 0),
-            features.get('crowd_density', 0),
-            features.get('police_activity', 0),
-            features.get('traffic_anomaly', 0),
-            features.get('weather_score', 0),
-            features.get('sentiment_score', 0),
-            features.get('protest_probability', 0),
-            features.get('recent_incidents', 0),
-            features.get('high_severity_count', 0)
-        ]
-        
-        return feature_vector
+        return [features.get(key, 0) for key in PREDICTION_FEATURE_KEYS]
     
     def _calculate_confidence(self, features: Dict[str, Any]) -> float:
         """Calculate confidence in prediction based on data quality"""
-        confidence_factors = []
-        
         # Data source diversity
-        sources = sum(1 for key in ['social_media_volume', 'news_coverage', 'crowd_density'] 
-                     if features.get(key, 0) > 0)
-        confidence_factors.append(min(sources / 3, 1.0))
-        
-        # Data recency (assume recent data is more reliable)
-        confidence_factors.append(0.8)  # Placeholder
+        sources = sum(1 for key in CONFIDENCE_SOURCE_KEYS if features.get(key, 0) > 0)
         
         # Data volume
         total_volume = features.get('social_media_volume', 0) + features.get('news_coverage', 0)
-        confidence_factors.append(min(total_volume / 10, 1.0))
         
-        return np.mean(confidence_factors)
+        # Mean of diversity, recency and volume factors
+        return (min(sources / 3, 1.0) + RECENCY_CONFIDENCE + min(total_volume / 10, 1.0)) / 3
     
-    def _fallback_sentiment_analysis(self, text: str) -> Dict[str, Any]:
+    @staticmethod
+    def _calculate_confidences(X: np.ndarray) -> np.ndarray:
+        """_calculate_confidence for every row of a PREDICTION_FEATURE_KEYS-ordered feature matrix"""
+        source_columns = [PREDICTION_FEATURE_KEYS.index(key) for key in CONFIDENCE_SOURCE_KEYS]
+        social, news = PREDICTION_FEATURE_KEYS.index('social_media_volume'), PREDICTION_FEATURE_KEYS.index('news_coverage')
+        sources = (X[:, source_columns] > 0).sum(axis=1)
+        total_volume = X[:, social] + X[:, news]
+        return (np.minimum(sources / 3, 1.0) + RECENCY_CONFIDENCE + np.minimum(total_volume / 10, 1.0)) / 3
+    
+    def _fallback_sentiment_analysis(self, text: str, text_lower: Optional[str] = None) -> Dict[str, Any]:
         """Fallback sentiment analysis using simple rules"""
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
         
-        negative_words = ['protest', 'demonstration', 'unrest', 'disruption', 'violence', 'arrest']
-        positive_words = ['peaceful', 'peace', 'unity', 'solidarity', 'justice']
-        
-        negative_count = sum(1 for word in negative_words if word in text_lower)
-        positive_count = sum(1 for word in positive_words if word in text_lower)
+        negative_count = count_present(text_lower, FALLBACK_NEGATIVE_WORDS, self._negative_ac)
+        positive_count = count_present(text_lower, FALLBACK_POSITIVE_WORDS, self._positive_ac)
         
         if negative_count > positive_count:
             sentiment = 'negative'
@@ -341,12 +475,11 @@ class MLPredictor:
             'details': {'fallback': True}
         }
     
-    def _fallback_protest_detection(self, text: str) -> Dict[str, Any]:
+    def _fallback_protest_detection(self, text: str, text_lower: Optional[str] = None) -> Dict[str, Any]:
         """Fallback protest detection using keyword matching"""
-        text_lower = text.lower()
-        protest_keywords = ['protest', 'demonstration', 'rally', 'march', 'gathering']
-        
-        keyword_count = sum(1 for word in protest_keywords if word in text_lower)
+        if text_lower is None:
+            text_lower = text.lower()
+        keyword_count = count_present(text_lower, FALLBACK_PROTEST_KEYWORDS, self._fallback_protest_ac)
         is_protest = keyword_count > 0
         probability = min(keyword_count / 3, 1.0)
         
@@ -354,20 +487,13 @@ class MLPredictor:
             'is_protest': is_protest,
             'probability': probability,
             'confidence': 0.7,
-            'features': self._extract_text_features(text)
+            'features': self._extract_text_features(text, text_lower)
         }
     
     def _fallback_prediction(self, features: Dict[str, Any]) -> PredictionResult:
         """Fallback prediction using simple heuristics"""
         # Simple heuristic: more indicators = higher probability
-        indicators = [
-            features.get('social_media_volume', 0),
-            features.get('news_coverage', 0),
-            features.get('crowd_density', 0),
-            features.get('recent_incidents', 0)
-        ]
-        
-        probability = min(sum(indicators) / 10, 0.9)
+        probability = min(sum(features.get(key, 0) for key in FALLBACK_INDICATOR_KEYS) / 10, 0.9)
         confidence = 0.6
         
         return PredictionResult(
@@ -1,9 +1,18 @@
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import hashlib
+import threading
 import spacy
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
+import aiohttp
 import geotext
-import requests
+from app.utils.http import get_session
+from app.utils.geocoding import get_geocode_cache, nominatim_bucket
+from app.utils.quantization import quantize_pipeline
+from app.collectors._textutil import sanitize_text
+from app.collectors._keywords import build_automaton, count_present
 import os
 from langdetect import detect, DetectorFactory
 import json
@@ -11,6 +20,25 @@ import json
 # Set seed for consistent language detection
 DetectorFactory.seed = 0
 
+# Content-derived NLP results shared by every pipeline instance (LRU, keyed on a digest
+# of content + location hint); repeated headlines and re-collected posts skip inference
+NLP_CACHE_SIZE = 4096
+# Texts per forward pass of the zero-shot classifier in process_batch
+UNREST_BATCH_SIZE = 32
+# Zero-shot labels; a post's protest score is the best score among UNREST_LABELS
+CANDIDATE_LABELS = ["protest", "riot", "civil unrest", "normal news", "sports", "entertainment"]
+UNREST_LABELS = frozenset(["protest", "riot", "civil unrest"])
+# Nominatim forward geocoding; the User-Agent header is required by its usage policy
+NOMINATIM_SEARCH_URL = "https://nominatim.openstreetmap.org/search"
+NOMINATIM_HEADERS = {"User-Agent": "NOESIS_Bot/1.0 (https://github.com/your-repo)"}
+# Lookups in flight at once in geocode_many (each still waits its turn in nominatim_bucket)
+GEOCODE_CONCURRENCY = 5
+# Texts per spaCy nlp.pipe batch, and the components not needed for NER
+SPACY_BATCH_SIZE = 64
+SPACY_DISABLED = ["tagger", "parser", "lemmatizer", "attribute_ruler"]
+_analysis_cache: "OrderedDict[bytes, Dict]" = OrderedDict()
+_analysis_lock = threading.Lock()
+
 class NLPPipeline:
     def __init__(self):
         # Load models
@@ -64,57 +92,140 @@ class NLPPipeline:
         self.protest_keywords = []
         for lang_keywords in self.protest_slang.values():
             self.protest_keywords.extend(lang_keywords)
+        # Lowercased once so scoring lowers only the text
+        self._protest_keywords_lower = tuple(keyword.lower() for keyword in self.protest_keywords)
+        self._protest_automaton = build_automaton(self._protest_keywords_lower)
         
         # Use Nominatim (OpenStreetMap) for geocoding - no API key needed
         self.geocoding_service = "nominatim"
         
         # Load spaCy English model for NER (if available)
         try:
-            self.spacy_nlp = spacy.load('en_core_web_sm')
+            # Only the entity recognizer is used
+            self.spacy_nlp = spacy.load('en_core_web_sm', disable=SPACY_DISABLED)
         except Exception as e:
             print(f"spaCy model not available: {e}")
             self.spacy_nlp = None
 
         # AI-based zero-shot classifier for protest relevance
         try:
-            self.unrest_classifier = pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
+            self.unrest_classifier = quantize_pipeline(pipeline("zero-shot-classification", model="facebook/bart-large-mnli"))
         except Exception as e:
             print(f"Zero-shot classifier not available: {e}")
             self.unrest_classifier = None
 
     def process(self, post: Dict) -> Dict:
         """Process a post through the full NLP pipeline"""
-        content = post.get("content", "")
+        analysis = self._analyze_cached(post.get("content", ""), post.get("location_raw", ""))
+        return self._build_result(post, analysis)
+
+    def process_batch(self, posts: List[Dict]) -> List[Dict]:
+        """Process several posts, classifying all uncached texts in batched zero-shot passes"""
+        items = [(post.get("content", ""), post.get("location_raw", "")) for post in posts]
+        keys = [self._cache_key(content, location_raw) for content, location_raw in items]
+        analyses = {}
+        with _analysis_lock:
+            for key in keys:
+                analysis = _analysis_cache.get(key)
+                if analysis is not None:
+                    _analysis_cache.move_to_end(key)
+                    analyses[key] = analysis
+        
+        # Each distinct uncached post is analyzed once, with its protest score from the batched pass
+        missing = {key: item for key, item in zip(keys, items) if key not in analyses}
+        if missing:
+            contents = [content for content, _ in missing.values()]
+            cleaned = [self.clean_text(content) for content in contents]
+            lowered = [clean.lower() for clean in cleaned]
+            protest_scores = self.classify_protest_relevance_batch(contents, _clean=cleaned, _clean_lower=lowered)
+            docs = self._ner_docs(cleaned)
+            coordinates = self.resolve_locations([
+                self._location_candidates(clean, location_raw, doc)
+                for clean, (_, location_raw), doc in zip(cleaned, missing.values(), docs)
+            ])
+            for (key, (content, location_raw)), clean, clean_lower, protest_score, latlng in zip(
+                    missing.items(), cleaned, lowered, protest_scores, coordinates):
+                analyses[key] = self._analyze(content, location_raw, protest_score, _clean=clean, _clean_lower=clean_lower, _latlng=latlng)
+            with _analysis_lock:
+                for key in missing:
+                    _analysis_cache[key] = analyses[key]
+                while len(_analysis_cache) > NLP_CACHE_SIZE:
+                    _analysis_cache.popitem(last=False)
+        
+        return [self._build_result(post, analyses[key]) for post, key in zip(posts, keys)]
+
+    @staticmethod
+    def _build_result(post: Dict, analysis: Dict) -> Dict:
+        """Combine a post's own fields with its content-derived analysis"""
+        return {
+            "raw_post_id": post.get("id"),
+            "protest_score": analysis["protest_score"],
+            "sentiment_score": analysis["sentiment_score"],
+            "location_lat": analysis["location_lat"],
+            "location_lng": analysis["location_lng"],
+            "language": analysis["language"],
+            "platform": post.get("platform"),
+            "link": post.get("link"),
+            "entities": analysis["entities"],
+            "status": "unverified",
+            "title": post.get("title"),
+            "headline": post.get("headline"),
+            "content": post.get("content")
+        }
+
+    @staticmethod
+    def _cache_key(content: str, location_raw: str) -> bytes:
+        return hashlib.blake2b(f"{content}\0{location_raw}".encode("utf-8", errors="surrogatepass"), digest_size=16).digest()
+
+    def _analyze_cached(self, content: str, location_raw: str) -> Dict:
+        """Content-derived results, reused when the same text and location hint were analyzed recently"""
+        key = self._cache_key(content, location_raw)
+        with _analysis_lock:
+            analysis = _analysis_cache.get(key)
+            if analysis is not None:
+                _analysis_cache.move_to_end(key)
+                return analysis
+        
+        analysis = self._analyze(content, location_raw)
+        with _analysis_lock:
+            _analysis_cache[key] = analysis
+            if len(_analysis_cache) > NLP_CACHE_SIZE:
+                _analysis_cache.popitem(last=False)
+        return analysis
+
+    def _analyze(self, content: str, location_raw: str, protest_score: Optional[float] = None,
+                 _clean: Optional[str] = None, _clean_lower: Optional[str] = None, _latlng: Optional[Tuple] = None) -> Dict:
+        """Run every NLP step that depends only on the text (protest_score may come from a batched pass)"""
+        # Cleaned and lowercased once; every step below reuses them
+        if _clean is None:
+            _clean = self.clean_text(content)
+        clean_lower = _clean.lower() if _clean_lower is None else _clean_lower
         
         # 1. Language detection (no translation for now - simplified)
         language = self.detect_language(content)
         
         # 2. Protest relevance classification
-        protest_score = self.classify_protest_relevance(content)
+        if protest_score is None:
+            protest_score = self.classify_protest_relevance(content, _clean=_clean, _clean_lower=clean_lower)
         
         # 3. Named Entity Recognition
-        entities = self.extract_entities(content)
+        entities = self.extract_entities(content, _clean=_clean, _clean_lower=clean_lower)
         
         # 4. Sentiment analysis
-        sentiment_score = self.analyze_sentiment(content)
+        sentiment_score = self.analyze_sentiment(content, _clean=_clean)
         
         # 5. Geolocation extraction
-        location_lat, location_lng = self.extract_geolocation(content, post.get("location_raw", ""))
+        if _latlng is None:
+            _latlng = self.extract_geolocation(content, location_raw, _clean=_clean)
+        location_lat, location_lng = _latlng
         
         return {
-            "raw_post_id": post.get("id"),
+            "language": language,
             "protest_score": protest_score,
+            "entities": entities,
             "sentiment_score": sentiment_score,
             "location_lat": location_lat,
-            "location_lng": location_lng,
-            "language": language,
-            "platform": post.get("platform"),
-            "link": post.get("link"),
-            "entities": entities,
-            "status": "unverified",
-            "title": post.get("title"),
-            "headline": post.get("headline"),
-            "content": post.get("content")
+            "location_lng": location_lng
         }
 
     def detect_language(self, text: str) -> str:
@@ -130,61 +241,64 @@ class NLPPipeline:
             return "en"  # Default to English
 
     def clean_text(self, text: str) -> str:
-        """Clean text and handle encoding issues"""
-        try:
-            # Handle different encodings
-            if isinstance(text, bytes):
-                text = text.decode('utf-8', errors='ignore')
-            
-            # Handle None or non-string types
-            if not isinstance(text, str):
-                text = str(text)
-            
-            # Remove or replace problematic characters more aggressively
-            import re
-            # Remove control characters and non-printable characters
-            text = re.sub(r'[\x00-\x1F\x7F-\x9F]', '', text)
-            # Remove characters that can't be encoded properly
-            text = re.sub(r'[^\x20-\x7E\u00A0-\uFFFF]', ' ', text)
-            # Replace multiple spaces and newlines with single space
-            text = re.sub(r'\s+', ' ', text)
-            # Remove any remaining problematic characters
-            text = ''.join(char for char in text if ord(char) < 65536)
-            
-            return text.strip()
-        except Exception as e:
-            print(f"Text cleaning error: {e}")
-            return "text"
+        """Clean text and handle encoding issues (precompiled rules shared with the collectors)"""
+        return sanitize_text(text)
 
-    def classify_protest_relevance(self, text: str) -> float:
+    def classify_protest_relevance(self, text: str, _clean: Optional[str] = None, _clean_lower: Optional[str] = None) -> float:
         """Classify if text is protest-related (0.0 to 1.0) using zero-shot classification if available, else fallback to keyword logic."""
         try:
-            clean_text = self.clean_text(text)
+            clean_text = self.clean_text(text) if _clean is None else _clean
             if self.unrest_classifier:
-                result = self.unrest_classifier(
-                    clean_text,
-                    candidate_labels=["protest", "riot", "civil unrest", "normal news", "sports", "entertainment"],
-                    multi_label=True
-                )
-                # Return the score for the most relevant unrest label
-                scores = [score for label, score in zip(result['labels'], result['scores']) if label in ["protest", "riot", "civil unrest"]]
-                return max(scores) if scores else 0.0
+                result = self.unrest_classifier(clean_text, candidate_labels=CANDIDATE_LABELS, multi_label=True)
+                return self._unrest_score(result)
             else:
-                # Fallback to keyword logic
-                text_lower = clean_text.lower()
-                keyword_count = sum(1 for keyword in self.protest_keywords if keyword.lower() in text_lower)
-                words = clean_text.split()
-                if len(words) == 0:
-                    return 0.0
-                keyword_density = keyword_count / len(words)
-                if keyword_count > 1:
-                    keyword_density *= 1.5
-                return min(keyword_density * 10, 1.0)
+                return self._keyword_protest_score(clean_text, _clean_lower)
         except Exception as e:
             print(f"AI protest classification error: {e}")
             return 0.0
 
-    def extract_entities(self, text: str) -> Dict:
+    def classify_protest_relevance_batch(self, texts: List[str], _clean: Optional[List[str]] = None,
+                                         _clean_lower: Optional[List[str]] = None) -> List[float]:
+        """classify_protest_relevance for many texts, running the zero-shot model UNREST_BATCH_SIZE texts at a time"""
+        if _clean is None:
+            _clean = [self.clean_text(text) for text in texts]
+        if not self.unrest_classifier:
+            if _clean_lower is None:
+                _clean_lower = [None] * len(_clean)
+            return [self.classify_protest_relevance(text, _clean=clean, _clean_lower=clean_lower)
+                    for text, clean, clean_lower in zip(texts, _clean, _clean_lower)]
+        try:
+            results = self.unrest_classifier(
+                _clean,
+                candidate_labels=CANDIDATE_LABELS,
+                multi_label=True,
+                batch_size=UNREST_BATCH_SIZE
+            )
+            return [self._unrest_score(result) for result in results]
+        except Exception as e:
+            print(f"AI protest batch classification error: {e}")
+            # One bad text shouldn't zero the whole batch
+            return [self.classify_protest_relevance(text, _clean=clean) for text, clean in zip(texts, _clean)]
+
+    @staticmethod
+    def _unrest_score(result: Dict) -> float:
+        """Score for the most relevant unrest label in a zero-shot result"""
+        return max((score for label, score in zip(result['labels'], result['scores']) if label in UNREST_LABELS), default=0.0)
+
+    def _keyword_protest_score(self, clean_text: str, text_lower: Optional[str] = None) -> float:
+        """Keyword-density protest score, used when the zero-shot model is unavailable"""
+        if text_lower is None:
+            text_lower = clean_text.lower()
+        keyword_count = count_present(text_lower, self._protest_keywords_lower, self._protest_automaton)
+        words = clean_text.split()
+        if len(words) == 0:
+            return 0.0
+        keyword_density = keyword_count / len(words)
+        if keyword_count > 1:
+            keyword_density *= 1.5
+        return min(keyword_density * 10, 1.0)
+
+    def extract_entities(self, text: str, _clean: Optional[str] = None, _clean_lower: Optional[str] = None) -> Dict:
         """Extract named entities (locations, organizations, persons)"""
         entities = {
             "locations": [],
@@ -194,7 +308,7 @@ class NLPPipeline:
         
         try:
             # Clean text first
-            clean_text = self.clean_text(text)
+            clean_text = self.clean_text(text) if _clean is None else _clean
             
             # Extract locations using geotext
             try:
@@ -205,51 +319,31 @@ class NLPPipeline:
             
             # Simple organization extraction (police, government, etc.)
             org_keywords = ["police", "government", "army", "military", "party", "ministry"]
+            text_lower = clean_text.lower() if _clean_lower is None else _clean_lower
             for keyword in org_keywords:
-                if keyword.lower() in clean_text.lower():
+                if keyword in text_lower:
                     entities["organizations"].append(keyword.title())
         except Exception as e:
             print(f"Entity extraction error: {e}")
         
         return entities
 
-    def analyze_sentiment(self, text: str) -> float:
+    def analyze_sentiment(self, text: str, _clean: Optional[str] = None) -> float:
         """Analyze sentiment using VADER"""
         try:
-            clean_text = self.clean_text(text)
+            clean_text = self.clean_text(text) if _clean is None else _clean
             scores = self.sentiment_analyzer.polarity_scores(clean_text)
             return scores["compound"]  # Returns -1 to 1
         except Exception as e:
             print(f"Sentiment analysis error: {e}")
             return 0.0
 
-    def extract_geolocation(self, text: str, location_raw: str) -> tuple:
+    def extract_geolocation(self, text: str, location_raw: str, _clean: Optional[str] = None) -> tuple:
         """Extract latitude and longitude from text or raw location, using multiple methods"""
         try:
-            clean_text = self.clean_text(text)
-            locations = set()
-            # 1. geotext cities/countries
-            try:
-                geo = geotext.GeoText(clean_text)
-                locations.update(geo.cities)
-                locations.update(geo.countries)
-            except Exception as e:
-                print(f"Geotext location extraction error: {e}")
-            # 2. spaCy NER (if available)
-            if self.spacy_nlp:
-                try:
-                    doc = self.spacy_nlp(clean_text)
-                    for ent in doc.ents:
-                        if ent.label_ in ["GPE", "LOC"]:
-                            locations.add(ent.text)
-                except Exception as e:
-                    print(f"spaCy NER error: {e}")
-            # 3. location_raw fallback
-            if location_raw:
-                clean_location = self.clean_text(location_raw)
-                locations.add(clean_location)
+            clean_text = self.clean_text(text) if _clean is None else _clean
             # Try geocoding all found locations, return first valid
-            for loc in locations:
+            for loc in self._location_candidates(clean_text, location_raw):
                 latlng = self.geocode_location(loc)
                 if latlng and latlng[0] is not None and latlng[1] is not None:
                     return latlng
@@ -257,31 +351,142 @@ class NLPPipeline:
             print(f"Geolocation extraction error: {e}")
         return None, None
 
+    def _ner_docs(self, clean_texts: List[str]) -> List:
+        """spaCy docs for several texts from batched nlp.pipe calls (Nones when spaCy is unavailable or fails)"""
+        if self.spacy_nlp:
+            try:
+                return list(self.spacy_nlp.pipe(clean_texts, batch_size=SPACY_BATCH_SIZE))
+            except Exception as e:
+                print(f"spaCy NER error: {e}")
+        return [None] * len(clean_texts)
+
+    def _location_candidates(self, clean_text: str, location_raw: str, doc=None) -> List[str]:
+        """Place names to geocode for a post, in the order they are tried (doc: its spaCy doc, if already parsed)"""
+        locations = {}
+        # 1. geotext cities/countries
+        try:
+            geo = geotext.GeoText(clean_text)
+            locations.update(dict.fromkeys(geo.cities))
+            locations.update(dict.fromkeys(geo.countries))
+        except Exception as e:
+            print(f"Geotext location extraction error: {e}")
+        # 2. spaCy NER (if available)
+        if self.spacy_nlp:
+            try:
+                if doc is None:
+                    doc = self.spacy_nlp(clean_text)
+                for ent in doc.ents:
+                    if ent.label_ in ["GPE", "LOC"]:
+                        locations[ent.text] = None
+            except Exception as e:
+                print(f"spaCy NER error: {e}")
+        # 3. location_raw fallback
+        if location_raw:
+            locations[self.clean_text(location_raw)] = None
+        return list(locations)
+
+    def resolve_locations(self, candidate_lists: List[List[str]]) -> List[Tuple]:
+        """First geocodable candidate of each list, as extract_geolocation would pick it.
+
+        Works in rounds: every unresolved post's next candidate is looked up together, deduplicated
+        across posts, so no post triggers a lookup it wouldn't have made on its own.
+        """
+        results = [(None, None)] * len(candidate_lists)
+        pending = {index: iter(candidates) for index, candidates in enumerate(candidate_lists)}
+        found = {}
+        while pending:
+            round_locations = {}
+            for index, candidates in list(pending.items()):
+                location = next(candidates, None)
+                if location is None:
+                    del pending[index]
+                else:
+                    round_locations[index] = location
+            if not round_locations:
+                break
+            # Places tried in an earlier round (including failed lookups) are not requested again
+            found.update(self.geocode_many(location for location in round_locations.values() if location not in found))
+            for index, location in round_locations.items():
+                latlng = found.get(location)
+                if latlng and latlng[0] is not None and latlng[1] is not None:
+                    results[index] = latlng
+                    del pending[index]
+        return results
+
+    def geocode_many(self, locations: Iterable[str]) -> Dict[str, Tuple]:
+        """geocode_location for several places, with the uncached ones looked up concurrently"""
+        cache = get_geocode_cache()
+        results = {}
+        uncached = []
+        for location in dict.fromkeys(locations):
+            cached = cache.get(location)
+            if cached is not None:
+                results[location] = cached
+            else:
+                uncached.append(location)
+        if not uncached:
+            return results
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            results.update(asyncio.run(self._geocode_many(uncached)))
+        else:
+            # Already inside an event loop (this method is synchronous), so look them up one by one
+            results.update((location, self.geocode_location(location)) for location in uncached)
+        return results
+
+    async def _geocode_many(self, locations: List[str]) -> Dict[str, Tuple]:
+        semaphore = asyncio.Semaphore(GEOCODE_CONCURRENCY)
+        async with aiohttp.ClientSession(headers=NOMINATIM_HEADERS, timeout=aiohttp.ClientTimeout(total=10)) as session:
+            latlngs = await asyncio.gather(*[self._geocode_async(session, semaphore, location) for location in locations])
+        return dict(zip(locations, latlngs))
+
+    async def _geocode_async(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, location: str) -> Tuple:
+        """geocode_location over a shared aiohttp session"""
+        async with semaphore:
+            try:
+                await nominatim_bucket.acquire_async()
+                async with session.get(NOMINATIM_SEARCH_URL, params=self._search_params(location)) as response:
+                    response.raise_for_status()
+                    data = await response.json()
+                latlng = self._parse_search(data)
+                get_geocode_cache().set(location, latlng)
+                return latlng
+            except Exception as e:
+                print(f"Geocoding error: {e}")
+                return None, None
+
+    @staticmethod
+    def _search_params(location: str) -> Dict:
+        return {
+            "q": location,
+            "format": "json",
+            "limit": 1,
+            "addressdetails": 1
+        }
+
+    @staticmethod
+    def _parse_search(data) -> Tuple:
+        """(lat, lng) of the first search result, (None, None) when there is none"""
+        if data and len(data) > 0:
+            return float(data[0]["lat"]), float(data[0]["lon"])
+        return None, None
+
     def geocode_location(self, location: str) -> tuple:
-        """Convert location string to lat/lng using Nominatim (OpenStreetMap)"""
+        """Convert location string to lat/lng using Nominatim (OpenStreetMap), cached in memory and on disk"""
+        cache = get_geocode_cache()
+        cached = cache.get(location)
+        if cached is not None:
+            return cached
         try:
-            url = "https://nominatim.openstreetmap.org/search"
-            params = {
-                "q": location,
-                "format": "json",
-                "limit": 1,
-                "addressdetails": 1
-            }
-            
-            # Add User-Agent header (required by Nominatim)
-            headers = {
-                "User-Agent": "NOESIS_Bot/1.0 (https://github.com/your-repo)"
-            }
-            
-            response = requests.get(url, params=params, headers=headers)
+            nominatim_bucket.acquire()
+            response = get_session().get(NOMINATIM_SEARCH_URL, params=self._search_params(location), headers=NOMINATIM_HEADERS, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
-            
-            if data and len(data) > 0:
-                lat = float(data[0]["lat"])
-                lng = float(data[0]["lon"])
-                return lat, lng
+            # Misses are cached too; request errors (below) are not
+            latlng = self._parse_search(response.json())
+            cache.set(location, latlng)
+            return latlng
         
         except Exception as e:
             print(f"Geocoding error: {e}")
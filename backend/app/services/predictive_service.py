@@ -174,8 +174,8 @@ class PredictiveService:
                 final_confidence = (ml_confidence * 0.7) + (base_confidence * 0.3)
                 
                 # Determine severity based on indicators and existing incidents
-                high_severity_count = len([i for i in incidents if i.get('severity') == 'high'])
-                threat_level = sum([i.value for i in indicators if i.trend == 'increasing'])
+                high_severity_count = sum(1 for i in incidents if i.get('severity') == 'high')
+                threat_level = sum(i.value for i in indicators if i.trend == 'increasing')
                 
                 if high_severity_count > 0 or threat_level > 1.5:
                     predicted_severity = "high"
@@ -217,8 +217,8 @@ class PredictiveService:
                 }
                 
                 # Create prediction reason
-                increasing_indicators = [i for i in indicators if i.trend == 'increasing']
-                prediction_reason = f"ML analysis predicts {predicted_severity} unrest in {location} based on {len(increasing_indicators)} increasing threat indicators and {len(incidents)} recent incidents"
+                increasing_count = sum(1 for i in indicators if i.trend == 'increasing')
+                prediction_reason = f"ML analysis predicts {predicted_severity} unrest in {location} based on {increasing_count} increasing threat indicators and {len(incidents)} recent incidents"
                 
                 predictions.append(Prediction(
                     location=location,
@@ -217,8 +217,9 @@ class SimpleRealTimeCollector:
                                 post_data = post['data']
                                 title = post_data['title']
                                 
-                                # Check if post is protest-related
-                                if any(keyword.lower() in title.lower() for keyword in self.protest_keywords):
+                                # Check if post is protest-related (keywords are already lowercase)
+                                title_lower = title.lower()
+                                if any(keyword in title_lower for keyword in self.protest_keywords):
                                     sentiment_score = self._analyze_sentiment(title)
                                     
                                     data_points.append(DataPoint(
@@ -1,17 +1,23 @@
-from typing import List, Dict
+from typing import Dict, Iterable, List, Union
 from datetime import datetime, timedelta
 from collections import defaultdict
 import math
 from app.utils.geocoding import GeocodingService
 
+def _as_datetime(value: Union[datetime, str]) -> datetime:
+    """Post timestamps arrive as datetimes, or as ISO 8601 strings from older callers"""
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat((value or "").replace("Z", "+00:00"))
+
 class VerificationService:
     def __init__(self):
         self.time_window = timedelta(minutes=60)  # 60-minute clustering window (loosened)
         self.distance_threshold = 200  # 200km radius for location clustering (loosened)
         self.geocoding_service = GeocodingService()
 
-    def verify(self, processed_posts: List[Dict]) -> List[Dict]:
-        """Verify and cluster processed posts into incidents"""
+    def verify(self, processed_posts: Iterable[Dict]) -> List[Dict]:
+        """Verify and cluster processed posts (any iterable, consumed once) into incidents"""
         # Filter posts with lower protest scores (loosened)
         relevant_posts = [post for post in processed_posts if post.get("protest_score", 0) > 0.15]
         
@@ -56,8 +62,8 @@ class VerificationService:
     def are_posts_proximate(self, post1: Dict, post2: Dict) -> bool:
         """Check if two posts are proximate in time and location"""
         # Check time proximity
-        time1 = datetime.fromisoformat(post1.get("timestamp", "").replace("Z", "+00:00"))
-        time2 = datetime.fromisoformat(post2.get("timestamp", "").replace("Z", "+00:00"))
+        time1 = _as_datetime(post1.get("timestamp"))
+        time2 = _as_datetime(post2.get("timestamp"))
         
         if abs((time1 - time2).total_seconds()) > self.time_window.total_seconds():
             return False
@@ -1,5 +1,8 @@
-from sqlalchemy import create_engine
+from functools import lru_cache
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from app.models.base import Base
 # Import all models to ensure they're registered with SQLAlchemy
@@ -7,6 +10,7 @@ from app.models.raw_post import RawPost
 from app.models.processed_post import ProcessedPost
 from app.models.incident import Incident
 from app.models.alert_subscriber import AlertSubscriber
+from app.models.telegram_subscriber import TelegramSubscriber
 import os
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
@@ -14,12 +18,63 @@ import asyncio
 
 load_dotenv()
 
+# Faster encoder/decoder for the JSON columns (RawPost.extra, Incident.sources, ...)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def _orjson_dumps(obj) -> str:
+    """json.dumps replacement; OPT_NON_STR_KEYS keeps int keys working as they did with the stdlib"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+JSON_ENGINE_ARGS = {"json_serializer": _orjson_dumps, "json_deserializer": orjson.loads} if HAS_ORJSON else {}
+
 # Use SQLite instead of PostgreSQL - much simpler setup
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./noesis.db")
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False}, **JSON_ENGINE_ARGS)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets API reads run alongside a collection cycle; NORMAL syncs at checkpoints rather than every commit"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def _async_url(url: str) -> str:
+    """Map a sync database URL onto its asyncio driver"""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql:"):
+        return url.replace("postgresql:", "postgresql+asyncpg:", 1)
+    return url
+
+# Async engine for the API handlers; the collection pipeline keeps using the sync engine
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _async_url(DATABASE_URL))
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **JSON_ENGINE_ARGS)
+if async_engine.dialect.name == "sqlite":
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+def dialect_insert(db):
+    """Dialect-specific insert() for a sync or async session, which supports ON CONFLICT"""
+    return postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+
+@lru_cache(maxsize=None)
+def has_unique_index(bind, table: str, column: str) -> bool:
+    """Whether table has a unique index or constraint on exactly column (checked once per engine)"""
+    inspector = inspect(bind)
+    unique_columns = [index["column_names"] for index in inspector.get_indexes(table) if index["unique"]]
+    unique_columns += [constraint["column_names"] for constraint in inspector.get_unique_constraints(table)]
+    return [column] in unique_columns
+
 def get_db():
     db = SessionLocal()
     try:
@@ -27,6 +82,10 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 @asynccontextmanager
 async def get_db_session():
     db = SessionLocal()
@@ -1,16 +1,128 @@
-import requests
+from app.utils.http import get_session
+from collections import OrderedDict
+import asyncio
+import os
+import sqlite3
+import threading
 import time
 from typing import Optional, Tuple
 
+# Forward-geocoding results kept in memory, backed by a SQLite file that survives restarts
+GEOCODE_MEMORY_SIZE = 10_000
+GEOCODE_CACHE_PATH = os.getenv("GEOCODE_CACHE_PATH", "cache/geocode.sqlite3")
+
+class TokenBucket:
+    """Blocking token bucket shared by every thread that calls one rate-limited host"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Claim the next token and return how many seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = (1 - self.tokens) / self.rate if self.tokens < 1 else 0.0
+            # Claim the token now (going negative) so concurrent callers queue behind this one
+            self.tokens -= 1
+        return wait
+
+    def acquire(self):
+        """Take one token, sleeping until one is available"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """acquire() for coroutines: waits without blocking the event loop"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+# Nominatim's usage policy allows one request per second per application
+nominatim_bucket = TokenBucket(rate=1.0)
+
+class GeocodeCache:
+    """Two-tier cache of place name -> (lat, lng): an in-memory LRU over a SQLite table.
+
+    Places Nominatim has no result for are stored as (None, None) so they aren't looked up again.
+    """
+
+    def __init__(self, path: str = GEOCODE_CACHE_PATH, maxsize: int = GEOCODE_MEMORY_SIZE):
+        self.maxsize = maxsize
+        self._memory: "OrderedDict[str, Tuple[Optional[float], Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS geocode (place TEXT PRIMARY KEY, lat REAL, lng REAL)")
+            self._db.commit()
+        except sqlite3.Error as e:
+            print(f"Geocode disk cache unavailable, using memory only: {e}")
+            self._db = None
+
+    @staticmethod
+    def normalize(place: str) -> str:
+        return " ".join(place.lower().split())
+
+    def get(self, place: str) -> Optional[Tuple[Optional[float], Optional[float]]]:
+        """Cached (lat, lng) for place, or None when it has never been looked up"""
+        key = self.normalize(place)
+        with self._lock:
+            latlng = self._memory.get(key)
+            if latlng is not None:
+                self._memory.move_to_end(key)
+                return latlng
+            if self._db is None:
+                return None
+            row = self._db.execute("SELECT lat, lng FROM geocode WHERE place = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            latlng = (row[0], row[1])
+            self._remember(key, latlng)
+            return latlng
+
+    def set(self, place: str, latlng: Tuple[Optional[float], Optional[float]]):
+        key = self.normalize(place)
+        with self._lock:
+            self._remember(key, latlng)
+            if self._db is not None:
+                try:
+                    self._db.execute("INSERT OR REPLACE INTO geocode (place, lat, lng) VALUES (?, ?, ?)", (key, *latlng))
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"Geocode disk cache write failed: {e}")
+
+    def _remember(self, key: str, latlng: Tuple[Optional[float], Optional[float]]):
+        self._memory[key] = latlng
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+_geocode_cache = None
+_geocode_cache_lock = threading.Lock()
+
+def get_geocode_cache() -> GeocodeCache:
+    """Process-wide GeocodeCache, opened on first use"""
+    global _geocode_cache
+    if _geocode_cache is None:
+        with _geocode_cache_lock:
+            if _geocode_cache is None:
+                _geocode_cache = GeocodeCache()
+    return _geocode_cache
+
 class GeocodingService:
     def __init__(self):
         self.base_url = "https://nominatim.openstreetmap.org/reverse"
         self.headers = {
             'User-Agent': 'NOESIS/1.0 (https://github.com/your-repo)'
         }
-        # Rate limiting: Nominatim allows 1 request per second
-        self.last_request_time = 0
-        self.min_interval = 1.0
 
     def get_place_name(self, lat: float, lng: float) -> Optional[str]:
         """
@@ -18,11 +130,8 @@ class GeocodingService:
         Returns None if geocoding fails
         """
         try:
-            # Rate limiting
-            current_time = time.time()
-            time_since_last = current_time - self.last_request_time
-            if time_since_last < self.min_interval:
-                time.sleep(self.min_interval - time_since_last)
+            # Rate limiting (shared with every other Nominatim caller in the process)
+            nominatim_bucket.acquire()
             
             params = {
                 'lat': lat,
@@ -32,15 +141,13 @@ class GeocodingService:
                 'accept-language': 'en'
             }
             
-            response = requests.get(
+            response = get_session().get(
                 self.base_url, 
                 params=params, 
                 headers=self.headers,
                 timeout=10
             )
             
-            self.last_request_time = time.time()
-            
             if response.status_code == 200:
                 data = response.json()
                 return self._extract_place_name(data)
@@ -87,11 +194,8 @@ class GeocodingService:
         Returns (lat, lng) tuple or None if geocoding fails
         """
         try:
-            # Rate limiting
-            current_time = time.time()
-            time_since_last = current_time - self.last_request_time
-            if time_since_last < self.min_interval:
-                time.sleep(self.min_interval - time_since_last)
+            # Rate limiting (shared with every other Nominatim caller in the process)
+            nominatim_bucket.acquire()
             
             params = {
                 'q': place_name,
@@ -99,15 +203,13 @@ class GeocodingService:
                 'limit': 1
             }
             
-            response = requests.get(
+            response = get_session().get(
                 "https://nominatim.openstreetmap.org/search",
                 params=params,
                 headers=self.headers,
                 timeout=10
             )
             
-            self.last_request_time = time.time()
-            
             if response.status_code == 200:
                 data = response.json()
                 if data:
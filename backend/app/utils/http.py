@@ -0,0 +1,25 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Keep-alive pool shared by every blocking HTTP caller in the process
+POOL_CONNECTIONS = 20
+POOL_MAXSIZE = 50
+
+_session = None
+_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """Process-wide requests.Session, so repeated calls to a host reuse its TCP+TLS connection"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = requests.Session()
+                retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET",))
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
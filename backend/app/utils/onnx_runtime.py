@@ -0,0 +1,105 @@
+import logging
+import os
+from typing import Dict
+
+import numpy as np
+
+# Optional: callers fall back to PyTorch inference when ONNX Runtime is missing
+try:
+    import onnxruntime as ort
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    HAS_ONNXRUNTIME = True
+except ImportError:
+    HAS_ONNXRUNTIME = False
+
+# Optional: converts fitted scikit-learn estimators to ONNX
+try:
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+    HAS_SKL2ONNX = True
+except ImportError:
+    HAS_SKL2ONNX = False
+
+logger = logging.getLogger(__name__)
+
+ONNX_OPSET = 14
+ONNX_INPUT_NAMES = ("input_ids", "attention_mask")
+
+def export_and_quantize(model, tokenizer, path: str) -> str:
+    """Export a sequence-classification model to ONNX and write an INT8 (MatMul weights) copy at path.
+
+    The export is skipped when path already exists, so it only runs on first start.
+    """
+    if os.path.exists(path):
+        return path
+    import torch
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fp32_path = path.replace(".onnx", "-fp32.onnx")
+    sample = tokenizer(["sample text"], return_tensors="pt")
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in ONNX_INPUT_NAMES}
+    dynamic_axes["logits"] = {0: "batch"}
+    with torch.inference_mode():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in ONNX_INPUT_NAMES),
+            fp32_path,
+            input_names=list(ONNX_INPUT_NAMES),
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=ONNX_OPSET
+        )
+    # Signed int8 weights on MatMul only; QUInt8 and quantized Gather/Attention are slower on CPU
+    quantize_dynamic(fp32_path, path, weight_type=QuantType.QInt8, op_types_to_quantize=["MatMul"])
+    os.remove(fp32_path)
+    logger.info("Exported INT8 ONNX model to %s", path)
+    return path
+
+def convert_sklearn_classifier(model, n_features: int, path: str) -> str:
+    """Write a fitted scikit-learn classifier to path as ONNX, with class probabilities as a plain tensor.
+
+    The conversion is skipped when path already exists; delete it when the classifier is retrained.
+    """
+    if os.path.exists(path):
+        return path
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    onx = convert_sklearn(
+        model,
+        initial_types=[("X", FloatTensorType([None, n_features]))],
+        # Probabilities as an (n, n_classes) array instead of a list of dicts
+        options={id(model): {"zipmap": False}},
+        target_opset=ONNX_OPSET
+    )
+    with open(path, "wb") as f:
+        f.write(onx.SerializeToString())
+    return path
+
+def _new_session(path: str) -> "ort.InferenceSession":
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.intra_op_num_threads = os.cpu_count() or 1
+    return ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+
+class OnnxClassifier:
+    """ONNX Runtime session for an exported classifier, returning logits as a numpy array"""
+
+    def __init__(self, path: str):
+        self.session = _new_session(path)
+
+    def __call__(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        feed = {name: inputs[name].astype(np.int64) for name in ONNX_INPUT_NAMES}
+        return self.session.run(["logits"], feed)[0]
+
+class OnnxSklearnClassifier:
+    """ONNX Runtime session for a converted scikit-learn classifier, with its predict_proba interface"""
+
+    def __init__(self, path: str):
+        self.session = _new_session(path)
+        self.input_name = self.session.get_inputs()[0].name
+        # Outputs are (label, probabilities)
+        self.probability_name = self.session.get_outputs()[1].name
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Class probabilities in classes_ order; X may be sparse"""
+        if hasattr(X, "toarray"):
+            X = X.toarray()
+        return self.session.run([self.probability_name], {self.input_name: np.asarray(X, dtype=np.float32)})[0]
@@ -0,0 +1,31 @@
+import logging
+
+# Optional: without torch the pipelines are returned unchanged
+try:
+    import torch
+    HAS_TORCH = True
+except ImportError:
+    HAS_TORCH = False
+
+logger = logging.getLogger(__name__)
+
+# Quantized kernel backends in order of preference (fbgemm on x86, qnnpack on ARM)
+QUANTIZED_ENGINES = ("fbgemm", "x86", "qnnpack")
+
+def quantize_pipeline(pipe):
+    """Swap a Hugging Face pipeline's model for an INT8 dynamically quantized copy of its Linear layers.
+
+    Only applies on CPU; on failure the pipeline keeps its FP32 model.
+    """
+    if not HAS_TORCH or pipe is None or getattr(pipe, "device", None) is None or pipe.device.type != "cpu":
+        return pipe
+    try:
+        engine = next((name for name in QUANTIZED_ENGINES if name in torch.backends.quantized.supported_engines), None)
+        if engine is None:
+            return pipe
+        torch.backends.quantized.engine = engine
+        pipe.model = torch.quantization.quantize_dynamic(pipe.model, {torch.nn.Linear}, dtype=torch.qint8)
+        logger.info("Quantized %s to INT8 (%s)", type(pipe.model).__name__, engine)
+    except Exception as e:
+        logger.warning("INT8 quantization failed, keeping FP32 model: %s", e)
+    return pipe
@@ -0,0 +1,59 @@
+import functools
+import inspect
+import threading
+import time
+
+# Cached endpoint results: key -> (expires_at, value)
+_cache = {}
+_lock = threading.Lock()
+
+def ttl_cache(seconds: float = 5):
+    """Cache a parameterless endpoint's result for a few seconds.
+
+    Entries are keyed on the function name only, so this must not be used on
+    handlers whose result depends on their arguments (other than the db session).
+    """
+    def decorator(fn):
+        key = f"{fn.__module__}.{fn.__qualname__}"
+
+        def lookup(now):
+            with _lock:
+                entry = _cache.get(key)
+            if entry is not None and entry[0] > now:
+                return entry
+            return None
+
+        def store(now, value):
+            with _lock:
+                _cache[key] = (now + seconds, value)
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                now = time.monotonic()
+                entry = lookup(now)
+                if entry is not None:
+                    return entry[1]
+                value = await fn(*args, **kwargs)
+                store(now, value)
+                return value
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                now = time.monotonic()
+                entry = lookup(now)
+                if entry is not None:
+                    return entry[1]
+                value = fn(*args, **kwargs)
+                store(now, value)
+                return value
+
+        wrapper.cache_key = key
+        return wrapper
+    return decorator
+
+def invalidate(*fns):
+    """Drop the cached results of the given ttl_cache-decorated functions"""
+    with _lock:
+        for fn in fns:
+            _cache.pop(fn.cache_key, None)
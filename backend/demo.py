@@ -28,7 +28,16 @@ def demo_collection():
     response = requests.post(f"{BASE_URL}/collection/run-cycle")
     
     if response.status_code == 200:
-        data = response.json()
+        job_id = response.json()["job_id"]
+        # The cycle runs in the background; poll until it finishes
+        data = {"status": "running"}
+        while data["status"] == "running":
+            time.sleep(2)
+            data = requests.get(f"{BASE_URL}/collection/jobs/{job_id}").json()
+        if data["status"] == "failed":
+            print(f"❌ Collection failed: {data.get('error')}")
+            return
+        data = data.get("results", {})
         print(f"✅ Collection completed!")
         print(f"   📊 Raw posts collected: {data.get('raw_posts', 0)}")
         print(f"   🔍 Processed posts: {data.get('processed_posts', 0)}")
@@ -118,7 +127,7 @@ def demo_alerts():
     print(f"\n👥 Current Subscribers:")
     response = requests.get(f"{BASE_URL}/alerts/subscribers")
     if response.status_code == 200:
-        subscribers = response.json()
+        subscribers = response.json()["subscribers"]
         for sub in subscribers:
             print(f"   • {sub['email']} ({sub['severity_preference']} severity)")
 
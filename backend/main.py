@@ -1,14 +1,20 @@
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+
+# Configure the root logger once, before any app module logs
+logging.basicConfig(level=logging.INFO, handlers=[logging.StreamHandler()])
 
 app = FastAPI(
     title="NOESIS Backend",
     description="Real-time OSINT Civil Unrest Detection System",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Script to apply schema changes to an existing database
+(create_tables only creates missing tables, it never alters existing ones)
+
+Removing duplicate raw post links deletes data, so it only runs with --dedupe-links
+"""
+import sys
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.utils.database import engine
+
+MIGRATIONS = [
+    "CREATE INDEX IF NOT EXISTS ix_incidents_location ON incidents (location)",
+    "CREATE TABLE IF NOT EXISTS telegram_subscribers (chat_id BIGINT NOT NULL PRIMARY KEY)",
+    "ALTER TABLE incidents ADD COLUMN created_at DATETIME",
+    "CREATE INDEX IF NOT EXISTS ix_incidents_created_at ON incidents (created_at)",
+    "ALTER TABLE incidents ADD COLUMN source_count INTEGER NOT NULL DEFAULT 0",
+    # Backfill rows written before source_count existed
+    "UPDATE incidents SET source_count = json_array_length(sources) WHERE source_count = 0 AND sources IS NOT NULL",
+    # raw_posts.link becomes unique; empty links are stored as NULL
+    "UPDATE raw_posts SET link = NULL WHERE link = ''",
+]
+
+# Rows that share a link with an earlier raw post
+DUPLICATE_LINKS_WHERE = "link IS NOT NULL AND id NOT IN (SELECT MIN(id) FROM raw_posts WHERE link IS NOT NULL GROUP BY link)"
+
+# Opt-in (--dedupe-links): duplicate raw posts collapse onto the first copy, processed posts are
+# repointed to it, and the duplicates are deleted. Irreversible, so never part of MIGRATIONS.
+DEDUPE_LINK_STATEMENTS = [
+    "UPDATE processed_posts SET raw_post_id = (SELECT MIN(keep.id) FROM raw_posts dup JOIN raw_posts keep ON keep.link = dup.link WHERE dup.id = processed_posts.raw_post_id) "
+    f"WHERE raw_post_id IN (SELECT id FROM raw_posts WHERE {DUPLICATE_LINKS_WHERE})",
+    f"DELETE FROM raw_posts WHERE {DUPLICATE_LINKS_WHERE}",
+]
+
+LINK_INDEX = "CREATE UNIQUE INDEX IF NOT EXISTS ix_raw_posts_link ON raw_posts (link)"
+
+def count_duplicate_links() -> int:
+    """How many raw_posts rows --dedupe-links would delete"""
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT COUNT(*) FROM raw_posts WHERE {DUPLICATE_LINKS_WHERE}")).scalar_one()
+
+def ensure_link_index() -> bool:
+    """Create the unique raw_posts.link index unless duplicate links still exist; returns whether it exists"""
+    duplicates = count_duplicate_links()
+    if duplicates:
+        print(f"⚠️  {duplicates} raw posts share a link with an earlier post; unique link index not created.")
+        print("   New posts are still deduplicated by link on insert. To add the index, back up and run: python migrate_db.py --dedupe-links")
+        return False
+    with engine.begin() as conn:
+        conn.execute(text(LINK_INDEX))
+    return True
+
+def dedupe_links() -> int:
+    """Delete raw posts with duplicate links (repointing their processed posts) and add the unique index; returns rows deleted"""
+    with engine.begin() as conn:
+        conn.execute(text(DEDUPE_LINK_STATEMENTS[0]))
+        deleted = conn.execute(text(DEDUPE_LINK_STATEMENTS[1])).rowcount
+        conn.execute(text(LINK_INDEX))
+    return deleted
+
+def apply_migrations() -> int:
+    """Apply every migration, skipping columns that already exist; returns how many ran"""
+    applied = 0
+    for statement in MIGRATIONS:
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(statement))
+            applied += 1
+        except OperationalError as e:
+            # ADD COLUMN has no IF NOT EXISTS; a re-run hits the existing column
+            if "duplicate column" not in str(e).lower():
+                raise
+    if ensure_link_index():
+        applied += 1
+    return applied
+
+def main():
+    print("Applying schema migrations...")
+    try:
+        applied = apply_migrations()
+        print(f"✅ Applied {applied} migrations")
+    except Exception as e:
+        print(f"❌ Error applying migrations: {e}")
+        return
+    
+    if "--dedupe-links" in sys.argv[1:]:
+        duplicates = count_duplicate_links()
+        if not duplicates:
+            print("No duplicate raw post links to remove")
+            return
+        print(f"--dedupe-links will permanently delete {duplicates} raw posts that duplicate an earlier post's link")
+        print("(their processed posts are repointed to the earliest copy). Back up the database first.")
+        if "--yes" not in sys.argv[1:] and input("Proceed? [y/N] ").strip().lower() != "y":
+            print("Aborted; nothing deleted")
+            return
+        try:
+            deleted = dedupe_links()
+            print(f"✅ Deleted {deleted} duplicate raw posts and added the unique link index")
+        except Exception as e:
+            print(f"❌ Error removing duplicate links: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# Point the app at a scratch SQLite database before any test imports it, so the suite never writes to noesis.db
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="noesis-tests-"), "test.db"))
+# Never download Hugging Face models during tests; modules that load them at import fall back instead
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
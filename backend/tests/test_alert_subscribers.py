@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for keyset pagination of /alerts/subscribers
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+
+from app.api.alerts import router
+from app.models.alert_subscriber import AlertSubscriber
+from app.utils.database import SessionLocal, create_tables
+
+EMAILS = [f"user{i}@example.com" for i in range(7)]
+
+@pytest.fixture
+def client():
+    create_tables()
+    with SessionLocal() as db:
+        db.execute(delete(AlertSubscriber))
+        db.commit()
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app) as client:
+        for email in EMAILS:
+            assert client.post("/alerts/subscribe", json={"email": email}).json()["status"] == "subscribed"
+        yield client
+
+def fetch_all(client, limit):
+    """Follow next_after_id until an empty page; returns the pages"""
+    pages = []
+    params = {"limit": limit}
+    while True:
+        body = client.get("/alerts/subscribers", params=params).json()
+        pages.append(body)
+        if not body["subscribers"]:
+            assert body["next_after_id"] is None
+            return pages
+        params["after_id"] = body["next_after_id"]
+
+def test_cursor_walks_every_subscriber_once(client):
+    pages = fetch_all(client, limit=3)
+    assert [len(page["subscribers"]) for page in pages] == [3, 3, 1, 0]
+    emails = [sub["email"] for page in pages for sub in page["subscribers"]]
+    assert emails == EMAILS
+    for page in pages[:-1]:
+        ids = [sub["user_id"] for sub in page["subscribers"]]
+        assert ids == sorted(ids)
+        assert page["next_after_id"] == ids[-1]
+
+def test_cursor_is_stable_when_rows_are_deleted(client):
+    first = client.get("/alerts/subscribers", params={"limit": 3}).json()
+    # Removing a row already served must not shift the next page
+    client.post("/alerts/unsubscribe", json={"email": EMAILS[0]})
+    second = client.get("/alerts/subscribers", params={"limit": 3, "after_id": first["next_after_id"]}).json()
+    assert [sub["email"] for sub in second["subscribers"]] == EMAILS[3:6]
+
+def test_after_last_id_is_empty(client):
+    last_id = max(sub["user_id"] for sub in client.get("/alerts/subscribers", params={"limit": 1000}).json()["subscribers"])
+    body = client.get("/alerts/subscribers", params={"after_id": last_id}).json()
+    assert body == {"subscribers": [], "next_after_id": None}
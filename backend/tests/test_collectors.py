@@ -62,17 +62,10 @@ def test_reddit_collector():
         from app.collectors.reddit_collector import RedditCollector
         
         collector = RedditCollector()
-        if not (collector.client_id and collector.client_secret and collector.user_agent):
+        if not collector.enabled:
             print("Reddit API configured: False (missing credentials, using mock data)")
-        elif collector.reddit is None:
-            print("Reddit API configured: False (initialization failed, using mock data)")
         else:
-            # Try a simple API call to check if credentials work
-            try:
-                user = collector.reddit.user.me()
-                print(f"Reddit API configured: True (Authenticated as: {user})")
-            except Exception as e:
-                print(f"Reddit API configured: False (Auth error: {e}) (using mock data)")
+            print("Reddit API configured: True")
         
         posts = collector.collect()
         if posts and posts[0].get('platform') == 'reddit' and 'mock' in posts[0].get('content', '').lower():
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the email pool's batch abort, backoff and requeue
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+import logging
+
+from app.alerts import email_pool as pool_module
+from app.alerts.email_pool import EmailPool, EmailJob, MIN_ATTEMPTS_BEFORE_ABORT, MAX_SEND_ATTEMPTS, RETRY_BASE_DELAY
+
+class FakeSender:
+    """Records sends and fails those addressed to the given emails"""
+
+    def __init__(self, failing):
+        self.failing = set(failing)
+        self.sent = []
+
+    def send_alert(self, to_email, subject, message):
+        self.sent.append(to_email)
+        return to_email not in self.failing
+
+def make_jobs(emails):
+    return [EmailJob(email, "subject", "message") for email in emails]
+
+def test_send_batch_all_delivered():
+    jobs = make_jobs("abcdefg")
+    assert EmailPool._send_batch(FakeSender([]), jobs) == (len(jobs), [])
+
+def test_send_batch_single_failure_does_not_abort():
+    sender = FakeSender(["a"])
+    attempted, failed = EmailPool._send_batch(sender, make_jobs("abcdefg"))
+    assert attempted == 7
+    assert [job.to_email for job in failed] == ["a"]
+    assert sender.sent == list("abcdefg")
+
+def test_send_batch_aborts_after_minimum_attempts():
+    emails = "abcdefghij"
+    sender = FakeSender(emails)
+    attempted, failed = EmailPool._send_batch(sender, make_jobs(emails))
+    assert attempted == MIN_ATTEMPTS_BEFORE_ABORT
+    assert [job.to_email for job in failed] == list(emails[:MIN_ATTEMPTS_BEFORE_ABORT])
+    assert sender.sent == list(emails[:MIN_ATTEMPTS_BEFORE_ABORT])
+
+def test_worker_requeues_with_backoff_until_retry_cap(monkeypatch, caplog):
+    emails = "abcdefghij"
+    sender = FakeSender(emails)
+    real_sleep = asyncio.sleep
+    delays = []
+
+    async def fake_sleep(delay, *args, **kwargs):
+        delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(pool_module.asyncio, "sleep", fake_sleep)
+
+    def dropped():
+        return [r for r in caplog.records if r.getMessage().startswith("Dropping alert")]
+
+    async def run():
+        pool = EmailPool(workers=1)
+        pool._loop = asyncio.get_running_loop()
+        pool._queue = asyncio.Queue()
+        for job in make_jobs(emails):
+            pool._queue.put_nowait(job)
+        task = asyncio.create_task(pool._worker(sender))
+        for _ in range(2000):
+            if len(dropped()) == len(emails):
+                break
+            await real_sleep(0.001)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    with caplog.at_level(logging.WARNING, logger=pool_module.__name__):
+        asyncio.run(run())
+
+    # The first batch aborts after the minimum attempts; the unattempted jobs come back first
+    assert sender.sent[:10] == list(emails)
+    # Every job is sent exactly MAX_SEND_ATTEMPTS times and then dropped with a warning
+    assert sorted(sender.sent) == sorted(list(emails) * MAX_SEND_ATTEMPTS)
+    assert len(dropped()) == len(emails)
+    # Each failing batch waits longer than the previous one before requeueing
+    assert delays[:3] == [RETRY_BASE_DELAY, RETRY_BASE_DELAY * 2, RETRY_BASE_DELAY * 4]
+    assert all(later >= earlier for earlier, later in zip(delays, delays[1:]))
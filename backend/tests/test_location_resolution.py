@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests that batched location resolution picks what extract_geolocation picks per post
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+nlp_pipeline = pytest.importorskip("app.services.nlp_pipeline")
+
+# Fake geocoder: places missing here resolve to (None, None)
+COORDINATES = {
+    "Mumbai": (19.07, 72.87),
+    "Delhi": (28.61, 77.2),
+    "India": (20.59, 78.96),
+    "Paris": (48.85, 2.35),
+    "City Center": (1.0, 2.0),
+}
+
+POSTS = [
+    ("Protest in Mumbai and Delhi, India", "Mumbai"),
+    ("Crowds gathering in Atlantis tonight", "City Center"),
+    ("Strike spreads from Paris", ""),
+    ("No place named here", "Nowhere Land"),
+    ("No place named here either", ""),
+    ("Rally near Delhi", "Downtown"),
+    ("March in Atlantis and Paris", "Atlantis"),
+]
+
+class FakeCache:
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, place):
+        return self.entries.get(place)
+
+    def set(self, place, latlng):
+        self.entries[place] = latlng
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """NLPPipeline without its models, geocoding against COORDINATES and recording every lookup"""
+    monkeypatch.setattr(nlp_pipeline, "get_geocode_cache", FakeCache)
+    pipe = object.__new__(nlp_pipeline.NLPPipeline)
+    pipe.spacy_nlp = None
+    pipe.lookups = []
+
+    def geocode_location(location):
+        pipe.lookups.append(location)
+        return COORDINATES.get(location, (None, None))
+
+    async def geocode_many(locations):
+        return {location: geocode_location(location) for location in locations}
+
+    pipe.geocode_location = geocode_location
+    pipe._geocode_many = geocode_many
+    return pipe
+
+def test_resolve_locations_matches_extract_geolocation(pipeline):
+    expected = [pipeline.extract_geolocation(text, location_raw) for text, location_raw in POSTS]
+    scalar_lookups = set(pipeline.lookups)
+    pipeline.lookups.clear()
+
+    candidates = [pipeline._location_candidates(pipeline.clean_text(text), location_raw) for text, location_raw in POSTS]
+    assert pipeline.resolve_locations(candidates) == expected
+    # Each place is looked up once per batch, and only if some post would have tried it on its own
+    assert len(pipeline.lookups) == len(set(pipeline.lookups))
+    assert set(pipeline.lookups) <= scalar_lookups
+
+def test_resolve_locations_stops_at_first_hit(pipeline):
+    results = pipeline.resolve_locations([["Mumbai", "Paris"], ["Atlantis", "Paris"], [], ["Atlantis"]])
+    assert results == [COORDINATES["Mumbai"], COORDINATES["Paris"], (None, None), (None, None)]
+    # The first post resolves on Mumbai, so Paris is only looked up (once) for the second
+    assert sorted(pipeline.lookups) == ["Atlantis", "Mumbai", "Paris"]
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests that batched incident likelihood prediction matches the single-row path
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pandas")
+ensemble = pytest.importorskip("sklearn.ensemble")
+preprocessing = pytest.importorskip("sklearn.preprocessing")
+
+from app.services.ml_models import MLPredictor, PREDICTION_FEATURE_KEYS
+
+FEATURES_LIST = [
+    {},
+    {"social_media_volume": 3, "news_coverage": 1, "crowd_density": 0.4},
+    {"social_media_volume": 12, "news_coverage": 5, "crowd_density": 0.9, "police_activity": 0.7, "recent_incidents": 4},
+    {"sentiment_score": -0.8, "protest_probability": 0.95, "high_severity_count": 2},
+    {key: float(i) / 3 for i, key in enumerate(PREDICTION_FEATURE_KEYS)},
+    {"news_coverage": 0, "crowd_density": 0, "weather_score": 0.2, "traffic_anomaly": 0.5},
+]
+
+def make_predictor(has_ml_libs=True):
+    """MLPredictor with a fitted scaler and anomaly detector, skipping the transformer model loads"""
+    predictor = object.__new__(MLPredictor)
+    predictor.has_ml_libs = has_ml_libs
+    X = np.random.default_rng(0).random((200, len(PREDICTION_FEATURE_KEYS))) * 5
+    predictor.scaler = preprocessing.StandardScaler().fit(X)
+    predictor.anomaly_detector = ensemble.IsolationForest(contamination=0.1, random_state=42).fit(predictor.scaler.transform(X))
+    return predictor
+
+@pytest.mark.parametrize("has_ml_libs", [True, False])
+def test_batch_matches_single_row(has_ml_libs):
+    predictor = make_predictor(has_ml_libs)
+    single = [predictor.predict_incident_likelihood(features) for features in FEATURES_LIST]
+    batch = predictor.predict_incident_likelihood_batch(FEATURES_LIST)
+
+    assert len(batch) == len(single)
+    for one, many, features in zip(single, batch, FEATURES_LIST):
+        assert many.model_version == one.model_version == ("v1.0" if has_ml_libs else "fallback")
+        assert many.probability == pytest.approx(one.probability, rel=1e-12)
+        assert many.confidence == pytest.approx(one.confidence, rel=1e-12)
+        assert type(many.probability) is float and type(many.confidence) is float
+        assert many.features is features
+
+def test_empty_batch():
+    assert make_predictor().predict_incident_likelihood_batch([]) == []
+
+def test_calculate_confidences_matches_scalar():
+    predictor = make_predictor()
+    X = np.array([predictor._extract_prediction_features(features) for features in FEATURES_LIST], dtype=np.float64)
+    expected = [predictor._calculate_confidence(features) for features in FEATURES_LIST]
+    assert MLPredictor._calculate_confidences(X).tolist() == pytest.approx(expected, rel=1e-12)
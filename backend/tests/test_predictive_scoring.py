@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests that the batched location scoring matches the per-location scorers
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.services.enhanced_predictive_service import EnhancedPredictiveService, DEFAULT_LOCATION_PROFILE
+
+SEVERITY_MIXES = [[], ["low"], ["medium", "low"], ["high"], ["high", "high", "medium"], ["medium"] * 4, ["high"] * 6]
+
+def location_incidents(service):
+    """(location, incidents) pairs covering every risk profile, an unknown location and each severity mix"""
+    locations = list(service.location_risk_profiles) + ["Unknown Location"]
+    return [
+        (location, [{"severity": severity} for severity in SEVERITY_MIXES[i % len(SEVERITY_MIXES)]])
+        for i, location in enumerate(locations * 3)
+    ]
+
+@pytest.mark.parametrize("seed", [0, 1, 7, 42])
+@pytest.mark.parametrize("time_multiplier", [1.0, 1.3 * 1.2, 1.3 * 1.2 * 1.4])
+def test_score_locations_matches_scalar_scorers(seed, time_multiplier):
+    service = EnhancedPredictiveService(seed=seed)
+    groups = location_incidents(service)
+    counts = np.array([service._severity_counts(incidents) for _, incidents in groups])
+    incident_counts = np.array([len(incidents) for _, incidents in groups])
+    high_counts, escalating_counts = counts[:, 0], counts[:, 1]
+    base_risks = np.array([service.location_risk_profiles.get(location, DEFAULT_LOCATION_PROFILE)[0] for location, _ in groups])
+
+    samples = service.draw_indicator_samples(incident_counts, high_counts, datetime(2024, 6, 1, 12))
+    batch = service.score_locations(samples, incident_counts, high_counts, escalating_counts, base_risks, time_multiplier)
+
+    for row, (location, incidents) in enumerate(groups):
+        indicators = service.generate_realistic_indicators(location, incidents, samples, row)
+        risk_score = service.calculate_advanced_risk_score(indicators, incidents, location, time_multiplier=time_multiplier)
+        escalation_prob = service.predict_escalation_probability(indicators, incidents)
+        severity, time_to_incident = service.determine_severity_and_timing(risk_score, indicators, escalation_prob)
+
+        # Batched scores are float32 rounded to 3 places
+        assert batch["risk_scores"][row] == pytest.approx(risk_score, abs=1.5e-3)
+        assert batch["escalation_probs"][row] == pytest.approx(escalation_prob, abs=1.5e-3)
+        assert batch["increasing_counts"][row] == sum(1 for i in indicators if i.trend == "increasing")
+        assert batch["severities"][row] == severity
+        assert batch["times_to_incident"][row] == time_to_incident
+
+def test_score_locations_returns_plain_rounded_floats():
+    service = EnhancedPredictiveService(seed=3)
+    counts = np.array([0, 2, 5])
+    samples = service.draw_indicator_samples(counts, counts // 2)
+    batch = service.score_locations(samples, counts, counts // 2, counts, np.array([0.1, 0.3, 0.5]), 1.2)
+    for key in ("risk_scores", "escalation_probs"):
+        assert all(type(value) is float and value == round(value, 3) for value in batch[key])
+    assert all(value <= 0.99 for value in batch["risk_scores"])
+    assert all(value <= 0.95 for value in batch["escalation_probs"])
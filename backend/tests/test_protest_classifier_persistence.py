@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests that a restarted MLPredictor reuses the saved protest classifier and vectorizer
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import logging
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("sklearn")
+pytest.importorskip("pandas")
+
+from app.services import ml_models
+from app.services.ml_models import MLPredictor, PROTEST_CLASSIFIER_PATH, PROTEST_VECTORIZER_PATH, PROTEST_ONNX_PATH
+
+TEXTS = ["mass demonstration and rally downtown", "weather forecast for today", "strike for better working conditions"]
+
+@pytest.fixture
+def models_dir(tmp_path, monkeypatch):
+    """Run in an empty directory (model paths are relative) without loading the sentiment transformer"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ml_models, "HAS_ML_LIBS", True)
+    monkeypatch.setattr(ml_models, "pipeline", lambda *args, **kwargs: None)
+    return tmp_path
+
+def build():
+    predictor = MLPredictor()
+    assert predictor.has_ml_libs
+    return predictor
+
+def test_second_build_reuses_saved_classifier(models_dir, monkeypatch, caplog):
+    first = build()
+    assert os.path.exists(PROTEST_CLASSIFIER_PATH) and os.path.exists(PROTEST_VECTORIZER_PATH)
+    expected = [first.detect_protest_content(text) for text in TEXTS]
+
+    def no_training(self):
+        raise AssertionError("classifier retrained although both files exist")
+
+    monkeypatch.setattr(MLPredictor, "_train_protest_classifier", no_training)
+    with caplog.at_level(logging.WARNING, logger=ml_models.__name__):
+        second = build()
+        results = [second.detect_protest_content(text) for text in TEXTS]
+
+    assert not [r for r in caplog.records if r.levelno >= logging.WARNING]
+    assert second.vectorizer.vocabulary_ == first.vectorizer.vocabulary_
+    if ml_models.HAS_ONNXRUNTIME and ml_models.HAS_SKL2ONNX:
+        assert second.protest_session is not None
+    for result, reference in zip(results, expected):
+        # The fallback has no model probabilities, so matching the first build's means the model answered
+        assert result["probability"] == pytest.approx(reference["probability"], abs=1e-6)
+        assert result["is_protest"] == reference["is_protest"]
+    assert results[0]["is_protest"] and not results[1]["is_protest"]
+
+def test_missing_vectorizer_retrains_and_drops_onnx_copy(models_dir):
+    build()
+    os.remove(PROTEST_VECTORIZER_PATH)
+    os.makedirs(os.path.dirname(PROTEST_ONNX_PATH), exist_ok=True)
+    with open(PROTEST_ONNX_PATH, "wb") as f:
+        f.write(b"stale")
+
+    predictor = build()
+    assert os.path.exists(PROTEST_VECTORIZER_PATH)
+    assert predictor.detect_protest_content(TEXTS[0])["is_protest"]
+    if not (ml_models.HAS_ONNXRUNTIME and ml_models.HAS_SKL2ONNX):
+        assert not os.path.exists(PROTEST_ONNX_PATH)
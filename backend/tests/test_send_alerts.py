@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-subscriber email alerts sent after a collection cycle
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from sqlalchemy import delete
+
+from app.services import data_orchestrator
+from app.services.data_orchestrator import DataOrchestrator
+from app.models.alert_subscriber import AlertSubscriber
+from app.models.incident import Incident
+from app.utils.database import SessionLocal, create_tables
+
+INCIDENTS = [
+    Incident(title="Rally", severity="high", status="verified", location="Delhi, India", sources=[], source_count=2),
+    Incident(title="March", severity="medium", status="verified", location="Paris, France", sources=[], source_count=1),
+    Incident(title="Notice", severity="low", status="verified", location="Delhi, India", sources=[], source_count=1),
+]
+
+@pytest.fixture
+def orchestrator(monkeypatch):
+    create_tables()
+    db = SessionLocal()
+    db.execute(delete(AlertSubscriber))
+    db.add_all([
+        AlertSubscriber(email="all@example.com", severity_preference="medium"),
+        AlertSubscriber(email="delhi@example.com", region_of_interest="Delhi", severity_preference="medium"),
+        AlertSubscriber(email="high@example.com", severity_preference="high"),
+        AlertSubscriber(email="tokyo@example.com", region_of_interest="Tokyo"),
+    ])
+    db.commit()
+    orchestrator = DataOrchestrator(db)
+    monkeypatch.setattr(orchestrator.telegram_bot, "schedule_broadcast", lambda incidents: None)
+    orchestrator.submitted = []
+    monkeypatch.setattr(data_orchestrator.email_pool, "submit", orchestrator.submitted.append)
+    yield orchestrator
+    db.execute(delete(AlertSubscriber))
+    db.commit()
+    db.close()
+
+def test_no_emails_unless_enabled(orchestrator, monkeypatch):
+    monkeypatch.setattr(data_orchestrator, "EMAIL_ALERTS_ENABLED", False)
+    orchestrator.send_alerts(INCIDENTS)
+    assert orchestrator.submitted == []
+
+def test_one_email_per_matching_subscriber_when_enabled(orchestrator, monkeypatch):
+    monkeypatch.setattr(data_orchestrator, "EMAIL_ALERTS_ENABLED", True)
+    orchestrator.send_alerts(INCIDENTS)
+    jobs = {job.to_email: job for job in orchestrator.submitted}
+    assert sorted(jobs) == ["all@example.com", "delhi@example.com", "high@example.com"]
+    assert jobs["all@example.com"].subject == "NOESIS Alert: 2 new incidents"
+    assert "Rally" in jobs["delhi@example.com"].message and "March" not in jobs["delhi@example.com"].message
+    assert jobs["high@example.com"].subject == "NOESIS Alert: High severity incident"
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tests for storing raw posts with and without the unique link index
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.base import Base
+from app.models.raw_post import RawPost
+from app.utils.database import has_unique_index
+from app.services.data_orchestrator import DataOrchestrator
+
+def post(link, content="protest downtown"):
+    return {"platform": "rss", "content": content, "author": "feed", "timestamp": "", "location_raw": "", "link": link}
+
+@pytest.fixture(params=[True, False], ids=["link_index", "no_link_index"])
+def db(request, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'raw.db'}")
+    Base.metadata.create_all(engine)
+    if not request.param:
+        # As on a database whose duplicate links were never removed with migrate_db.py --dedupe-links
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_raw_posts_link"))
+    assert has_unique_index(engine, "raw_posts", "link") is request.param
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+def test_store_raw_posts_skips_known_links(db):
+    orchestrator = DataOrchestrator(db)
+    stored = orchestrator.store_raw_posts([post("https://a"), post("https://b"), post("https://a"), post(""), post(None)])
+    db.commit()
+    assert [p.link for p in stored] == ["https://a", "https://b", None, None]
+
+    stored = orchestrator.store_raw_posts([post("https://b"), post("https://c")])
+    db.commit()
+    assert [p.link for p in stored] == ["https://c"]
+    assert sorted(filter(None, db.scalars(select(RawPost.link)))) == ["https://a", "https://b", "https://c"]
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Tests for packing Telegram alerts under the message length limit
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.alerts.telegram_bot import TelegramAlertBot, MAX_MESSAGE_LENGTH, MESSAGE_SEPARATOR
+
+pack = TelegramAlertBot._pack_messages
+
+def test_empty():
+    assert pack([]) == []
+
+def test_short_messages_share_one_text():
+    messages = ["first alert", "second alert", "third alert"]
+    assert pack(messages) == [MESSAGE_SEPARATOR.join(messages)]
+
+def test_batches_stay_under_limit_and_keep_order():
+    messages = [f"alert {i} " + "x" * (300 + 37 * i) for i in range(40)]
+    batches = pack(messages)
+    assert len(batches) > 1
+    assert all(len(batch) <= MAX_MESSAGE_LENGTH for batch in batches)
+    assert [m for batch in batches for m in batch.split(MESSAGE_SEPARATOR)] == messages
+
+def test_batches_are_filled_before_splitting():
+    messages = ["a" * 1000] * 9
+    batches = pack(messages)
+    # Each batch would overflow if the next message were added
+    for batch in batches[:-1]:
+        assert len(batch) + len(MESSAGE_SEPARATOR) + 1000 > MAX_MESSAGE_LENGTH
+    assert sum(batch.count("a" * 1000) for batch in batches) == 9
+
+def test_exact_fit():
+    half = (MAX_MESSAGE_LENGTH - len(MESSAGE_SEPARATOR)) // 2
+    messages = ["a" * half, "b" * (MAX_MESSAGE_LENGTH - len(MESSAGE_SEPARATOR) - half)]
+    assert pack(messages) == [MESSAGE_SEPARATOR.join(messages)]
+    assert len(pack(messages)[0]) == MAX_MESSAGE_LENGTH
+    assert len(pack(messages + ["c"])) == 2
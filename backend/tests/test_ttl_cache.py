@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the endpoint TTL cache and its invalidation
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+import pytest
+
+from app.utils import ttl_cache as ttl_cache_module
+from app.utils.ttl_cache import ttl_cache, invalidate
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    """Give each test its own cache, since entries are keyed on the function's qualified name"""
+    monkeypatch.setattr(ttl_cache_module, "_cache", {})
+
+def make_cached():
+    """A sync and an async cached function that count their calls"""
+    calls = {"sync": 0, "async": 0}
+
+    @ttl_cache(seconds=60)
+    def sync_fn():
+        calls["sync"] += 1
+        return calls["sync"]
+
+    @ttl_cache(seconds=60)
+    async def async_fn():
+        calls["async"] += 1
+        return calls["async"]
+
+    return sync_fn, async_fn, calls
+
+def test_cached_until_invalidated():
+    sync_fn, async_fn, calls = make_cached()
+    assert sync_fn() == 1
+    assert sync_fn() == 1
+    assert asyncio.run(async_fn()) == 1
+    assert asyncio.run(async_fn()) == 1
+
+    invalidate(sync_fn, async_fn)
+    assert sync_fn() == 2
+    assert asyncio.run(async_fn()) == 2
+    assert calls == {"sync": 2, "async": 2}
+
+def test_invalidate_only_drops_given_functions():
+    sync_fn, async_fn, calls = make_cached()
+    sync_fn()
+    asyncio.run(async_fn())
+
+    invalidate(sync_fn)
+    assert sync_fn() == 2
+    assert asyncio.run(async_fn()) == 1
+
+def test_invalidate_uncached_function_is_noop():
+    sync_fn, _, _ = make_cached()
+    invalidate(sync_fn)
+    assert sync_fn() == 1
+
+def test_entries_expire(monkeypatch):
+    sync_fn, _, _ = make_cached()
+    now = [1000.0]
+    monkeypatch.setattr(ttl_cache_module.time, "monotonic", lambda: now[0])
+    assert sync_fn() == 1
+    now[0] += 59
+    assert sync_fn() == 1
+    now[0] += 2
+    assert sync_fn() == 2